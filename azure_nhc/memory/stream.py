@@ -14,9 +14,9 @@ import pprint
 class StreamMultiSysTest(rfm.RegressionTest):
     valid_systems = ['*']
     valid_prog_environs = ['cray', 'gnu', 'gnu-azhpc', 'intel', 'pgi']
-    prebuild_cmds = [
-        'wget https://raw.githubusercontent.com/jeffhammond/STREAM/master/stream.c'  # noqa: E501
-    ]
+    fetch_files = {
+        'https://raw.githubusercontent.com/jeffhammond/STREAM/master/stream.c': ''  # noqa: E501
+    }
     build_system = 'SingleSource'
     sourcepath = 'stream.c'
     executable_opts = [
@@ -4,6 +4,8 @@ import re
 #####################################################################################
 ### Output File
 js_output_file = "azure_vms_dataset.json"
+### Output File: compact index of the output dataset by (series, size)
+js_index_file = "azure_vms_dataset.index.json"
 ### Input File: original azure dataset
 js_filename = "azure_vm_info.json"
 ### Input File: original NHC dataset
@@ -11,6 +13,24 @@ js_filename2 = "azure_vm_info_addon.json"
 
 #####################################################################################
 
+### Fields of the dataset read by the checks; keep in sync with
+### _VM_INDEX_FIELDS in reframe/core/azure.py
+index_fields = ["series", "size", "capabilities", "nhc_values"]
+
+def write_index(vms, index_file):
+    # Index the VMs by "<series>/<size>"; this is what
+    # reframe.core.azure.read_vm_data_file() looks up. Only the first VM of
+    # each (series, size) is kept, e.g., Basic_A0 shadows Standard_A0.
+    index = {}
+    for vm in vms.values():
+        if "series" in vm:
+            index.setdefault("{}/{}".format(vm["series"], vm["size"]),
+                             {k: vm[k] for k in index_fields if k in vm})
+
+    with open(index_file, "w") as outfile:
+        js.dump({"fields": index_fields, "vms": index}, outfile,
+                separators=(",", ":"))
+
 js_file = open(js_filename)
 vm_data = js.load(js_file)
 
@@ -28,7 +48,7 @@ for vm in vm_data.keys():
     tmp_data = re.split('([0-9]+(-[0-9]+)?)',vm_data[vm]['size'],1)
     if len(tmp_data) < 4:
         print("Tmp data not as expected: {}".format(tmp_data))
-        continure
+        continue
 
     vm_series = tmp_data[0] + tmp_data[-1]
     vm_data[vm]['series'] = vm_series.lower()
@@ -75,3 +95,5 @@ for vm in mod_vm.keys():
 with open(js_output_file, "w") as outfile:
         js.dump(mod_vm, outfile, indent=4)
 
+# Written after the dataset, so that it is not older than the dataset
+write_index(mod_vm, js_index_file)
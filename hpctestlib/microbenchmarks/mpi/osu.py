@@ -19,7 +19,10 @@ class fetch_osu_benchmarks(rfm.RunOnlyRegressionTest):
 
     local = True
     osu_file_name = f'osu-micro-benchmarks-{version}.tar.gz'
-    executable = f'curl -LJO http://mvapich.cse.ohio-state.edu/download/mvapich/{osu_file_name}'  # noqa: E501
+    fetch_files = {
+        f'http://mvapich.cse.ohio-state.edu/download/mvapich/{osu_file_name}': ''  # noqa: E501
+    }
+    executable = f'gzip -t {osu_file_name}'
 
     @sanity_function
     def validate_download(self):
@@ -13,6 +13,7 @@ import os
 import re
 import socket
 import tempfile
+import time
 
 import reframe
 import reframe.core.settings as settings
@@ -23,6 +24,12 @@ from reframe.core.logging import getlogger
 from reframe.utility import ScopedDict
 
 
+_IMDS_URL = 'http://169.254.169.254/metadata/instance?api-version=2019-06-04'
+
+# The instance metadata do not change while the VM is up, so they are cached
+# on the local disk for the current boot and for at most this many seconds
+_IMDS_CACHE_TTL = 24 * 3600
+
 
 def check_if_azure_vm():
     print("Checking if this is an azure vm")
@@ -30,13 +37,63 @@ def check_if_azure_vm():
         return False
     return True
 
+def _boot_id():
+    try:
+        with open('/proc/sys/kernel/random/boot_id') as fp:
+            return fp.read().strip()
+    except OSError:
+        return None
+
+
+def _imds_cache_file():
+    # The cache must be local to the node, since the nodes of a cluster may
+    # share the home directories but not their VM sizes
+    return os.path.join(tempfile.gettempdir(),
+                        f'rfm-azure-imds-{os.getuid()}.json')
+
+
+def _query_imds():
+    cache_file = _imds_cache_file()
+    boot_id = _boot_id()
+    try:
+        with open(cache_file) as fp:
+            if os.fstat(fp.fileno()).st_uid != os.getuid():
+                raise ValueError('cache file not owned by the current user')
+
+            entry = json.load(fp)
+
+        age = time.time() - entry['timestamp']
+        if entry['boot_id'] == boot_id and 0 <= age < _IMDS_CACHE_TTL:
+            getlogger().debug(
+                f'Using the cached instance metadata of {cache_file!r}'
+            )
+            return entry['metadata']
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        getlogger().debug(f'Ignoring the instance metadata cache: {e}')
+
+    results = util.osext.run_command(f'curl -H Metadata:true "{_IMDS_URL}"')
+    metadata = json.loads(results.stdout)
+    if 'compute' not in metadata:
+        # Do not cache error responses
+        return metadata
+
+    try:
+        util.osext.dump_json_atomic({'boot_id': boot_id,
+                                     'timestamp': time.time(),
+                                     'metadata': metadata}, cache_file)
+    except OSError as e:
+        getlogger().debug(f'Could not cache the instance metadata: {e}')
+
+    return metadata
+
+
 def get_vm_info(systems):
     try:
         # May need to find a better way to do this for clusters on Azure
         # Host names can be quite random
-        cmd = "curl -H Metadata:true \"http://169.254.169.254/metadata/instance?api-version=2019-06-04\""
-        results = util.osext.run_command(cmd)
-        vm_data = json.loads(results.stdout)
+        vm_data = _query_imds()
         pp_results = json.dumps(vm_data, indent=4)
         pref_idx = vm_data['compute']['vmSize'].find('_')
         vm_size = vm_data['compute']['vmSize'][pref_idx+1:]
@@ -89,20 +146,76 @@ def get_vm_info(systems):
                           f"for the current system: '{sysname}'.")
     return [ False, False, False ]
 
-def read_vm_data_file(vm_series, vm_data_file, vm_size=None, vm_os=None, vm_os_version=None, vm_image=None):
-    vm_data_fp = open(vm_data_file)
-    vm_data = {}
-    vm_data = json.load(vm_data_fp)
-    #print("vm data: {}".format(vm_data))    
-    for vm in vm_data.keys():
-        if vm_data[vm]['series'] == vm_series.lower() and vm_data[vm]['size'] == vm_size:
-            #print("vm {}\tdata: {}".format(vm,vm_data[vm]))    
-            vm_data[vm]['vm_series'] = vm_data[vm]['series']
-            vm_data[vm]['vm_size'] = vm_size
-            vm_data[vm]['vm_os'] = vm_os
-            vm_data[vm]['vm_os_version'] = vm_os_version
-            vm_data[vm]['vm_image'] = vm_image
-            vm_data[vm]['cloud_provider'] = 'azure'
-            return(vm_data[vm])
-    return({})
+# The fields of the VM dataset that are read by the checks; only these are
+# kept in the index of the dataset
+_VM_INDEX_FIELDS = ['series', 'size', 'capabilities', 'nhc_values']
+
 
+def _vm_index_file(vm_data_file):
+    return os.path.splitext(vm_data_file)[0] + '.index.json'
+
+
+def _build_vm_index(vm_data_file):
+    with open(vm_data_file) as fp:
+        vm_data = json.load(fp)
+
+    # Keep the first VM of each (series, size) as the linear search did
+    vms = {}
+    for vm in vm_data.values():
+        if 'series' in vm:
+            vms.setdefault(f"{vm['series']}/{vm['size']}",
+                           {k: vm[k] for k in _VM_INDEX_FIELDS if k in vm})
+
+    return vms
+
+
+@functools.lru_cache(maxsize=None)
+def _vm_index(vm_data_file):
+    '''Return the VMs of the dataset indexed by ``"<series>/<size>"``.
+
+    The index is read from the ``.index.json`` file next to the dataset, which
+    is written by ``process_azure_vm_info_w_addons.py``. If the index is
+    missing or older than the dataset, it is rebuilt from the dataset and
+    saved, if possible. The index is read only once per session.
+    '''
+
+    index_file = _vm_index_file(vm_data_file)
+    try:
+        if os.path.getmtime(index_file) >= os.path.getmtime(vm_data_file):
+            with open(index_file) as fp:
+                index = json.load(fp)
+
+            if index['fields'] == _VM_INDEX_FIELDS:
+                return index['vms']
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        getlogger().debug(f'Ignoring the VM index {index_file!r}: {e}')
+
+    getlogger().debug(f'Indexing the VM dataset {vm_data_file!r}')
+    vms = _build_vm_index(vm_data_file)
+    try:
+        # The index may be shared by the users of the dataset
+        util.osext.dump_json_atomic({'fields': _VM_INDEX_FIELDS, 'vms': vms},
+                                    index_file, mode=0o644,
+                                    separators=(',', ':'))
+    except OSError as e:
+        getlogger().debug(f'Could not save the VM index: {e}')
+
+    return vms
+
+
+def read_vm_data_file(vm_series, vm_data_file, vm_size=None, vm_os=None, vm_os_version=None, vm_image=None):
+    vm = _vm_index(vm_data_file).get(f'{vm_series.lower()}/{vm_size}')
+    if vm is None:
+        return {}
+
+    # The tests may modify the node data
+    vm = copy.deepcopy(vm)
+    vm['vm_series'] = vm['series']
+    vm['vm_size'] = vm_size
+    vm['vm_os'] = vm_os
+    vm['vm_os_version'] = vm_os_version
+    vm['vm_image'] = vm_image
+    vm['cloud_provider'] = 'azure'
+    return vm
@@ -0,0 +1,261 @@
+# Copyright 2016-2022 Swiss National Supercomputing Centre (CSCS/ETH Zurich)
+# ReFrame Project Developers. See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+#
+# Content-addressed cache of build artifacts
+#
+
+import atexit
+import functools
+import hashlib
+import os
+import shutil
+import tempfile
+import weakref
+
+import reframe.utility.jsonext as jsonext
+import reframe.utility.osext as osext
+
+
+# Bump this whenever the layout of the cache entries or the computation of
+# the keys changes
+_CACHE_VERSION = '1'
+
+_CHUNK_SIZE = 1 << 20
+
+# The build caches of the session
+_caches = weakref.WeakSet()
+
+
+def _hash_file(h, path):
+    with open(path, 'rb') as fp:
+        for chunk in iter(lambda: fp.read(_CHUNK_SIZE), b''):
+            h.update(chunk)
+
+
+def _hash_tree(h, path, exclude=()):
+    '''Update the hash ``h`` with the contents of the directory ``path``.
+
+    Regular files are hashed by content. Symbolic links are hashed by their
+    target and, if the target exists, by its size and modification time, so
+    that large read-only files linked into the stage directory are not read.
+    '''
+    for dirpath, dirnames, filenames in os.walk(path):
+        # Make the traversal order deterministic
+        dirnames.sort()
+        # Symbolic links to directories are not descended into
+        names = filenames + [d for d in dirnames
+                             if os.path.islink(os.path.join(dirpath, d))]
+        for name in sorted(names):
+            filepath = os.path.join(dirpath, name)
+            relpath = os.path.relpath(filepath, path)
+            if relpath in exclude:
+                continue
+
+            h.update(relpath.encode())
+            h.update(b'\0')
+            if os.path.islink(filepath):
+                target = os.readlink(filepath)
+                h.update(target.encode())
+                try:
+                    st = os.stat(filepath)
+                except OSError:
+                    pass
+                else:
+                    h.update(f'{st.st_size}:{st.st_mtime_ns}'.encode())
+            else:
+                _hash_file(h, filepath)
+
+            h.update(b'\0')
+
+
+def _environ_record(environ):
+    # Environment names do not affect the build
+    ret = dict(jsonext.encode(environ))
+    ret.pop('_name', None)
+    return ret
+
+
+def build_key(stagedir, build_commands, environs, partition, exclude=()):
+    '''Compute the cache key of a build.
+
+    :arg stagedir: The stage directory containing the staged sources.
+    :arg build_commands: The commands of the build job.
+    :arg environs: The environments the build job runs in.
+    :arg partition: The partition the build runs on.
+    :arg exclude: Files of the stage directory to be excluded from the key.
+    :returns: The key as a hex string.
+    '''
+    h = hashlib.sha256()
+    h.update(f'{_CACHE_VERSION}\0{partition.fullname}\0'.encode())
+    environs = [_environ_record(e) for e in environs]
+    h.update(jsonext.dumps([build_commands, partition.prepare_cmds,
+                            environs], sort_keys=True).encode())
+    _hash_tree(h, stagedir, exclude)
+    return h.hexdigest()
+
+
+class BuildCache:
+    '''A cache of build artifacts keyed by the inputs of the build.
+
+    Each entry holds a snapshot of the stage directory after a successful
+    build along with the standard output and error of the build job. Entries
+    are published atomically, so that concurrent ReFrame sessions may share
+    the same cache; they are never evicted, but the cache directory may be
+    safely removed at any time.
+
+    The cache keeps also track of the builds of the current session that
+    have been submitted, but not stored yet, so that tests with identical
+    builds may wait for them instead of building again.
+
+    :arg prefix: The directory of the cache.
+    :arg shared_only: Store only the builds that other tests wait for.
+    '''
+
+    def __init__(self, prefix, shared_only=False):
+        self._prefix = os.path.abspath(prefix)
+        self._shared_only = shared_only
+
+        # key -> test whose build is in progress
+        self._pending = {}
+
+        # Keys of the pending builds that other tests wait for
+        self._shared = set()
+        _caches.add(self)
+
+    @property
+    def prefix(self):
+        return self._prefix
+
+    def _entry_path(self, key):
+        return os.path.join(self._prefix, key[:2], key)
+
+    def __contains__(self, key):
+        return os.path.isdir(self._entry_path(key))
+
+    def add_pending(self, key, test):
+        '''Register the submitted build of ``test`` under ``key``.'''
+        self._pending[key] = test
+
+    def pending(self, key):
+        '''Return the test whose build with ``key`` is in progress or
+        :obj:`None`.'''
+        return self._pending.get(key)
+
+    def follow(self, key):
+        '''Return the test whose build with ``key`` is in progress or
+        :obj:`None` and register the caller as waiting for it.'''
+        leader = self._pending.get(key)
+        if leader is not None:
+            self._shared.add(key)
+
+        return leader
+
+    def needs_store(self, key):
+        '''Check if the build with ``key`` must be stored.'''
+        return not self._shared_only or key in self._shared
+
+    def discard_pending(self, key):
+        self._pending.pop(key, None)
+        self._shared.discard(key)
+
+    def abandon(self, test):
+        '''Discard the pending builds of ``test``.'''
+        for key, leader in list(self._pending.items()):
+            if leader is test:
+                self.discard_pending(key)
+
+    def store(self, key, stagedir, build_job):
+        '''Store the contents of ``stagedir`` under ``key``.
+
+        The files of ``build_job`` are stored separately from the stage
+        directory, so that they may be restored under a different name.
+        '''
+        if key in self:
+            self.discard_pending(key)
+            return
+
+        job_files = {build_job.script_filename,
+                     build_job.stdout, build_job.stderr}
+
+        def ignore(dirname, contents):
+            if dirname != stagedir:
+                return set()
+
+            return job_files & set(contents)
+
+        entrydir = os.path.dirname(self._entry_path(key))
+        os.makedirs(entrydir, exist_ok=True)
+        tmpdir = tempfile.mkdtemp(dir=entrydir, prefix='.tmp_')
+        try:
+            shutil.copytree(stagedir, os.path.join(tmpdir, 'stage'),
+                            symlinks=True, ignore=ignore,
+                            copy_function=osext.clone_file)
+            osext.clone_file(os.path.join(stagedir, build_job.stdout),
+                             os.path.join(tmpdir, 'build.out'))
+            osext.clone_file(os.path.join(stagedir, build_job.stderr),
+                             os.path.join(tmpdir, 'build.err'))
+            os.rename(tmpdir, self._entry_path(key))
+        except OSError:
+            # The entry may have been published concurrently by another
+            # session, in which case there is nothing to do
+            osext.rmtree(tmpdir, ignore_errors=True)
+            if key not in self:
+                raise
+
+        self.discard_pending(key)
+
+    def restore(self, key, stagedir, build_job):
+        '''Restore the entry ``key`` into ``stagedir``.
+
+        :returns: :class:`True` if the entry was found and restored,
+            :class:`False` otherwise.
+        '''
+        entry = self._entry_path(key)
+        if key not in self:
+            return False
+
+        osext.copytree(os.path.join(entry, 'stage'), stagedir,
+                       symlinks=True, dirs_exist_ok=True,
+                       copy_function=osext.clone_file)
+        osext.clone_file(os.path.join(entry, 'build.out'),
+                         os.path.join(stagedir, build_job.stdout))
+        osext.clone_file(os.path.join(entry, 'build.err'),
+                         os.path.join(stagedir, build_job.stderr))
+        return True
+
+
+def abandon_builds(test):
+    '''Discard the pending builds of ``test`` in all the build caches.
+
+    This must be called when ``test`` fails or is skipped, so that the tests
+    waiting for its build fail instead of waiting for a build that will never
+    be stored.
+    '''
+    for cache in _caches:
+        cache.abandon(test)
+
+
+@functools.lru_cache(maxsize=None)
+def getcache(prefix):
+    '''Return the build cache located at ``prefix``.
+
+    The same object is returned for the same ``prefix``, so that the pending
+    builds are shared by all the tests of the session.
+    '''
+    return BuildCache(prefix)
+
+
+@functools.lru_cache(maxsize=None)
+def session_cache(basedir):
+    '''Return a build cache private to the current session.
+
+    The cache is created under ``basedir`` and it is removed at exit. Only
+    the builds that other tests wait for are stored in it.
+    '''
+    os.makedirs(basedir, exist_ok=True)
+    prefix = tempfile.mkdtemp(prefix='.rfm_builds_', dir=basedir)
+    atexit.register(osext.rmtree, prefix, ignore_errors=True)
+    return BuildCache(prefix, shared_only=True)
@@ -6,6 +6,7 @@
 import copy
 import fnmatch
 import functools
+import hashlib
 import itertools
 import json
 import jsonschema
@@ -41,6 +42,14 @@ def _match_option(opt, opt_map):
 def _normalize_syntax(conv):
     '''Normalize syntax for options accepting multiple syntaxes'''
 
+    @functools.lru_cache(maxsize=None)
+    def _find_norm_fn(option):
+        for opt_patt, norm_fn in conv.items():
+            if re.match(opt_patt, option):
+                return norm_fn
+
+        return None
+
     def _do_normalize(fn):
 
         @functools.wraps(fn)
@@ -49,10 +58,9 @@ def _normalize_syntax(conv):
             if option is None:
                 return ret
 
-            for opt_patt, norm_fn in conv.items():
-                if re.match(opt_patt, option):
-                    ret = norm_fn(ret)
-                    break
+            norm_fn = _find_norm_fn(option)
+            if norm_fn is not None:
+                ret = norm_fn(ret)
 
             return ret
 
@@ -61,6 +69,39 @@ def _normalize_syntax(conv):
     return _do_normalize
 
 
+@functools.lru_cache(maxsize=None)
+def _compile_option(option):
+    '''Convert a configuration option to the list of its path components.
+
+    Indices are converted to integers. Invalid options are converted to
+    :obj:`None`.
+    '''
+
+    # Options may not start with a slash
+    if not option or option[0] == '/':
+        return None
+
+    # Remove trailing /
+    if option[-1] == '/':
+        option = option[:-1]
+
+    # Convert any indices to integers
+    prepared_option = []
+    for opt in option.split('/'):
+        try:
+            opt = int(opt)
+        except ValueError:
+            pass
+
+        prepared_option.append(opt)
+
+    return tuple(prepared_option)
+
+
+# Sentinel for the options that are not found in the configuration
+_NOT_FOUND = object()
+
+
 def _hostname(use_fqdn, use_xthostname):
     '''Return hostname'''
     if use_xthostname:
@@ -88,6 +129,12 @@ class _SiteConfig:
         self._subconfigs = {}
         self._local_system = None
         self._sticky_options = {}
+
+        # Memoized option values of the currently selected configuration
+        self._option_values = {}
+
+        # Directory of the cached validated and resolved configurations
+        self._cache_dir = None
         self._autodetect_meth = 'hostname'
         self._autodetect_opts = {
             'hostname': {
@@ -141,6 +188,64 @@ class _SiteConfig:
                 f'unknown auto-detection method: {method!r}'
             ) from None
 
+    def set_cache_dir(self, dirname):
+        '''Cache the validated and resolved configurations in ``dirname``.
+
+        The cached configurations are keyed by a hash of the content of the
+        configuration and of the schema, so that the validation and the
+        resolution of the configuration are skipped if neither has changed.
+        If ``dirname`` is :obj:`None` or empty, caching is disabled.
+        '''
+
+        self._cache_dir = None
+        if not dirname:
+            return
+
+        # Only configurations that survive a JSON round trip can be cached
+        try:
+            content = json.dumps([reframe.VERSION, self._site_config,
+                                  self._schema], sort_keys=True)
+        except (TypeError, ValueError):
+            getlogger().debug('configuration is not JSON serializable; '
+                              'it will not be cached')
+            return
+
+        if json.loads(content)[1] != self._site_config:
+            getlogger().debug('configuration does not survive a JSON round '
+                              'trip; it will not be cached')
+            return
+
+        digest = hashlib.sha256(content.encode()).hexdigest()
+        self._cache_dir = os.path.join(dirname, digest)
+
+    def _cache_lookup(self, name):
+        if self._cache_dir is None:
+            return None
+
+        try:
+            with open(os.path.join(self._cache_dir, name)) as fp:
+                return json.load(fp)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            getlogger().debug(f'could not read cached configuration '
+                              f'{name!r}: {e}')
+            return None
+
+    def _cache_update(self, name, data):
+        if self._cache_dir is None:
+            return
+
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            util.osext.dump_json_atomic(data,
+                                        os.path.join(self._cache_dir, name))
+        except OSError as e:
+            getlogger().warning(
+                f'could not cache the configuration in '
+                f'{self._cache_dir!r}: {e}'
+            )
+
     @property
     def schema(self):
         '''Configuration schema'''
@@ -148,9 +253,11 @@ class _SiteConfig:
 
     def add_sticky_option(self, option, value):
         self._sticky_options[option] = value
+        self._option_values.clear()
 
     def remove_sticky_option(self, option):
         self._sticky_options.pop(option, None)
+        self._option_values.clear()
 
     def is_sticky_option(self, option):
         return option in self._sticky_options
@@ -160,25 +267,23 @@ class _SiteConfig:
         '''Retrieve value of option.
 
         If the option cannot be retrieved, ``default`` will be returned.
-        '''
 
-        # Options may not start with a slash
-        if not option or option[0] == '/':
-            return default
+        The values of the options are memoized until another configuration
+        is selected or the sticky options change.
+        '''
 
-        # Remove trailing /
-        if option[-1] == '/':
-            option = option[:-1]
+        try:
+            value = self._option_values[option]
+        except KeyError:
+            value = self._lookup(option)
+            self._option_values[option] = value
 
-        # Convert any indices to integers
-        prepared_option = []
-        for opt in option.split('/'):
-            try:
-                opt = int(opt)
-            except ValueError:
-                pass
+        return default if value is _NOT_FOUND else value
 
-            prepared_option.append(opt)
+    def _lookup(self, option):
+        prepared_option = _compile_option(option)
+        if prepared_option is None:
+            return _NOT_FOUND
 
         # Walk through the option path constructing a default key at the same
         # time for looking it up in the defaults or the sticky options
@@ -238,7 +343,7 @@ class _SiteConfig:
             try:
                 return _match_option(default_key, self._schema['defaults'])
             except KeyError:
-                return default
+                return _NOT_FOUND
 
         return value
 
@@ -343,6 +448,14 @@ class _SiteConfig:
                           f"for the current system: '{hostname}'")
 
     def validate(self):
+        if self._local_system:
+            cache_entry = f'validated.{self._local_system}.json'
+        else:
+            cache_entry = 'validated.json'
+
+        if self._cache_lookup(cache_entry):
+            return
+
         site_config = self._pick_config()
         try:
             jsonschema.validate(site_config, self._schema)
@@ -369,17 +482,9 @@ class _SiteConfig:
 
                 partition_names.add(partname)
 
-    def select_subconfig(self, system_fullname=None,
-                         ignore_resolve_errors=False):
-        # First look for the current subconfig in the cache; if not found,
-        # generate it and cache it
-        system_fullname = system_fullname or self._detect_system()
-        getlogger().debug(f'Selecting subconfig for {system_fullname!r}')
-
-        self._local_system = system_fullname
-        if system_fullname in self._subconfigs:
-            return self._subconfigs[system_fullname]
+        self._cache_update(cache_entry, True)
 
+    def _resolve_subconfig(self, system_fullname):
         try:
             system_name, part_name = system_fullname.split(':', maxsplit=1)
         except ValueError:
@@ -448,6 +553,26 @@ class _SiteConfig:
                     local_config.setdefault(name, [])
                     local_config[name].append(val)
 
+        return local_config
+
+    def select_subconfig(self, system_fullname=None,
+                         ignore_resolve_errors=False):
+        # First look for the current subconfig in the cache; if not found,
+        # generate it and cache it
+        system_fullname = system_fullname or self._detect_system()
+        getlogger().debug(f'Selecting subconfig for {system_fullname!r}')
+
+        self._local_system = system_fullname
+        self._option_values.clear()
+        if system_fullname in self._subconfigs:
+            return self._subconfigs[system_fullname]
+
+        cache_entry = f'subconfig.{system_fullname}.json'
+        local_config = self._cache_lookup(cache_entry)
+        if local_config is None:
+            local_config = self._resolve_subconfig(system_fullname)
+            self._cache_update(cache_entry, local_config)
+
         required_sections = self._schema['required']
         for name in required_sections:
             if name not in local_config.keys():
@@ -460,9 +585,9 @@ class _SiteConfig:
         # Verify that all environments defined by the system are defined for
         # the current system
         if not ignore_resolve_errors:
+            partitions = local_config['systems'][0]['partitions']
             sys_environs = {
-                *itertools.chain(*(p['environs']
-                                   for p in systems[0]['partitions']))
+                *itertools.chain(*(p['environs'] for p in partitions))
             }
             found_environs = {
                 e['name'] for e in local_config['environments']
@@ -49,6 +49,12 @@ class TestRegistry:
         self._tests = dict()
         self._skip_tests = set()
 
+        # Variants not selected for instantiation by name
+        self._deferred = {}
+
+        # Fixtures instantiated so far
+        self._fixture_registry = FixtureRegistry()
+
     @classmethod
     def create(cls, test, *args, **kwargs):
         obj = cls()
@@ -64,40 +70,96 @@ class TestRegistry:
         '''Add a test to the skip set.'''
         self._skip_tests.add(test)
 
-    def instantiate_all(self, reset_sysenv=0):
+    def instantiate_all(self, reset_sysenv=0, select=None):
         '''Instantiate all the registered tests.
 
         :param reset_sysenv: Reset valid_systems and valid_prog_environs after
             instantiating the tests. Bit 0 resets the valid_systems, bit 1
             resets the valid_prog_environs.
+        :param select: A callable accepting a test class and a variant number
+            and returning whether this variant must be instantiated. Variants
+            that are not selected are deferred and they may be instantiated
+            later by name with :func:`instantiate`. Tests registered with
+            other constructor arguments are always instantiated.
+        '''
+
+        self._deferred = {}
+        self._fixture_registry = FixtureRegistry()
+        variants = []
+        for test, test_variants in self._tests.items():
+            if test in self._skip_tests:
+                continue
+
+            for args, kwargs in test_variants:
+                if select and not args and list(kwargs) == ['variant_num']:
+                    variant_num = kwargs['variant_num']
+                    if not select(test, variant_num):
+                        name = test.variant_name(variant_num)
+                        self._deferred[name] = (test, args, kwargs)
+                        continue
+
+                variants.append((test, args, kwargs))
+
+        return self._instantiate(variants, reset_sysenv)
+
+    def deferred(self):
+        '''Return the names of the variants deferred by the last call to
+        :func:`instantiate_all`.'''
+        return self._deferred.keys()
+
+    def variant_nums(self, test):
+        '''Return the variant numbers that ``test`` is registered with.
+
+        If the test is registered with other constructor arguments, the
+        variants it generates are not known before its instantiation and
+        :obj:`None` is returned.
+        '''
+        if test in self._skip_tests:
+            return []
+
+        ret = []
+        for args, kwargs in self._tests.get(test, []):
+            if args or list(kwargs) != ['variant_num']:
+                return None
+
+            ret.append(kwargs['variant_num'])
+
+        return ret
+
+    def instantiate(self, names, reset_sysenv=0):
+        '''Instantiate the deferred variants with the given names.
+
+        Names that do not refer to deferred variants are ignored. Fixtures
+        already instantiated by previous calls are not instantiated again.
         '''
+        variants = [self._deferred.pop(n) for n in names
+                    if n in self._deferred]
+        return self._instantiate(variants, reset_sysenv)
 
+    def _instantiate(self, variants, reset_sysenv):
         # We first instantiate the leaf tests and then walk up their
         # dependencies to instantiate all the fixtures. Fixtures can only
         # establish their exact dependencies at instantiation time, so the
         # dependency graph grows dynamically.
 
         leaf_tests = []
-        for test, variants in self._tests.items():
-            if test in self._skip_tests:
-                continue
-
-            for args, kwargs in variants:
-                try:
-                    kwargs['reset_sysenv'] = reset_sysenv
-                    leaf_tests.append(test(*args, **kwargs))
-                except SkipTestError as e:
-                    getlogger().warning(
-                        f'skipping test {test.__qualname__!r}: {e}'
-                    )
-                except Exception:
-                    exc_info = sys.exc_info()
-                    getlogger().warning(
-                        f"skipping test {test.__qualname__!r}: "
-                        f"{what(*exc_info)} "
-                        f"(rerun with '-v' for more information)"
-                    )
-                    getlogger().verbose(traceback.format_exc())
+        for test, args, kwargs in variants:
+            try:
+                leaf_tests.append(
+                    test(*args, reset_sysenv=reset_sysenv, **kwargs)
+                )
+            except SkipTestError as e:
+                getlogger().warning(
+                    f'skipping test {test.__qualname__!r}: {e}'
+                )
+            except Exception:
+                exc_info = sys.exc_info()
+                getlogger().warning(
+                    f"skipping test {test.__qualname__!r}: "
+                    f"{what(*exc_info)} "
+                    f"(rerun with '-v' for more information)"
+                )
+                getlogger().verbose(traceback.format_exc())
 
         # Instantiate fixtures
 
@@ -107,7 +169,6 @@ class TestRegistry:
         # traversal and all instantiated tests (including fixtures) are stored
         # in `final_tests`.
         final_tests = []
-        fixture_registry = FixtureRegistry()
         while leaf_tests:
             tmp_registry = FixtureRegistry()
             while leaf_tests:
@@ -118,9 +179,9 @@ class TestRegistry:
                     tmp_registry.update(reg)
 
             # Instantiate the new fixtures and update the registry
-            new_fixtures = tmp_registry.difference(fixture_registry)
+            new_fixtures = tmp_registry.difference(self._fixture_registry)
             leaf_tests = new_fixtures.instantiate_all()
-            fixture_registry.update(new_fixtures)
+            self._fixture_registry.update(new_fixtures)
 
         return final_tests
 
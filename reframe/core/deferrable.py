@@ -4,7 +4,11 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 import builtins
+import collections.abc
+import contextlib
 import functools
+import itertools
+import time
 
 
 def deferrable(func):
@@ -51,6 +55,23 @@ class _DeferredExpression:
         self._cached = ()
         self._return_cached = False
 
+        # The raw result of the deferred function, if it was called by
+        # `_expand()`, inside a tuple for the same reason as above
+        self._expanded = ()
+
+    def _expand(self):
+        '''Call the deferred function without evaluating its result.
+
+        If the deferred function builds and returns another deferred
+        expression, this allows looking into it before it is evaluated. The
+        result is consumed by the next evaluation of this expression, so that
+        the deferred function is not called again.
+        '''
+        if not self._expanded:
+            self._expanded = (_evaluate(self, expand=True),)
+
+        return self._expanded[0]
+
     def evaluate(self, cache=False):
         # Return the cached value (if any)
         if self._return_cached and not cache:
@@ -58,28 +79,7 @@ class _DeferredExpression:
         elif cache:
             self._return_cached = cache
 
-        fn_args = []
-        for arg in self._args:
-            fn_args.append(
-                arg.evaluate() if isinstance(arg, _DeferredExpression) else arg
-            )
-
-        fn_kwargs = {}
-        for k, v in self._kwargs.items():
-            fn_kwargs[k] = (
-                v.evaluate() if isinstance(v, _DeferredExpression) else v
-            )
-
-        ret = self._fn(*fn_args, **fn_kwargs)
-
-        # Evaluate the return for as long as a deferred expression returns
-        # another deferred expression.
-        while isinstance(ret, _DeferredExpression):
-            ret = ret.evaluate()
-
-        # Cache the results for any subsequent evaluate calls.
-        self._cached = (ret,)
-        return ret
+        return _evaluate(self)
 
     def __bool__(self):
         '''The truthy value of a deferred expression.
@@ -366,6 +366,194 @@ class _DeferredExpression:
         return ~a
 
 
+def _evaluate(root, expand=False):
+    '''Evaluate the deferred expression ``root``.
+
+    The graph of the deferred expressions is traversed iteratively and each
+    distinct expression is evaluated only once. Results that are iterators
+    are not shared, since they can be consumed only once; every other use of
+    such an expression evaluates it anew.
+
+    If ``expand`` is :obj:`True`, return the raw result of the deferred
+    function of ``root`` instead.
+    '''
+
+    # id(expr) -> (expr, value); the expressions are kept alive, so that
+    # their ids are not reused during the evaluation
+    values = {}
+
+    # id(expr) -> (expr, the deferred expression returned by expr)
+    forwards = {}
+
+    # ids of the expressions whose value has been used
+    used = set()
+
+    def _take(expr):
+        try:
+            _, value = values[id(expr)]
+        except KeyError:
+            # An iterator that has been consumed already
+            return expr.evaluate()
+
+        if isinstance(value, collections.abc.Iterator):
+            del values[id(expr)]
+        elif _stats is not None:
+            if id(expr) in used:
+                _stats.reused += 1
+            else:
+                used.add(id(expr))
+
+        return value
+
+    stack = [root]
+    while stack:
+        expr = stack[-1]
+        key = id(expr)
+        if key in values:
+            stack.pop()
+            continue
+
+        if key in forwards:
+            target = forwards[key][1]
+            if id(target) not in values:
+                stack.append(target)
+                continue
+
+            ret = _take(target)
+        elif expr is not root and expr._return_cached:
+            values[key] = (expr, expr._cached[0])
+            stack.pop()
+            continue
+        elif expr._expanded and not expand:
+            ret = expr._expanded[0]
+            expr._expanded = ()
+        else:
+            pending = [
+                arg for arg in itertools.chain(expr._args,
+                                               expr._kwargs.values())
+                if isinstance(arg, _DeferredExpression) and
+                id(arg) not in values
+            ]
+
+            if pending:
+                stack.extend(reversed(pending))
+                continue
+
+            args = [_take(arg) if isinstance(arg, _DeferredExpression)
+                    else arg for arg in expr._args]
+            kwargs = {k: _take(v) if isinstance(v, _DeferredExpression)
+                      else v for k, v in expr._kwargs.items()}
+            if _stats is None:
+                ret = expr._fn(*args, **kwargs)
+            else:
+                t_start = time.perf_counter()
+                try:
+                    ret = expr._fn(*args, **kwargs)
+                finally:
+                    _stats._record(expr._fn,
+                                   time.perf_counter() - t_start)
+
+            if expand and expr is root:
+                return ret
+
+        # Evaluate the return for as long as a deferred expression returns
+        # another deferred expression.
+        if isinstance(ret, _DeferredExpression):
+            forwards[key] = (expr, ret)
+            continue
+
+        # Cache the results for any subsequent evaluate calls.
+        expr._cached = (ret,)
+        values[key] = (expr, ret)
+        stack.pop()
+
+    return values[id(root)][1]
+
+
+class EvaluationStats:
+    '''Statistics of the evaluation of deferred expressions.
+
+    .. attribute:: nodes
+
+       The number of deferred expressions evaluated.
+
+    .. attribute:: reused
+
+       The number of times the result of an already evaluated deferred
+       expression was reused within the same evaluation.
+
+    .. attribute:: functions
+
+       A dictionary mapping the name of each deferrable function to a tuple
+       with the number of its calls and the total time spent in them.
+       The time spent in evaluating the arguments of the function is not
+       included.
+
+    .. versionadded:: 3.12.0
+    '''
+
+    def __init__(self):
+        self.nodes = 0
+        self.reused = 0
+        self.functions = {}
+
+    def _record(self, fn, elapsed):
+        name = getattr(fn, '__qualname__', type(fn).__qualname__)
+        num_calls, total_time = self.functions.get(name, (0, 0.0))
+        self.functions[name] = (num_calls + 1, total_time + elapsed)
+        self.nodes += 1
+
+    def summary(self):
+        '''Return a textual summary of the statistics.
+
+        The deferrable functions are listed in decreasing order of the time
+        spent in them.
+        '''
+        lines = [f'{self.nodes} expression(s) evaluated, '
+                 f'{self.reused} result(s) reused']
+        for name, (num_calls, total_time) in sorted(
+            self.functions.items(), key=lambda x: x[1][1], reverse=True
+        ):
+            lines.append(f'  {name}: {num_calls} call(s), {total_time:.6f}s')
+
+        return '\n'.join(lines)
+
+
+# The statistics of the active `evaluation_stats()` context
+_stats = None
+
+
+@contextlib.contextmanager
+def evaluation_stats():
+    '''Context manager for collecting statistics of the evaluation of
+    deferred expressions.
+
+    It yields an :class:`EvaluationStats` object, which is updated by every
+    evaluation inside this context.
+    Nested contexts yield the statistics of the outermost one.
+
+    .. code-block:: python
+
+       with sn.evaluation_stats() as stats:
+           sn.evaluate(self.sanity_patterns)
+
+       print(stats.summary())
+
+    .. versionadded:: 3.12.0
+    '''
+    global _stats
+
+    if _stats is not None:
+        yield _stats
+        return
+
+    _stats = EvaluationStats()
+    try:
+        yield _stats
+    finally:
+        _stats = None
+
+
 class _DeferredPerformanceExpression(_DeferredExpression):
     '''Represents a performance function whose evaluation has been deferred.
 
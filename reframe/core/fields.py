@@ -7,6 +7,7 @@
 # Useful descriptors for advanced operations on fields
 #
 
+import copy
 import datetime
 import re
 
@@ -15,6 +16,10 @@ from reframe.core.warnings import user_deprecation_warning
 from reframe.utility import ScopedDict
 
 
+# Values of these types can be shared without being copied
+_IMMUTABLE_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+
 class _Convertible:
     '''Wrapper for values that allowed to be converted implicitly'''
 
@@ -48,18 +53,47 @@ class Field:
 
     def __get__(self, obj, objtype):
         if obj is None:
-            return self
+            # Test variables evaluate to their variable when accessed from
+            # the test class
+            try:
+                return objtype._rfm_var_space.vars[self._name]
+            except (AttributeError, KeyError):
+                return self
 
         try:
-            return obj.__dict__[self._name]
+            value = obj.__dict__[self._name]
         except KeyError:
             # We raise an AttributeError to emulate the standard attribute
             # access.
             raise AttributeError("%s object has no attribute '%s'" %
                                  (objtype.__name__, self._name)) from None
 
+        # Copy any shared value on first access, since it may be modified
+        shared = obj.__dict__.get('_rfm_shared_fields')
+        if shared and self._name in shared:
+            shared.discard(self._name)
+            value = copy.deepcopy(value)
+            obj.__dict__[self._name] = value
+
+        return value
+
     def __set__(self, obj, value):
         obj.__dict__[self._name] = remove_convertible(value)
+        shared = obj.__dict__.get('_rfm_shared_fields')
+        if shared:
+            shared.discard(self._name)
+
+    def share(self, obj, value):
+        '''Set the field of ``obj`` to ``value`` without validating it.
+
+        The value is copied only when it is first accessed through this
+        field, so that it may be shared by multiple objects until then.
+        '''
+        obj.__dict__[self._name] = value
+        if type(value) not in _IMMUTABLE_TYPES:
+            obj.__dict__.setdefault('_rfm_shared_fields', set()).add(
+                self._name
+            )
 
 
 class TypedField(Field):
@@ -219,7 +253,7 @@ class DeprecatedField(Field):
         self._target_field.__set__(obj, value)
 
     def __get__(self, obj, objtype):
-        if self._op & DeprecatedField.OP_GET:
+        if obj is not None and self._op & DeprecatedField.OP_GET:
             user_deprecation_warning(self._message, self._from_version)
 
         return self._target_field.__get__(obj, objtype)
@@ -451,33 +451,6 @@ class RegressionTestMeta(type):
         cls._rfm_fixture_space.inject(obj, cls, fixt_index)
         return obj
 
-    def __getattribute__(cls, name):
-        '''Attribute lookup method for custom class attributes.
-
-        ReFrame test variables are descriptors injected at the class level.
-        If a variable descriptor has already been injected into the class,
-        do not return the descriptor object and return the default value
-        associated with that variable instead.
-
-        .. warning::
-            .. versionchanged:: 3.7.0
-               Prior versions exposed the variable descriptor object if this
-               was already present in the class, instead of returning the
-               variable's default value.
-        '''
-
-        try:
-            var_space = super().__getattribute__('_rfm_var_space')
-        except AttributeError:
-            var_space = None
-
-        # If the variable is already injected, delegate lookup to __getattr__.
-        if var_space and name in var_space.injected_vars:
-            raise AttributeError('delegate variable lookup to __getattr__')
-
-        # Default back to the base method if no special treatment required.
-        return super().__getattribute__(name)
-
     def __getattr__(cls, name):
         '''Backup attribute lookup method into custom namespaces.
 
@@ -816,6 +789,40 @@ class RegressionTestMeta(type):
 
         return name
 
+    def variant_display_name(cls, variant_num):
+        '''Return the display name of the test variant with a specific
+        variant number.
+
+        This is the :attr:`~reframe.core.pipeline.RegressionTest.display_name`
+        that the variant will have once instantiated, unless it is a fixture.
+
+        :param variant_num: An integer in the range of ``[0, cls.num_variants)``.
+
+        .. versionadded:: 3.12.0
+        '''
+        def _format_params(cls, info, prefix=' %'):
+            name = ''
+            for p, v in info['params'].items():
+                format_fn = cls.raw_params[p].format
+                name += f'{prefix}{p}={format_fn(v)}'
+
+            for f, v in info['fixtures'].items():
+                if isinstance(v, tuple):
+                    # This is join fixture
+                    continue
+
+                fixt = cls.fixture_space[f]
+                name += _format_params(fixt.cls, v, f'{prefix}{f}.')
+
+                # Append any variables set for the fixtures
+                for var, val in fixt.variables.items():
+                    name += f'{prefix}{f}.{var}={val}'
+
+            return name
+
+        variant_info = cls.get_variant_info(variant_num, recurse=True)
+        return cls.__name__ + _format_params(cls, variant_info)
+
     def loggable_attrs(cls):
         '''Get the loggable attributes of this class.'''
         loggable_vars = [(name, None) for name, var in cls.var_space.items()
@@ -213,9 +213,11 @@ class ParamSpace(namespaces.Namespace):
     class that the parameter space is being built for. If no target class is
     provided, the parameter space is initialized as empty.
 
-    All the parameter combinations are stored under ``__param_combinations``.
-    This enables random-access to any of the available parameter combinations
-    through the ``__getitem__`` method.
+    The parameter combinations are not stored. They are ordered as in
+    :func:`itertools.product` and any of them can be accessed randomly
+    through the ``__getitem__`` method by decomposing its index into the
+    indices of the values of each parameter; the index of the last parameter
+    is the fast running one.
     '''
 
     def __init__(self, target_cls=None, illegal_names=None):
@@ -223,17 +225,44 @@ class ParamSpace(namespaces.Namespace):
                          ns_name='_rfm_param_space',
                          ns_local_name='_rfm_local_param_space')
 
-        # Store all param combinations to allow random access.
-        self.__param_combinations = tuple(
-            itertools.product(
-                *(copy.deepcopy(p.values) for p in self.params.values())
-            )
+        # The values of each parameter in the order they are combined
+        self.__param_values = tuple(
+            copy.deepcopy(p.values) for p in self.params.values()
         )
 
         # Map the parameter names to the position they are stored in the
         # parameter space
         self._position = {name: idx for idx, name in enumerate(self.params)}
 
+        # The number of combinations that the index of each parameter value
+        # corresponds to
+        self.__strides = []
+        stride = 1
+        for values in reversed(self.__param_values):
+            self.__strides.insert(0, stride)
+            stride *= len(values)
+
+        self.__num_combinations = stride
+
+    def _value_indices(self, params_index):
+        '''Decompose a point in the parameter space into the indices of the
+        values of each parameter.'''
+
+        if params_index < 0:
+            params_index += self.__num_combinations
+
+        if params_index < 0 or params_index >= self.__num_combinations:
+            raise IndexError('parameter space index out of range')
+
+        return [(params_index // stride) % len(values)
+                for stride, values in zip(self.__strides,
+                                          self.__param_values)]
+
+    def _combination(self, params_index):
+        return tuple(values[i] for values, i in
+                     zip(self.__param_values,
+                         self._value_indices(params_index)))
+
     def join(self, other, cls):
         '''Join other parameter space into the current one.
 
@@ -301,7 +330,7 @@ class ParamSpace(namespaces.Namespace):
         if self.params and params_index is not None:
             try:
                 # Get the parameter values for the specified variant
-                param_values = self.__param_combinations[params_index]
+                param_values = self._combination(params_index)
             except IndexError as no_params:
                 raise RuntimeError(
                     f'parameter space index out of range for '
@@ -336,7 +365,7 @@ class ParamSpace(namespaces.Namespace):
 
         :return: generator object to iterate over the parameter space.
         '''
-        yield from self.__param_combinations
+        yield from itertools.product(*self.__param_values)
 
     def __len__(self):
         '''Returns the number of all possible parameter combinations.
@@ -355,7 +384,7 @@ class ParamSpace(namespaces.Namespace):
         if not self.params:
             return 1
 
-        return len(self.__param_combinations)
+        return self.__num_combinations
 
     def __getitem__(self, key):
         '''Access an element in the parameter space.
@@ -372,7 +401,7 @@ class ParamSpace(namespaces.Namespace):
         '''
         if isinstance(key, int):
             ret = {}
-            val = self.__param_combinations[key]
+            val = self._combination(key)
             for i, name in enumerate(self.params):
                 ret[name] = val[i]
 
@@ -397,9 +426,11 @@ class ParamSpace(namespaces.Namespace):
             space.
 
         '''
-        candidates = range(len(self))
         if not conditions:
-            return list(candidates)
+            return list(range(len(self)))
+
+        # The indices of the selected values of each parameter
+        selected = [range(len(values)) for values in self.__param_values]
 
         # Validate conditions
         for param, cond in conditions.items():
@@ -419,18 +450,12 @@ class ParamSpace(namespaces.Namespace):
                     f'single argument'
                 )
 
-            def param_val(variant):
-                return self._get_param_value(param, variant)
-
-            # Filter the given condition
-            candidates = [v for v in candidates if cond(param_val(v))]
+            # Filter the values of the parameter
+            pos = self._position[param]
+            values = self.__param_values[pos]
+            selected[pos] = [i for i in selected[pos] if cond(values[i])]
 
-        return candidates
-
-    def _get_param_value(self, name, variant):
-        '''Get the a parameter's value for a given variant.
-
-        In this context, a variant is a point in the parameter space.
-        The name argument is simply the parameter name
-        '''
-        return self.__param_combinations[variant][self._position[name]]
+        # Combine the selected values; the variant numbers are generated in
+        # increasing order
+        return [sum(i*stride for i, stride in zip(indices, self.__strides))
+                for indices in itertools.product(*selected)]
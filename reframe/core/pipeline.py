@@ -20,13 +20,16 @@ import inspect
 import itertools
 import numbers
 import os
+import re
 import shutil
 
+import reframe.core.buildcache as buildcache
 import reframe.core.environments as env
 import reframe.core.fields as fields
 import reframe.core.hooks as hooks
 import reframe.core.logging as logging
 import reframe.core.runtime as rt
+import reframe.core.sourcecache as sourcecache
 import reframe.utility as util
 import reframe.utility.jsonext as jsonext
 import reframe.utility.osext as osext
@@ -40,8 +43,8 @@ from reframe.core.deferrable import (_DeferredExpression,
                                      _DeferredPerformanceExpression)
 from reframe.core.exceptions import (BuildError, DependencyError,
                                      PerformanceError, PipelineError,
-                                     SanityError, SkipTestError,
-                                     ReframeSyntaxError)
+                                     ReframeError, SanityError,
+                                     SkipTestError, ReframeSyntaxError)
 from reframe.core.meta import RegressionTestMeta
 from reframe.core.schedulers import Job
 from reframe.core.variables import DEPRECATE_WR
@@ -94,6 +97,10 @@ _VALID_ENV_SYNTAX = rf'^({_NW}|{_FKV}(\s+{_FKV})*)$'
 _S = rf'({_NW}(:{_NW})?)'   # system/partition
 _VALID_SYS_SYNTAX = rf'^({_S}|{_FKV}(\s+{_FKV})*)$'
 
+# Maximum amount of job output read at once when scanning for the fail-fast
+# patterns
+_FAILFAST_CHUNK_SIZE = 1 << 20
+
 
 _PIPELINE_STAGES = (
     '__init__',
@@ -532,6 +539,40 @@ class RegressionTest(RegressionMixin, jsonext.JSONSerializable):
     #: :default: ``[]``
     readonly_files = variable(typ.List[str], value=[], loggable=True)
 
+    #: Files to be downloaded in the stage directory before the build.
+    #:
+    #: This maps the URLs of the files to their expected SHA-256 checksums as
+    #: hex strings. If a checksum is empty, the downloaded file is not
+    #: verified. Each file is saved in the stage directory under the last
+    #: component of its URL's path.
+    #:
+    #: If a source cache is configured (see :option:`--source-cache-dir`),
+    #: each file is downloaded only once and it is copied from the cache
+    #: thereafter, even if the contents of its URL change.
+    #:
+    #: :type: :class:`Dict[str, str]`
+    #: :default: ``{}``
+    #:
+    #: .. versionadded:: 3.12.0
+    fetch_files = variable(typ.Dict[str, str], value={}, loggable=True)
+
+    #: List of regex patterns that signify a fatal error of the test.
+    #:
+    #: While the test is running, any new output written to its standard
+    #: output and standard error is scanned for these patterns. As soon as
+    #: any of them is found, the job of the test is cancelled and the test
+    #: fails without waiting for the job to finish.
+    #: The `re.MULTILINE
+    #: <https://docs.python.org/3/library/re.html#re.MULTILINE>`_ flag is set
+    #: for the pattern search and patterns are matched against whole lines, so
+    #: they may not span multiple lines.
+    #:
+    #: :type: :class:`List[str]`
+    #: :default: ``[]``
+    #:
+    #: .. versionadded:: 3.12.0
+    failfast_patterns = variable(typ.List[str], value=[], loggable=True)
+
     #: Set of tags associated with this test.
     #:
     #: This test can be selected from the frontend using any of these tags.
@@ -939,6 +980,22 @@ class RegressionTest(RegressionMixin, jsonext.JSONSerializable):
     #: :type: boolean : :default: :class:`True`
     build_locally = variable(typ.Bool, value=True, loggable=True)
 
+    #: Allow the build artifacts of this test to be cached or shared.
+    #:
+    #: If a build cache is configured (see :option:`--build-cache-dir`) or
+    #: builds are shared (see :option:`--share-builds`), the build of this
+    #: test is skipped if another build with the same inputs, i.e., the same
+    #: staged sources, build commands, environments and partition, is cached
+    #: or in progress. The stage directory of that build is restored instead.
+    #: Set this to :class:`False` if the build depends on anything else,
+    #: e.g., on files outside the stage directory, or if the artifacts refer
+    #: to the stage directory by absolute path.
+    #:
+    #: :type: boolean : :default: :class:`True`
+    #:
+    #: .. versionadded:: 3.12.0
+    cache_build = variable(typ.Bool, value=True, loggable=True)
+
     def __new__(cls, *args, **kwargs):
         obj = super().__new__(cls)
 
@@ -962,13 +1019,9 @@ class RegressionTest(RegressionMixin, jsonext.JSONSerializable):
         obj.__deferred_rfm_init = obj.__rfm_init__(*args,
                                                    prefix=prefix, **kwargs)
 
-        # Build pipeline hook registry and add the pre-init hook
-        cls._rfm_pipeline_hooks = cls._process_hook_registry()
-        cls._rfm_pipeline_hooks['pre___init__'] = [obj.__pre_init__]
-
-        # Attach the hooks to the pipeline stages
-        for stage in _PIPELINE_STAGES:
-            cls._add_hooks(stage)
+        # Attach the hooks to the pipeline stages once per class
+        if '_rfm_pipeline_hooks' not in cls.__dict__:
+            cls._install_hooks()
 
         return obj
 
@@ -1037,6 +1090,10 @@ class RegressionTest(RegressionMixin, jsonext.JSONSerializable):
         # Associated job
         self._job = None
 
+        # Offsets up to which the job's output files are scanned for the
+        # fail-fast patterns
+        self._failfast_offsets = {}
+
         # Dynamic paths of the regression check; will be set in setup()
         self._stagedir = None
         self._outputdir = None
@@ -1045,6 +1102,9 @@ class RegressionTest(RegressionMixin, jsonext.JSONSerializable):
 
         # Compilation process output
         self._build_job = None
+        self._build_key = None
+        self._build_cache_hit = False
+        self._build_leader = None
         self._compile_proc = None
 
         # Performance logging
@@ -1100,19 +1160,36 @@ class RegressionTest(RegressionMixin, jsonext.JSONSerializable):
         return _pipeline_hooks
 
     @classmethod
-    def _add_hooks(cls, stage):
+    def _install_hooks(cls):
+        '''Build the pipeline hook registry and attach it to the stages.'''
+
+        pipeline_hooks = cls._process_hook_registry()
+        pipeline_hooks['pre___init__'] = [cls.__pre_init__]
+        for stage in _PIPELINE_STAGES:
+            cls._add_hooks(stage, pipeline_hooks)
+
+        cls._rfm_pipeline_hooks = pipeline_hooks
+
+    @classmethod
+    def _add_hooks(cls, stage, pipeline_hooks):
         '''Decorate the pipeline stages.'''
 
-        pipeline_hooks = cls._rfm_pipeline_hooks
+        # Undo the decoration of a stage inherited from an instantiated base
         fn = getattr(cls, stage)
-        new_fn = hooks.attach_hooks(pipeline_hooks)(fn)
-        setattr(cls, '_rfm_pipeline_fn_' + stage, new_fn)
-
-    def __getattribute__(self, name):
-        if name in _PIPELINE_STAGES:
-            name = f'_rfm_pipeline_fn_{name}'
+        fn = getattr(fn, '_rfm_pipeline_fn', fn)
+        hooked_fn = hooks.attach_hooks(pipeline_hooks)(fn)
+
+        @functools.wraps(fn)
+        def _stage_fn(obj, *args, **kwargs):
+            # The hooks of this class do not apply to the subclasses, which
+            # may still call this stage through `super()`
+            if type(obj) is cls:
+                return hooked_fn(obj, *args, **kwargs)
+            else:
+                return fn(obj, *args, **kwargs)
 
-        return super().__getattribute__(name)
+        _stage_fn._rfm_pipeline_fn = fn
+        setattr(cls, stage, _stage_fn)
 
     def __getattr__(self, name):
         ''' Intercept the special builtin-related AttributeError.'''
@@ -1156,36 +1233,15 @@ class RegressionTest(RegressionMixin, jsonext.JSONSerializable):
         .. versionadded:: 3.10.0
 
         '''
-        def _format_params(cls, info, prefix=' %'):
-            name = ''
-            for p, v in info['params'].items():
-                format_fn = cls.raw_params[p].format
-                name += f'{prefix}{p}={format_fn(v)}'
-
-            for f, v in info['fixtures'].items():
-                if isinstance(v, tuple):
-                    # This is join fixture
-                    continue
-
-                fixt = cls.fixture_space[f]
-                name += _format_params(fixt.cls, v, f'{prefix}{f}.')
-
-                # Append any variables set for the fixtures
-                for var, val in fixt.variables.items():
-                    name += f'{prefix}{f}.{var}={val}'
-
-            return name
-
         if hasattr(self, '_rfm_old_style_params'):
             return self.unique_name
 
         if hasattr(self, '_rfm_display_name'):
             return self._rfm_display_name
 
-        cls = type(self)
-        basename = cls.__name__
-        variant_info = cls.get_variant_info(self.variant_num, recurse=True)
-        self._rfm_display_name = basename + _format_params(cls, variant_info)
+        self._rfm_display_name = type(self).variant_display_name(
+            self.variant_num
+        )
         if self.is_fixture():
             # Add the variable info and scope
             fixt_data = self._rfm_fixt_data
@@ -1641,21 +1697,57 @@ class RegressionTest(RegressionMixin, jsonext.JSONSerializable):
                                           **job_opts)
 
     def _copy_to_stagedir(self, path):
-        self.logger.debug(f'Copying {path} to stage directory')
+        mode = rt.runtime().get_option('general/0/staging_mode')
+        self.logger.debug(f'Copying {path} to stage directory '
+                          f'(mode: {mode!r})')
         self.logger.debug(f'Symlinking files: {self.readonly_files}')
+        copy_function = {
+            'clone': osext.clone_file,
+            'copy': shutil.copy2,
+            'link': osext.link_file
+        }[mode]
         try:
             osext.copytree_virtual(
-                path, self._stagedir, self.readonly_files, dirs_exist_ok=True
+                path, self._stagedir, self.readonly_files, dirs_exist_ok=True,
+                copy_function=copy_function
             )
         except (OSError, ValueError, TypeError) as e:
             raise PipelineError('copying of files failed') from e
 
+    def _source_cache(self):
+        cache_dir = rt.runtime().get_option('general/0/source_cache_dir')
+        if cache_dir:
+            return sourcecache.getcache(cache_dir)
+
     def _clone_to_stagedir(self, url):
         self.logger.debug(f'Cloning URL {url} into stage directory')
-        osext.git_clone(
-            self.sourcesdir, self._stagedir,
-            timeout=rt.runtime().get_option('general/0/git_timeout')
-        )
+        mirror = None
+        source_cache = self._source_cache()
+        git_timeout = rt.runtime().get_option('general/0/git_timeout')
+        if source_cache:
+            try:
+                mirror = source_cache.git_mirror(url, timeout=git_timeout)
+            except ReframeError as e:
+                self.logger.debug(f'could not mirror {url}: {e}')
+            else:
+                self.logger.debug(f'Using mirror {mirror}')
+
+        osext.git_clone(self.sourcesdir, self._stagedir,
+                        timeout=git_timeout, mirror=mirror)
+
+    def _fetch_to_stagedir(self):
+        source_cache = self._source_cache()
+        for url, checksum in self.fetch_files.items():
+            self.logger.debug(f'Fetching {url} into stage directory')
+            try:
+                dst = os.path.join(self._stagedir,
+                                   sourcecache.url_filename(url))
+                if source_cache:
+                    source_cache.fetch(url, dst, checksum)
+                else:
+                    sourcecache.download(url, dst, checksum)
+            except (OSError, ReframeError) as e:
+                raise PipelineError(f'failed to fetch {url!r}') from e
 
     @final
     def compile(self):
@@ -1701,6 +1793,8 @@ class RegressionTest(RegressionMixin, jsonext.JSONSerializable):
                 self._copy_to_stagedir(os.path.join(self._prefix,
                                                     self.sourcesdir))
 
+        self._fetch_to_stagedir()
+
         # Set executable (only if hasn't been provided)
         if not hasattr(self, 'executable'):
             self.executable = os.path.join('.', self.unique_name)
@@ -1755,6 +1849,16 @@ class RegressionTest(RegressionMixin, jsonext.JSONSerializable):
                 *self.build_system.emit_build_commands(self._current_environ),
                 *self.postbuild_cmds
             ]
+            build_cache = self._build_cache()
+            if build_cache:
+                try:
+                    self._build_key = buildcache.build_key(
+                        self._stagedir, build_commands, environs,
+                        self._current_partition
+                    )
+                except OSError as e:
+                    raise PipelineError('failed to hash build inputs') from e
+
             try:
                 self._build_job.prepare(
                     build_commands, environs,
@@ -1765,7 +1869,83 @@ class RegressionTest(RegressionMixin, jsonext.JSONSerializable):
             except OSError as e:
                 raise PipelineError('failed to prepare build job') from e
 
-            self._build_job.submit()
+            if build_cache and self._build_key in build_cache:
+                self.logger.debug(
+                    f'Restoring build {self._build_key} from cache'
+                )
+                try:
+                    self._build_cache_hit = build_cache.restore(
+                        self._build_key, self._stagedir, self._build_job
+                    )
+                except OSError as e:
+                    raise PipelineError(
+                        'failed to restore build from cache'
+                    ) from e
+            elif build_cache:
+                self._build_leader = build_cache.follow(self._build_key)
+                if self._build_leader:
+                    self.logger.debug(
+                        f'Sharing build {self._build_key} of test '
+                        f'{self._build_leader.unique_name!r}'
+                    )
+
+            if not self._build_cache_hit and not self._build_leader:
+                self._build_job.submit()
+                if build_cache:
+                    build_cache.add_pending(self._build_key, self)
+
+    def _build_cache(self):
+        if not self.cache_build:
+            return None
+
+        runtime = rt.runtime()
+        cache_dir = runtime.get_option('general/0/build_cache_dir')
+        if cache_dir:
+            return buildcache.getcache(cache_dir)
+        elif runtime.get_option('general/0/share_builds'):
+            return buildcache.session_cache(runtime.stage_prefix)
+
+    def _shared_build_lost(self):
+        '''Check if the build shared with this test will never be stored.
+
+        This is the case if the leader has failed or it has failed to store
+        its build.
+        '''
+        build_cache = self._build_cache()
+        return (self._build_key not in build_cache and
+                build_cache.pending(self._build_key) is not self._build_leader)
+
+    def _restore_shared_build(self):
+        leader = self._build_leader
+        build_cache = self._build_cache()
+        if self._shared_build_lost():
+            raise PipelineError(
+                f'build of test {leader.unique_name!r} is not available'
+            )
+
+        leader.build_job.wait()
+        if leader.build_job.exitcode:
+            raise BuildError(leader.build_job.stdout,
+                             leader.build_job.stderr, leader.stagedir)
+
+        try:
+            if self._build_key not in build_cache:
+                if self._shared_build_lost():
+                    raise PipelineError(
+                        f'build of test {leader.unique_name!r} '
+                        f'is not available'
+                    )
+
+                # The leader's build has finished, but it has not been
+                # stored yet; its stage directory holds only the build,
+                # since the leader cannot run before storing it
+                build_cache.store(self._build_key, leader.stagedir,
+                                  leader.build_job)
+
+            build_cache.restore(self._build_key, self._stagedir,
+                                self._build_job)
+        except OSError as e:
+            raise PipelineError('failed to restore shared build') from e
 
     @final
     def compile_wait(self):
@@ -1787,12 +1967,29 @@ class RegressionTest(RegressionMixin, jsonext.JSONSerializable):
               more details.
 
         '''
-        self._build_job.wait()
+        if self._build_leader:
+            self._restore_shared_build()
+        elif not self._build_cache_hit:
+            self._build_job.wait()
+
+            # We raise a BuildError when we an exit code and it is non zero
+            if self._build_job.exitcode:
+                raise BuildError(self._build_job.stdout,
+                                 self._build_job.stderr, self._stagedir)
+
+            if self._build_key:
+                build_cache = self._build_cache()
+                try:
+                    if build_cache.needs_store(self._build_key):
+                        build_cache.store(self._build_key,
+                                          self._stagedir, self._build_job)
+                    else:
+                        build_cache.discard_pending(self._build_key)
+                except OSError as e:
+                    self.logger.warning(f'could not cache build: {e}')
 
-        # We raise a BuildError when we an exit code and it is non zero
-        if self._build_job.exitcode:
-            raise BuildError(self._build_job.stdout,
-                             self._build_job.stderr, self._stagedir)
+                    # Make the tests sharing this build fail
+                    build_cache.discard_pending(self._build_key)
 
         with osext.change_dir(self._stagedir):
             self.build_system.post_build(self._build_job)
@@ -1914,6 +2111,7 @@ class RegressionTest(RegressionMixin, jsonext.JSONSerializable):
 
             self._job.submit()
 
+        self._failfast_offsets = {}
         self.logger.debug(f'Spawned run job (id={self.job.jobid})')
 
         # Update num_tasks if test is flexible
@@ -1932,9 +2130,13 @@ class RegressionTest(RegressionMixin, jsonext.JSONSerializable):
         :raises reframe.core.exceptions.ReframeError: In case of errors.
 
         '''
-        if not self._build_job:
+        if not self._build_job or self._build_cache_hit:
             return True
 
+        if self._build_leader:
+            return (self._shared_build_lost() or
+                    self._build_leader.build_job.finished())
+
         return self._build_job.finished()
 
     @final
@@ -1964,7 +2166,61 @@ class RegressionTest(RegressionMixin, jsonext.JSONSerializable):
         if not self._job:
             return True
 
-        return self._job.finished()
+        done = self._job.finished()
+        if self.failfast_patterns:
+            self._check_failfast_patterns(done)
+
+        return done
+
+    def _check_failfast_patterns(self, job_finished):
+        '''Scan the new output of the run job for the fail-fast patterns.
+
+        Only complete lines are scanned; an incomplete last line is scanned
+        again when the next chunk of output arrives or, if it is never
+        terminated, when the job finishes.
+        '''
+        for filename in (self._job.stdout, self._job.stderr):
+            offset = self._failfast_offsets.get(filename, 0)
+            try:
+                with open(os.path.join(self._stagedir, filename), 'rb') as fp:
+                    while True:
+                        fp.seek(offset)
+                        data = fp.read(_FAILFAST_CHUNK_SIZE)
+                        end = advance = data.rfind(b'\n') + 1
+                        if len(data) < _FAILFAST_CHUNK_SIZE:
+                            if job_finished:
+                                # The output is complete, so is its last line
+                                end = advance = len(data)
+                        elif end == 0:
+                            # A very long line; scan it in overlapping pieces,
+                            # so that matches across the pieces are found
+                            end, advance = len(data), len(data) // 2
+
+                        self._search_failfast_patterns(
+                            data[:end].decode(errors='replace'), filename,
+                            job_finished
+                        )
+                        offset += advance
+                        self._failfast_offsets[filename] = offset
+                        if len(data) < _FAILFAST_CHUNK_SIZE:
+                            break
+            except FileNotFoundError:
+                # The output file has not been created yet
+                continue
+
+    def _search_failfast_patterns(self, text, filename, job_finished):
+        for patt in self.failfast_patterns:
+            if re.search(patt, text, re.MULTILINE):
+                if not job_finished:
+                    self.logger.debug(
+                        f'Fail-fast pattern {patt!r} found in {filename!r}; '
+                        f'cancelling job (id={self._job.jobid})'
+                    )
+                    self._job.cancel()
+
+                raise SanityError(
+                    f'fail-fast pattern {patt!r} found in {filename!r}'
+                )
 
     @final
     def poll(self):
@@ -2066,7 +2322,7 @@ class RegressionTest(RegressionMixin, jsonext.JSONSerializable):
         elif not hasattr(self, 'sanity_patterns'):
             raise SanityError('sanity_patterns not set')
 
-        with osext.change_dir(self._stagedir):
+        with osext.change_dir(self._stagedir), sn.file_cache():
             success = sn.evaluate(self.sanity_patterns)
             if not success:
                 raise SanityError()
@@ -2093,7 +2349,7 @@ class RegressionTest(RegressionMixin, jsonext.JSONSerializable):
 
         '''
 
-        with osext.change_dir(self._stagedir):
+        with osext.change_dir(self._stagedir), sn.file_cache():
             if self.perf_variables or self._rfm_perf_fns:
                 if hasattr(self, 'perf_patterns'):
                     raise ReframeSyntaxError(
@@ -2104,6 +2360,7 @@ class RegressionTest(RegressionMixin, jsonext.JSONSerializable):
 
                 # Log the performance variables
                 self._setup_perf_logging()
+                sn.batch_patterns(*self.perf_variables.values())
                 for tag, expr in self.perf_variables.items():
                     try:
                         value = expr.evaluate()
@@ -2173,6 +2430,7 @@ class RegressionTest(RegressionMixin, jsonext.JSONSerializable):
                 # We first evaluate and log all performance values and then we
                 # check them against the reference. This way we always log them
                 # even if the don't meet the reference.
+                sn.batch_patterns(*self.perf_patterns.values())
                 for tag, expr in self.perf_patterns.items():
                     value = sn.evaluate(expr)
                     key = f'{self._current_partition.fullname}:{tag}'
@@ -2208,22 +2466,31 @@ class RegressionTest(RegressionMixin, jsonext.JSONSerializable):
                 except SanityError as e:
                     raise PerformanceError(e)
 
-    def _copy_job_files(self, job, dst):
+    def _copy_job_files(self, job, dst, copy_function=shutil.copy):
         if job is None:
             return
 
         stdout = os.path.join(self._stagedir, job.stdout)
         stderr = os.path.join(self._stagedir, job.stderr)
         script = os.path.join(self._stagedir, job.script_filename)
-        shutil.copy(stdout, dst)
-        shutil.copy(stderr, dst)
-        shutil.copy(script, dst)
+        copy_function(stdout, dst)
+        copy_function(stderr, dst)
+        copy_function(script, dst)
 
     def _copy_to_outputdir(self):
         '''Copy check's interesting files to the output directory.'''
         self.logger.debug('Copying test files to output directory')
-        self._copy_job_files(self._job, self.outputdir)
-        self._copy_job_files(self._build_job, self.outputdir)
+        method = rt.runtime().get_option('general/0/compress_output')
+        if method:
+            self.logger.debug(f'Compressing output files using {method!r}')
+            copy_job_file = copy_file = functools.partial(
+                osext.copy_compressed, method=method
+            )
+        else:
+            copy_job_file, copy_file = shutil.copy, shutil.copy2
+
+        self._copy_job_files(self._job, self.outputdir, copy_job_file)
+        self._copy_job_files(self._build_job, self.outputdir, copy_job_file)
 
         with osext.change_dir(self.stagedir):
             # Copy files specified by the user, but expand any glob patterns
@@ -2238,9 +2505,10 @@ class RegressionTest(RegressionMixin, jsonext.JSONSerializable):
                     dst = os.path.join(
                         self.outputdir, os.path.relpath(f, self.stagedir)
                     )
-                    osext.copytree(f, dst, dirs_exist_ok=True)
+                    osext.copytree(f, dst, dirs_exist_ok=True,
+                                   copy_function=copy_file)
                 else:
-                    shutil.copy2(f, self.outputdir)
+                    copy_file(f, self.outputdir)
 
     @final
     def cleanup(self, remove_files=False):
@@ -2488,6 +2756,9 @@ class RegressionTest(RegressionMixin, jsonext.JSONSerializable):
         return hash(self.unique_name)
 
     def __rfm_json_decode__(self, json):
+        # The decoded values are not shared with other tests
+        self.__dict__.pop('_rfm_shared_fields', None)
+
         # 'tags' are decoded as list, so we convert them to a set
         self.tags = set(json['tags'])
 
@@ -2539,6 +2810,8 @@ class RunOnlyRegressionTest(RegressionTest, special=True):
                 self._copy_to_stagedir(os.path.join(self._prefix,
                                                     self.sourcesdir))
 
+        self._fetch_to_stagedir()
+
         super().run()
 
 
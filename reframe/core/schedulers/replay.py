@@ -0,0 +1,323 @@
+# Copyright 2016-2022 Swiss National Supercomputing Centre (CSCS/ETH Zurich)
+# ReFrame Project Developers. See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+#
+# Recording and replaying of the scheduler interactions
+#
+
+import abc
+import collections
+import json
+import os
+import re
+import shlex
+import subprocess
+import sys
+import time
+
+import reframe.utility.osext as osext
+from reframe.core.exceptions import ReframeError, SpawnedProcessTimeout
+from reframe.core.logging import getlogger
+
+
+#: Version of the data format of the recorded scheduler sessions
+DATA_VERSION = '1.1'
+
+# Dates passed to the scheduler commands, e.g., the start date of the Slurm
+# job accounting queries
+_DATE_PATT = re.compile(r'\b\d{4}-\d{2}-\d{2}(T\d{2}:\d{2}(:\d{2})?)?\b')
+
+# The arguments of the scheduler commands that refer to jobs: the options
+# whose values are comma-separated lists of job ids and whether the trailing
+# positional arguments are job ids
+_JOBID_ARGS = {
+    'bjobs': ((), True),
+    'oardel': ((), True),
+    'oarstat': (('-j', '-fj', '--job'), False),
+    'qdel': ((), True),
+    'qstat': ((), True),
+    'sacct': (('-j', '--jobs'), False),
+    'scancel': ((), True),
+    'squeue': (('-j', '--jobs'), False)
+}
+
+
+def _split_jobids(cmdstr):
+    '''Replace the job ids in the job arguments of ``cmdstr`` by ``<JOBIDS>``.
+
+    :returns: A tuple of the resulting command and the set of job ids.
+    '''
+    # The job ids are never quoted, so the arguments are not unquoted
+    args = cmdstr.split()
+    if not args or os.path.basename(args[0]) not in _JOBID_ARGS:
+        return cmdstr, set()
+
+    options, positional = _JOBID_ARGS[os.path.basename(args[0])]
+    jobids = set()
+
+    def _replace(value):
+        # Already normalized commands have no job ids
+        if value != '<JOBIDS>':
+            jobids.update(value.split(','))
+
+        return '<JOBIDS>'
+
+    for i, arg in enumerate(args[1:], start=1):
+        opt, has_value, value = arg.partition('=')
+        if opt in options and has_value:
+            args[i] = f'{opt}={_replace(value)}'
+        elif args[i-1] in options:
+            args[i] = _replace(arg)
+
+    if positional:
+        for i in range(len(args) - 1, 0, -1):
+            if args[i] == '<JOBIDS>' or args[i][0].isdigit():
+                args[i] = _replace(args[i])
+            else:
+                break
+
+    return ' '.join(args), jobids
+
+
+def _cmdstr(cmd):
+    if isinstance(cmd, str):
+        return cmd
+
+    return ' '.join(shlex.quote(str(arg)) for arg in cmd)
+
+
+def _caller_module():
+    '''Return the name of the module that issued the current command.'''
+
+    frame = sys._getframe(1)
+    while frame is not None:
+        modname = frame.f_globals.get('__name__', '')
+        if modname not in (__name__, osext.__name__):
+            return modname
+
+        frame = frame.f_back
+
+    return ''
+
+
+class _CommandInterceptor(abc.ABC):
+    '''Base class for the scheduler command interceptors.
+
+    Only the commands issued through :func:`reframe.utility.osext.run_command`
+    from modules starting with any of the ``modules`` prefixes are
+    intercepted; the rest of the commands are run normally.
+
+    The commands are recorded and matched in a normalized form, so that a
+    session may be replayed on another day and with other directory
+    prefixes: the dates are replaced by ``<DATE>``, the job id arguments of
+    the known scheduler commands by ``<JOBIDS>`` and each of the
+    directories of ``prefixes``, a mapping of names to directories, by its
+    ``<NAME>``. The job ids are kept separately, so that the polls of a
+    replayed session match the recorded ones of the same jobs, even if they
+    group the jobs differently.
+
+    Interceptors are also context managers that install and uninstall
+    themselves.
+    '''
+
+    def __init__(self, filename, modules=('reframe.core.schedulers',),
+                 prefixes=None):
+        self._filename = filename
+        self._modules = tuple(modules)
+
+        # Replace the longest prefixes first, in case they are nested
+        prefixes = sorted(((os.path.abspath(path), name)
+                           for name, path in (prefixes or {}).items()),
+                          key=lambda p: len(p[0]), reverse=True)
+        self._prefixes = [
+            (re.compile(re.escape(path) + r'(?=[/\s\'"]|$)'),
+             f'<{name.upper()}>') for path, name in prefixes
+        ]
+
+    @property
+    def filename(self):
+        return self._filename
+
+    def normalize(self, cmd):
+        '''Return the normalized form of the command ``cmd`` and the set of
+        the job ids it refers to.'''
+
+        cmdstr = _cmdstr(cmd)
+        for patt, placeholder in self._prefixes:
+            cmdstr = patt.sub(placeholder, cmdstr)
+
+        return _split_jobids(_DATE_PATT.sub('<DATE>', cmdstr))
+
+    def install(self):
+        if osext._command_interceptor is not None:
+            raise ReframeError('a command interceptor is already installed')
+
+        osext._command_interceptor = self
+
+    def uninstall(self):
+        if osext._command_interceptor is self:
+            osext._command_interceptor = None
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.uninstall()
+
+    def __call__(self, cmd, timeout=None, **kwargs):
+        if not _caller_module().startswith(self._modules):
+            return osext._run_command(cmd, timeout=timeout, **kwargs)
+
+        return self.intercept(cmd, timeout=timeout, **kwargs)
+
+    @abc.abstractmethod
+    def intercept(self, cmd, timeout=None, **kwargs):
+        '''Run or emulate the intercepted command ``cmd``.'''
+
+
+class SchedulerRecorder(_CommandInterceptor):
+    '''Record the scheduler commands along with their outcome and latency.
+
+    The recorded session is written to ``filename`` as a JSON document when
+    the recorder is uninstalled.
+    '''
+
+    def __init__(self, filename, modules=('reframe.core.schedulers',),
+                 prefixes=None):
+        super().__init__(filename, modules, prefixes)
+        self._records = []
+        self._time_start = None
+
+    @property
+    def records(self):
+        return self._records
+
+    def install(self):
+        super().install()
+        self._time_start = time.time()
+
+    def uninstall(self):
+        super().uninstall()
+        self.dump()
+
+    def intercept(self, cmd, timeout=None, **kwargs):
+        t_start = time.time()
+        cmdstr, jobids = self.normalize(cmd)
+        record = {
+            'command': cmdstr,
+            'jobids': sorted(jobids),
+            'start': t_start - self._time_start,
+            'timeout': None,
+            'returncode': None,
+            'stdout': None,
+            'stderr': None
+        }
+        try:
+            completed = osext._run_command(cmd, timeout=timeout, **kwargs)
+        except SpawnedProcessTimeout as e:
+            record['timeout'] = e.timeout
+            record['stdout'] = e.stdout
+            record['stderr'] = e.stderr
+            raise
+        else:
+            record['returncode'] = completed.returncode
+            record['stdout'] = completed.stdout
+            record['stderr'] = completed.stderr
+            return completed
+        finally:
+            record['latency'] = time.time() - t_start
+            self._records.append(record)
+
+    def dump(self):
+        with open(self._filename, 'w') as fp:
+            json.dump({'data_version': DATA_VERSION,
+                       'commands': self._records}, fp, indent=2)
+            fp.write('\n')
+
+
+class SchedulerReplayer(_CommandInterceptor):
+    '''Replay a recorded scheduler session.
+
+    Each intercepted command receives the next recorded response of the very
+    same normalized command that refers to all of its jobs, in the order of
+    recording. If a command is issued more times than recorded, e.g., a job
+    poll, the last recorded response that refers to all of its jobs is
+    reused.
+
+    :arg emulate_latency: Wait for the recorded latency of each command
+        before returning its response.
+    :raises ReframeError: If a command was never recorded.
+    '''
+
+    def __init__(self, filename, modules=('reframe.core.schedulers',),
+                 emulate_latency=True, prefixes=None):
+        super().__init__(filename, modules, prefixes)
+        self._emulate_latency = emulate_latency
+        # The recorded responses of each normalized command and those of
+        # them not replayed yet
+        self._responses = collections.defaultdict(list)
+        self._pending = collections.defaultdict(list)
+        try:
+            with open(filename) as fp:
+                data = json.load(fp)
+        except OSError as e:
+            raise ReframeError(
+                f'could not load scheduler session {filename!r}'
+            ) from e
+        except json.JSONDecodeError as e:
+            raise ReframeError(
+                f'scheduler session {filename!r} is not a valid JSON file'
+            ) from e
+
+        # Sessions of older minor versions hold commands that are not
+        # normalized, so they are normalized here
+        version = str(data.get('data_version'))
+        if version.split('.')[0] != DATA_VERSION.split('.')[0]:
+            raise ReframeError(
+                f'incompatible scheduler session data versions: '
+                f'found {data.get("data_version")!r}, '
+                f'required {DATA_VERSION!r}'
+            )
+
+        for rec in data['commands']:
+            cmdstr, jobids = self.normalize(rec['command'])
+            response = (jobids | set(rec.get('jobids', [])), rec)
+            self._responses[cmdstr].append(response)
+            self._pending[cmdstr].append(response)
+
+    def _find_response(self, cmdstr, jobids):
+        pending = self._pending[cmdstr]
+        for i, (recorded_jobids, rec) in enumerate(pending):
+            if jobids <= recorded_jobids:
+                del pending[i]
+                return rec
+
+        for recorded_jobids, rec in reversed(self._responses[cmdstr]):
+            if jobids <= recorded_jobids:
+                return rec
+
+        jobs = f' for job(s) {",".join(sorted(jobids))}' if jobids else ''
+        raise ReframeError(
+            f'scheduler session diverged: command {cmdstr!r}{jobs} '
+            f'not found in {self._filename!r}'
+        )
+
+    def intercept(self, cmd, timeout=None, **kwargs):
+        cmdstr, jobids = self.normalize(cmd)
+        rec = self._find_response(cmdstr, jobids)
+
+        getlogger().debug2(f'[REPLAY] {cmdstr!r}')
+        if self._emulate_latency:
+            time.sleep(rec['latency'])
+
+        if rec['timeout'] is not None:
+            raise SpawnedProcessTimeout(cmd, rec['stdout'],
+                                        rec['stderr'], rec['timeout'])
+
+        return subprocess.CompletedProcess(cmd,
+                                           returncode=rec['returncode'],
+                                           stdout=rec['stdout'],
+                                           stderr=rec['stderr'])
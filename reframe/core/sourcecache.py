@@ -0,0 +1,196 @@
+# Copyright 2016-2022 Swiss National Supercomputing Centre (CSCS/ETH Zurich)
+# ReFrame Project Developers. See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+#
+# Cache of the test sources acquired over the network
+#
+
+import functools
+import hashlib
+import os
+import shlex
+import tempfile
+import urllib.parse
+import urllib.request
+
+import reframe.utility.osext as osext
+from reframe.core.exceptions import ReframeError, SpawnedProcessError
+
+
+_CHUNK_SIZE = 1 << 20
+
+
+def _url_digest(url):
+    return hashlib.sha256(url.encode()).hexdigest()
+
+
+def url_filename(url):
+    '''Return the name of the file that ``url`` refers to.'''
+    filename = os.path.basename(urllib.parse.urlparse(url).path)
+    if not filename:
+        raise ReframeError(f'cannot determine the file name of {url!r}')
+
+    return filename
+
+
+def download(url, dst, checksum=None, timeout=None):
+    '''Download ``url`` to the file ``dst``.
+
+    The file is downloaded to a temporary file, which is renamed to ``dst``
+    only if its SHA-256 checksum matches ``checksum``, so that ``dst`` is never
+    partially written.
+
+    :arg url: The URL to download.
+    :arg dst: The destination file.
+    :arg checksum: The expected SHA-256 checksum of the file as a hex string;
+        if :obj:`None` or empty, the file is not verified.
+    :arg timeout: Timeout in seconds for the connection.
+    :returns: The SHA-256 checksum of the downloaded file.
+    :raises ReframeError: If the download fails or the checksum does not
+        match.
+    '''
+    dirname = os.path.dirname(os.path.abspath(dst))
+    fd, tmpfile = tempfile.mkstemp(dir=dirname, prefix='.tmp_')
+    try:
+        h = hashlib.sha256()
+        with os.fdopen(fd, 'wb') as fp:
+            with urllib.request.urlopen(url, timeout=timeout) as resp:
+                for chunk in iter(lambda: resp.read(_CHUNK_SIZE), b''):
+                    h.update(chunk)
+                    fp.write(chunk)
+
+        digest = h.hexdigest()
+        if checksum and digest != checksum.lower():
+            raise ReframeError(f'checksum mismatch for {url!r}: '
+                               f'expected {checksum}, found {digest}')
+
+        os.replace(tmpfile, dst)
+    except OSError as e:
+        raise ReframeError(f'could not download {url!r}: {e}') from e
+    finally:
+        osext.force_remove_file(tmpfile)
+
+    return digest
+
+
+class SourceCache:
+    '''A cache of Git repositories and downloaded files.
+
+    Git repositories are kept as bare mirrors, which are updated at most once
+    per session, and the stage directories of the tests are cloned from the
+    mirrors without accessing the network again. Downloaded files are keyed
+    by their URL and, once downloaded, they are never fetched again; if a
+    checksum is requested, it is verified against the one recorded at
+    download time. Files whose URL refers to changing contents, such as a
+    file of a Git branch, keep the contents of their first download, until
+    their entry or the whole cache is removed.
+
+    The cache may be shared by concurrent ReFrame sessions and it may be
+    safely removed at any time.
+
+    :arg prefix: The directory of the cache.
+    '''
+
+    def __init__(self, prefix):
+        self._prefix = os.path.abspath(prefix)
+
+        # Mirrors that have been updated during this session
+        self._updated = set()
+
+    @property
+    def prefix(self):
+        return self._prefix
+
+    def git_mirror(self, url, timeout=5):
+        '''Return the path to an up-to-date bare mirror of ``url``.
+
+        :arg timeout: Timeout in seconds when checking if ``url`` is a valid
+            repository before creating or updating its mirror.
+        :raises reframe.core.exceptions.ReframeError: If ``url`` is not a
+            valid repository or the mirror cannot be created.
+        '''
+        path = os.path.join(self._prefix, 'git', f'{_url_digest(url)}.git')
+        if path in self._updated:
+            return path
+
+        # Fail fast if the remote is unreachable, since the git commands
+        # below cannot be given a timeout without killing long transfers
+        if not osext.git_repo_exists(url, timeout=timeout):
+            raise ReframeError(f'git repository {url!r} does not exist')
+
+        if os.path.isdir(path):
+            try:
+                osext.run_command(
+                    f'git -C {shlex.quote(path)} remote update --prune',
+                    check=True
+                )
+            except SpawnedProcessError as e:
+                # Do not clone from a stale mirror
+                raise ReframeError(
+                    f'could not update the mirror of {url!r}'
+                ) from e
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmpdir = tempfile.mkdtemp(dir=os.path.dirname(path),
+                                      prefix='.tmp_')
+            try:
+                osext.run_command(
+                    f'git clone --mirror {shlex.quote(url)} '
+                    f'{shlex.quote(tmpdir)}', check=True
+                )
+                os.rename(tmpdir, path)
+            except OSError:
+                # The mirror may have been created concurrently
+                if not os.path.isdir(path):
+                    raise
+            finally:
+                osext.rmtree(tmpdir, ignore_errors=True)
+
+        self._updated.add(path)
+        return path
+
+    def fetch(self, url, dst, checksum=None, timeout=None):
+        '''Copy the file of ``url`` to ``dst``, downloading it if needed.
+
+        The file is downloaded only if it is not cached already, even if the
+        contents of ``url`` have changed since.
+
+        :arg dst: The destination file or directory.
+        :arg checksum: The expected SHA-256 checksum of the file.
+        :returns: The name of the destination file.
+        :raises ReframeError: If the download fails or the checksum does not
+            match.
+        '''
+        entry = os.path.join(self._prefix, 'urls', _url_digest(url))
+        cached_file = os.path.join(entry, url_filename(url))
+        checksum_file = os.path.join(entry, 'sha256')
+        if not os.path.exists(checksum_file):
+            # The checksum file marks a complete entry, so it is written only
+            # after the file is downloaded and never partially
+            os.makedirs(entry, exist_ok=True)
+            digest = download(url, cached_file, checksum, timeout)
+            fd, tmpfile = tempfile.mkstemp(dir=entry, prefix='.tmp_')
+            try:
+                with os.fdopen(fd, 'w') as fp:
+                    fp.write(digest)
+
+                os.replace(tmpfile, checksum_file)
+            finally:
+                osext.force_remove_file(tmpfile)
+        elif checksum:
+            with open(checksum_file) as fp:
+                digest = fp.read().strip()
+
+            if digest != checksum.lower():
+                raise ReframeError(f'checksum mismatch for {url!r}: '
+                                   f'expected {checksum}, found {digest}')
+
+        return osext.clone_file(cached_file, dst)
+
+
+@functools.lru_cache(maxsize=None)
+def getcache(prefix):
+    '''Return the source cache located at ``prefix``.'''
+    return SourceCache(prefix)
@@ -12,6 +12,7 @@ import copy
 
 import reframe.core.fields as fields
 import reframe.core.namespaces as namespaces
+import reframe.utility.typecheck as types
 from reframe.core.exceptions import ReframeSyntaxError
 from reframe.core.warnings import (user_deprecation_warning,
                                    suppress_deprecations)
@@ -177,7 +178,8 @@ class TestVar:
 
     '''
 
-    __slots__ = ('_default_value', '_field', '_loggable', '_name')
+    __slots__ = ('_default_value', '_field', '_instance_value', '_loggable',
+                 '_name')
 
     def __init__(self, *args, **kwargs):
         field_type = kwargs.pop('field', fields.TypedField)
@@ -255,9 +257,30 @@ class TestVar:
         '''Set any additional variable attribute into the default value.'''
         if name in self.__slots__:
             super().__setattr__(name, value)
+            if name == '_default_value':
+                self._invalidate()
         else:
+            self._invalidate()
             setattr(self._default_value, name, value)
 
+    def _invalidate(self):
+        # Discard the value shared by the instances of the test, since the
+        # default value has changed or it may change in place, e.g., through
+        # an element handed out by an item lookup
+        super().__setattr__('_instance_value', Undefined)
+
+    def instance_value(self, validate):
+        '''Return the value to be shared by the test instances.
+
+        On the first call after the default value changes, the value is
+        computed by calling ``validate`` with a copy of the default value.
+        '''
+        if self._instance_value is Undefined:
+            super().__setattr__('_instance_value',
+                                validate(self.default_value))
+
+        return self._instance_value
+
     def __getattr__(self, name):
         '''Attribute lookup into the variable's value.'''
         def_val = self.__getattribute__('_default_value')
@@ -269,9 +292,13 @@ class TestVar:
         # __deepcopy__ method.
         if def_val is not Undefined:
             try:
-                return getattr(def_val, name)
+                attr = getattr(def_val, name)
             except AttributeError:
                 '''Raise the AttributeError below.'''
+            else:
+                # The attribute may be used to modify the default value
+                self._invalidate()
+                return attr
 
         var_name = self.__getattribute__('_name')
         raise AttributeError(
@@ -343,26 +370,32 @@ class TestVar:
 
     def __getitem__(self, key):
         self._check_is_defined()
+        self._invalidate()
         return self._default_value.__getitem__(key)
 
     def __setitem__(self, key, value):
         self._check_is_defined()
+        self._invalidate()
         self._default_value.__setitem__(key, value)
 
     def __delitem__(self, key):
         self._check_is_defined()
+        self._invalidate()
         self._default_value.__delitem__(key)
 
     def __missing__(self, key):
         self._check_is_defined()
+        self._invalidate()
         return self._default_value.__missing__(key)
 
     def __iter__(self):
         self._check_is_defined()
+        self._invalidate()
         return iter(self._default_value)
 
     def __reversed__(self):
         self._check_is_defined()
+        self._invalidate()
         return reversed(self._default_value)
 
     def __contains__(self, item):
@@ -608,6 +641,9 @@ class VarSpace(namespaces.Namespace):
     def __init__(self, target_cls=None, illegal_names=None):
         # Set to register the variables already injected in the class
         self._injected_vars = set()
+
+        # The class that the variable descriptors are installed in
+        self._injected_cls = None
         super().__init__(target_cls, illegal_names,
                          ns_name='_rfm_var_space',
                          ns_local_name='_rfm_local_var_space')
@@ -707,16 +743,35 @@ class VarSpace(namespaces.Namespace):
             self._inject(obj, cls)
 
     def _inject(self, obj, cls):
-        for name, var in self.items():
-            setattr(cls, name, var.field)
-            getattr(cls, name).__set_name__(obj, name)
+        # The variable descriptors are installed once per class
+        if self._injected_cls is not cls:
+            for name, var in self.items():
+                setattr(cls, name, var.field)
+                getattr(cls, name).__set_name__(obj, name)
+
+                # Track the variables that have been injected.
+                self._injected_vars.add(name)
+
+            self._injected_cls = cls
 
+        for name, var in self.items():
             # If the var is defined, set its value
-            if var.is_defined():
+            if not var.is_defined():
+                continue
+
+            field = var.field
+            if type(field).__get__ is not fields.Field.__get__:
                 setattr(obj, name, var.default_value)
+                continue
+
+            # The default value is validated once and then it is shared by
+            # the instances of the class until they access it; the value is
+            # a fresh copy, so it can be also turned into a checked container
+            def _validate(value):
+                setattr(obj, name, types.checked(value))
+                return field.__get__(obj, cls)
 
-            # Track the variables that have been injected.
-            self._injected_vars.add(name)
+            field.share(obj, var.instance_value(_validate))
 
     @property
     def vars(self):
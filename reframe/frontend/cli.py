@@ -18,6 +18,7 @@ import reframe.core.config as config
 import reframe.core.exceptions as errors
 import reframe.core.logging as logging
 import reframe.core.runtime as runtime
+import reframe.core.schedulers.replay as replay
 import reframe.core.warnings as warnings
 import reframe.frontend.argparse as argparse
 import reframe.frontend.autodetect as autodetect
@@ -210,6 +211,17 @@ def main():
     misc_options = argparser.add_argument_group('Miscellaneous options')
 
     # Output directory options
+    output_options.add_argument(
+        '--build-cache-dir', action='store', metavar='DIR',
+        help='Cache the build artifacts of the tests in DIR',
+        envvar='RFM_BUILD_CACHE_DIR', configvar='general/build_cache_dir'
+    )
+    output_options.add_argument(
+        '--compress-output', action='store', metavar='METHOD',
+        choices=['gzip', 'zstd'],
+        help='Compress the files kept in the output directory',
+        envvar='RFM_COMPRESS_OUTPUT', configvar='general/compress_output'
+    )
     output_options.add_argument(
         '--compress-report', action='store_true',
         help='Compress the run report file',
@@ -259,11 +271,22 @@ def main():
         help='Set stage directory prefix to DIR',
         envvar='RFM_STAGE_DIR', configvar='systems/stagedir'
     )
+    output_options.add_argument(
+        '--staging-mode', action='store', metavar='MODE',
+        choices=['clone', 'copy', 'link'],
+        help='Set how the test resources are staged',
+        envvar='RFM_STAGING_MODE', configvar='general/staging_mode'
+    )
     output_options.add_argument(
         '--save-log-files', action='store_true', default=False,
         help='Save ReFrame log files to the output directory',
         envvar='RFM_SAVE_LOG_FILES', configvar='general/save_log_files'
     )
+    output_options.add_argument(
+        '--source-cache-dir', action='store', metavar='DIR',
+        help='Cache the remote sources of the tests in DIR',
+        envvar='RFM_SOURCE_CACHE_DIR', configvar='general/source_cache_dir'
+    )
     output_options.add_argument(
         '--timestamp', action='store', nargs='?', const='%FT%T',
         metavar='TIMEFMT',
@@ -278,6 +301,11 @@ def main():
         help="Add PATH to the check search path list",
         envvar='RFM_CHECK_SEARCH_PATH :', configvar='general/check_search_path'
     )
+    locate_options.add_argument(
+        '--discovery-index', action='store', metavar='FILE',
+        help='Keep an index of the discovered test files in FILE',
+        envvar='RFM_DISCOVERY_INDEX', configvar='general/discovery_index'
+    )
     locate_options.add_argument(
         '--ignore-check-conflicts', action='store_true',
         help=('Skip checks with conflicting names '
@@ -314,6 +342,11 @@ def main():
         '-n', '--name', action='append', dest='names', default=[],
         metavar='PATTERN', help='Select checks whose name matches PATTERN'
     )
+    select_options.add_argument(
+        '--param', action='append', dest='params', default=[],
+        metavar='PARAM=VALUE',
+        help='Select checks with a value of parameter PARAM matching VALUE'
+    )
 
     # FIXME: The following is the only selection option that has an associated
     # (undocumented) configuration variable. This is to support pruning of the
@@ -423,12 +456,25 @@ def main():
         metavar='REPORT',
         help='Restore a testing session from REPORT file'
     )
+    run_options.add_argument(
+        '--sched-record', action='store', metavar='FILE',
+        help='Record the scheduler interactions of this session in FILE'
+    )
+    run_options.add_argument(
+        '--sched-replay', action='store', metavar='FILE',
+        help='Replay the scheduler interactions recorded in FILE'
+    )
     run_options.add_argument(
         '-S', '--setvar', action='append', metavar='[TEST.]VAR=VAL',
         dest='vars', default=[],
         help=('Set test variable VAR to VAL in all tests '
               'or optionally in TEST only')
     )
+    run_options.add_argument(
+        '--share-builds', action='store_true',
+        help='Build only once the tests with identical build inputs',
+        envvar='RFM_SHARE_BUILDS', configvar='general/share_builds'
+    )
     run_options.add_argument(
         '--skip-performance-check', action='store_true',
         help='Skip performance checking'
@@ -498,6 +544,11 @@ def main():
         help='Set configuration file',
         envvar='RFM_CONFIG_FILE'
     )
+    misc_options.add_argument(
+        '--config-cache-dir', action='store', metavar='DIR',
+        help='Cache the validated configuration in DIR',
+        envvar='RFM_CONFIG_CACHE_DIR'
+    )
     misc_options.add_argument(
         '--detect-host-topology', action='store', nargs='?', const='-',
         help='Detect the local host topology and exit'
@@ -734,6 +785,7 @@ def main():
             )
             site_config = config.load_config(converted)
 
+        site_config.set_cache_dir(options.config_cache_dir)
         site_config.validate()
         site_config.set_autodetect_meth(
             options.autodetect_method,
@@ -810,6 +862,14 @@ def main():
         printer.error(logfiles_message())
         sys.exit(1)
 
+    if site_config.get('general/0/compress_output') == 'zstd':
+        # Fail early, before any test has run, if zstd is not available
+        try:
+            osext._zstd()
+        except errors.ReframeError as e:
+            printer.error(f'cannot compress output: {e}')
+            sys.exit(1)
+
     # Show configuration after everything is set up
     if options.show_config:
         # Restore logging level
@@ -911,11 +971,13 @@ def main():
         else:
             external_vars[lhs] = rhs
 
+    discovery_index = site_config.get('general/0/discovery_index')
     loader = RegressionCheckLoader(check_search_path,
                                    check_search_recursive,
                                    external_vars,
                                    options.skip_system_check,
-                                   options.skip_prgenv_check)
+                                   options.skip_prgenv_check,
+                                   discovery_index)
 
     def print_infoline(param, value):
         param = param + ':'
@@ -963,11 +1025,32 @@ def main():
             else:
                 parsed_job_options.append(f'--{optstr} {valstr}')
 
+        # Select the test variants to load by name, tag, maintainer and
+        # parameter before instantiating them; the loaded tests are filtered
+        # again below
+        variant_filters = [filters.have_not_name(name)
+                           for name in options.exclude_names]
+        if options.names:
+            variant_filters.append(filters.have_any_name(options.names))
+
+        variant_filters += [filters.have_not_tag(tag)
+                            for tag in options.exclude_tags]
+        variant_filters += [filters.have_tag(tag) for tag in options.tags]
+        variant_filters += [filters.have_maintainer(maint)
+                            for maint in options.maintainers]
+        variant_filters += [filters.have_param(param)
+                            for param in options.params]
+
+        def _select_variant(variant):
+            return all(fn(variant) for fn in variant_filters)
+
         # Locate and load checks; `force=True` is not needed for normal
         # invocations from the command line and has practically no effect, but
         # it is needed to better emulate the behavior of running reframe's CLI
         # from within the unit tests, which call repeatedly `main()`.
-        checks_found = loader.load_all(force=True)
+        checks_found = loader.load_all(
+            force=True, select=_select_variant if variant_filters else None
+        )
         printer.verbose(f'Loaded {len(checks_found)} test(s)')
 
         # Generate all possible test cases first; we will need them for
@@ -1005,6 +1088,10 @@ def main():
         for maint in options.maintainers:
             testcases = filter(filters.have_maintainer(maint), testcases)
 
+        # Filter test cases by parameters
+        for param in options.params:
+            testcases = filter(filters.have_param(param), testcases)
+
         # Filter test cases further
         if options.gpu_only and options.cpu_only:
             printer.error("options `--gpu-only' and `--cpu-only' "
@@ -1032,7 +1119,7 @@ def main():
                 sys.exit(1)
 
             def _case_failed(t):
-                rec = report.case(*t)
+                rec = report.case(t.orig_check, t.partition, t.environ)
                 if not rec:
                     return False
 
@@ -1240,6 +1327,14 @@ def main():
             printer.error("unknown execution policy `%s': Exiting...")
             sys.exit(1)
 
+        if (options.exec_policy == 'serial' and
+            site_config.get('general/0/share_builds') and
+            not site_config.get('general/0/build_cache_dir')):
+            printer.warning(
+                'builds are not shared with the serial execution policy; '
+                'use --build-cache-dir to reuse them'
+            )
+
         exec_policy.force_local = options.force_local
         exec_policy.strict_check = options.strict
         exec_policy.skip_sanity_check = options.skip_sanity_check
@@ -1265,6 +1360,23 @@ def main():
                 f'{options.maxfail!r}'
             )
 
+        if options.sched_record and options.sched_replay:
+            printer.error("options `--sched-record' and `--sched-replay' "
+                          "are mutually exclusive")
+            sys.exit(1)
+
+        sched_interceptor = None
+        sched_prefixes = {'stage_prefix': rt.stage_prefix,
+                          'output_prefix': rt.output_prefix}
+        if options.sched_record:
+            sched_interceptor = replay.SchedulerRecorder(
+                options.sched_record, prefixes=sched_prefixes
+            )
+        elif options.sched_replay:
+            sched_interceptor = replay.SchedulerReplayer(
+                options.sched_replay, prefixes=sched_prefixes
+            )
+
         runner = Runner(exec_policy, printer, options.max_retries,
                         options.maxfail)
         try:
@@ -1272,7 +1384,11 @@ def main():
             session_info['time_start'] = time.strftime(
                 '%FT%T%z', time.localtime(time_start),
             )
-            runner.runall(testcases, restored_cases)
+            if sched_interceptor:
+                with sched_interceptor:
+                    runner.runall(testcases, restored_cases)
+            else:
+                runner.runall(testcases, restored_cases)
         finally:
             time_end = time.time()
             session_info['time_end'] = time.strftime(
@@ -31,7 +31,7 @@ def build_deps(cases, default_cases=None):
 
         ret = {}
         for c in cases:
-            cname = c.check.unique_name
+            cname = c.orig_check.unique_name
             ret.setdefault(cname, [])
             ret[cname].append(c)
 
@@ -70,7 +70,7 @@ def build_deps(cases, default_cases=None):
         psrc = c.partition.name
         esrc = c.environ.name
         try:
-            for dep in c.check.user_deps():
+            for dep in c.orig_check.user_deps():
                 tname, when = dep
                 for d in resolve_dep(c, tname):
                     pdst = d.partition.name
@@ -130,11 +130,11 @@ def _reduce_deps(graph):
     '''Reduce test case graph to a test-only graph.'''
     ret = {}
     for case, deps in graph.items():
-        test_deps = util.OrderedSet(d.check.unique_name for d in deps)
+        test_deps = util.OrderedSet(d.orig_check.unique_name for d in deps)
         try:
-            ret[case.check.unique_name] |= test_deps
+            ret[case.orig_check.unique_name] |= test_deps
         except KeyError:
-            ret[case.check.unique_name] = test_deps
+            ret[case.orig_check.unique_name] = test_deps
 
     return ret
 
@@ -251,11 +251,11 @@ def toposort(graph, is_subgraph=False):
     # Index test cases by test name
     cases_by_name = {}
     for c in graph.keys():
-        c.level = levels[c.check.unique_name]
+        c.level = levels[c.orig_check.unique_name]
         try:
-            cases_by_name[c.check.unique_name].append(c)
+            cases_by_name[c.orig_check.unique_name].append(c)
         except KeyError:
-            cases_by_name[c.check.unique_name] = [c]
+            cases_by_name[c.orig_check.unique_name] = [c]
 
     return list(itertools.chain(*(retrieve(cases_by_name, n, [])
                                   for n in visited)))
@@ -0,0 +1,135 @@
+# Copyright 2016-2022 Swiss National Supercomputing Centre (CSCS/ETH Zurich)
+# ReFrame Project Developers. See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+#
+# Persistent index of the test files found during test discovery
+#
+
+import json
+import os
+
+import reframe.utility.osext as osext
+from reframe.core.logging import getlogger
+from reframe.core.runtime import runtime
+
+
+# Bump this whenever the layout of the index entries changes
+_INDEX_VERSION = '3'
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+
+    return [st.st_mtime_ns, st.st_size]
+
+
+class DiscoveryIndex:
+    '''An on-disk index of the files found during test discovery.
+
+    Each file is indexed by its absolute path and its entry records whether
+    it is a test file and, if so, which tests it registers. An entry is valid
+    only as long as the modification time and the size of the file and of
+    any other source files the entry depends on are unchanged. The whole
+    index is discarded if it was created by a different ReFrame version or
+    with a different naming scheme for the tests.
+
+    :arg filename: The file of the index. If it does not exist, a new empty
+        index is created.
+    '''
+
+    def __init__(self, filename):
+        self._filename = os.path.abspath(filename)
+        self._header = {
+            'index_version': _INDEX_VERSION,
+            'reframe_version': osext.reframe_version(),
+            'compact_test_names': runtime().get_option(
+                'general/0/compact_test_names'
+            )
+        }
+        self._files = {}
+        self._dirty = False
+        try:
+            with open(self._filename) as fp:
+                data = json.load(fp)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            getlogger().warning(
+                f'could not read the discovery index {filename!r}: {e}'
+            )
+            return
+
+        if data.get('header') == self._header:
+            self._files = data.get('files', {})
+
+    @property
+    def filename(self):
+        return self._filename
+
+    def lookup(self, filename):
+        '''Return the entry of ``filename`` or :obj:`None` if the file is not
+        indexed or its entry is stale.'''
+
+        path = os.path.abspath(filename)
+        entry = self._files.get(path)
+        if entry is None:
+            return None
+
+        if entry['stat'] != _stat(path):
+            return None
+
+        for src, stat in entry['sources'].items():
+            if stat != _stat(src):
+                return None
+
+        return entry
+
+    def update(self, filename, is_test_file, tests=(), sources=()):
+        '''Index ``filename``.
+
+        :arg is_test_file: :obj:`True` if the file is a test file.
+        :arg tests: A list with the description of each test registered by
+            the file or :obj:`None` if the tests of the file are not known
+            before their instantiation.
+        :arg sources: Other source files that the description of the tests
+            depends on.
+        '''
+        path = os.path.abspath(filename)
+        sources = {os.path.abspath(src) for src in sources} - {path}
+        self._files[path] = {
+            'stat': _stat(path),
+            'is_test_file': is_test_file,
+            'tests': list(tests) if tests is not None else None,
+            'sources': {src: _stat(src) for src in sorted(sources)}
+        }
+        self._dirty = True
+
+    def entries(self):
+        '''Return an iterator over the (filename, entry) pairs of the
+        index.'''
+        return iter(self._files.items())
+
+    def save(self):
+        '''Write the index to its file if it has changed.'''
+
+        if not self._dirty:
+            return
+
+        dirname = os.path.dirname(self._filename)
+        try:
+            os.makedirs(dirname, exist_ok=True)
+            osext.dump_json_atomic(
+                {'header': self._header, 'files': self._files},
+                self._filename
+            )
+        except OSError as e:
+            getlogger().warning(
+                f'could not write the discovery index {self._filename!r}: {e}'
+            )
+        else:
+            self._dirty = False
@@ -11,10 +11,12 @@ import sys
 import time
 import weakref
 
+import reframe.core.buildcache as buildcache
 import reframe.core.logging as logging
 import reframe.core.runtime as runtime
 import reframe.frontend.dependencies as dependencies
 import reframe.utility.jsonext as jsonext
+import reframe.utility.osext as osext
 from reframe.core.exceptions import (AbortTaskError,
                                      JobNotStartedError,
                                      FailureLimitError,
@@ -32,14 +34,20 @@ ABORT_REASONS = (AssertionError, FailureLimitError,
 class TestCase:
     '''A combination of a regression check, a system partition
     and a programming environment.
+
+    The partition and the environment are shared by all the test cases that
+    refer to them and they must not be modified. Each test case gets its own
+    copy of the check, but this is created only the first time the
+    :attr:`check` is accessed, so that test cases that are filtered out are
+    cheap. Code that only inspects the check, e.g., for filtering or for
+    resolving dependencies, should use :attr:`orig_check` instead.
     '''
 
     def __init__(self, check, partition, environ):
         self._check_orig = check
-        self._check = copy.deepcopy(check)
-        self._partition = copy.deepcopy(partition)
-        self._environ = copy.deepcopy(environ)
-        self._check._case = weakref.ref(self)
+        self._check = None
+        self._partition = partition
+        self._environ = environ
         self._deps = []
 
         # Incoming dependencies
@@ -51,10 +59,10 @@ class TestCase:
     def __iter__(self):
         # Allow unpacking a test case with a single liner:
         #       c, p, e = case
-        return iter([self._check, self._partition, self._environ])
+        return iter([self.check, self._partition, self._environ])
 
     def __hash__(self):
-        return (hash(self.check.unique_name) ^
+        return (hash(self._check_orig.unique_name) ^
                 hash(self.partition.fullname) ^
                 hash(self.environ.name))
 
@@ -62,20 +70,34 @@ class TestCase:
         if not isinstance(other, type(self)):
             return NotImplemented
 
-        return (self.check.unique_name == other.check.unique_name and
+        return (self._check_orig.unique_name ==
+                other._check_orig.unique_name and
                 self.environ.name == other.environ.name and
                 self.partition.fullname == other.partition.fullname)
 
     def __repr__(self):
-        c = self.check.unique_name if self.check else None
+        c = self._check_orig.unique_name if self._check_orig else None
         p = self.partition.fullname  if self.partition else None
         e = self.environ.name if self.environ else None
         return f'({c!r}, {p!r}, {e!r})'
 
     @property
     def check(self):
+        if self._check is None:
+            self._check = copy.deepcopy(self._check_orig)
+            self._check._case = weakref.ref(self)
+
         return self._check
 
+    @property
+    def orig_check(self):
+        '''The check this test case was generated from.
+
+        This is shared by all the test cases of the check and it must not be
+        modified.
+        '''
+        return self._check_orig
+
     @property
     def partition(self):
         return self._partition
@@ -337,7 +359,11 @@ class RegressionTask:
     def finalize(self):
         try:
             jsonfile = os.path.join(self.check.stagedir, '.rfm_testcase.json')
-            with open(jsonfile, 'w') as fp:
+            method = runtime.runtime().get_option('general/0/compress_output')
+            if method:
+                jsonfile += osext.COMPRESSION_SUFFIXES[method]
+
+            with osext.open_compressed(jsonfile, 'w', method) as fp:
                 jsonext.dump(self.check, fp, indent=2)
         except OSError as e:
             logging.getlogger().warning(
@@ -353,12 +379,14 @@ class RegressionTask:
     def fail(self, exc_info=None):
         self._failed_stage = self._current_stage
         self._exc_info = exc_info or sys.exc_info()
+        buildcache.abandon_builds(self.check)
         self._notify_listeners('on_task_failure')
 
     def skip(self, exc_info=None):
         self._skipped = True
         self._failed_stage = self._current_stage
         self._exc_info = exc_info or sys.exc_info()
+        buildcache.abandon_builds(self.check)
         self._notify_listeners('on_task_skip')
 
     def abort(self, cause=None):
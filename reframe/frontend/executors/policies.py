@@ -353,7 +353,9 @@ class AsynchronousExecutionPolicy(ExecutionPolicy, TaskEventListener):
         for partname, sched in self._schedulers.items():
             jobs = []
             for t in self._partition_tasks[partname]:
-                if t.state == 'compiling':
+                # Builds restored from the build cache are never submitted
+                if (t.state == 'compiling' and
+                    t.check.build_job.jobid is not None):
                     jobs.append(t.check.build_job)
                 elif t.state == 'running':
                     jobs.append(t.check.job)
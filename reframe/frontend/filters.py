@@ -16,20 +16,34 @@ def re_compile(patt):
         raise ReframeError(f'invalid regex: {patt!r}')
 
 
+def _test_class_name(check):
+    # Test variants that are not instantiated yet carry their class name
+    return getattr(check, 'test_class_name', type(check).__name__)
+
+
+def _test_params(check):
+    # Test variants that are not instantiated yet carry their parameters
+    params = getattr(check, 'test_params', None)
+    if params is not None:
+        return params
+
+    return {p: getattr(check, p) for p in type(check).param_space.params}
+
+
 def _have_name(patt):
     regex = re_compile(patt)
 
     def _fn(case):
-        # Match pattern, but remove spaces from the `display_name`
-        display_name = case.check.display_name.replace(' ', '')
         rt = runtime()
         if not rt.get_option('general/0/compact_test_names'):
-            return regex.match(case.check.unique_name)
+            return regex.match(case.orig_check.unique_name)
         else:
             if '@' in patt:
                 # Do an exact match on the unique name
-                return patt.replace('@', '_') == case.check.unique_name
+                return patt.replace('@', '_') == case.orig_check.unique_name
             else:
+                # Match pattern, but remove spaces from the `display_name`
+                display_name = case.orig_check.display_name.replace(' ', '')
                 return regex.match(display_name)
 
     return _fn
@@ -64,16 +78,16 @@ def have_any_name(names):
     def _fn(case):
         # Check if we have an exact match
         for m in exact_matches:
-            cls_name = type(case.check).__name__
-            if (cls_name, case.check.variant_num) == m:
+            cls_name = _test_class_name(case.orig_check)
+            if (cls_name, case.orig_check.variant_num) == m:
                 return True
 
-        display_name = case.check.display_name.replace(' ', '')
         if regex:
             if has_compact_names:
+                display_name = case.orig_check.display_name.replace(' ', '')
                 return regex.match(display_name)
             else:
-                return regex.match(case.check.unique_name)
+                return regex.match(case.orig_check.unique_name)
 
         return False
 
@@ -84,7 +98,7 @@ def have_tag(patt):
     regex = re_compile(patt)
 
     def _fn(case):
-        return any(regex.match(p) for p in case.check.tags)
+        return any(regex.match(p) for p in case.orig_check.tags)
 
     return _fn
 
@@ -100,20 +114,34 @@ def have_maintainer(patt):
     regex = re_compile(patt)
 
     def _fn(case):
-        return any(regex.match(p) for p in case.check.maintainers)
+        return any(regex.match(p) for p in case.orig_check.maintainers)
+
+    return _fn
+
+
+def have_param(spec):
+    name, has_value, patt = spec.partition('=')
+    if not has_value:
+        raise ReframeError(f'invalid parameter filter: {spec!r}')
+
+    regex = re_compile(patt)
+
+    def _fn(case):
+        params = _test_params(case.orig_check)
+        return name in params and regex.match(str(params[name]))
 
     return _fn
 
 
 def have_gpu_only():
     def _fn(case):
-        return case.check.num_gpus_per_node > 0
+        return case.orig_check.num_gpus_per_node > 0
 
     return _fn
 
 
 def have_cpu_only():
     def _fn(case):
-        return case.check.num_gpus_per_node == 0
+        return case.orig_check.num_gpus_per_node == 0
 
     return _fn
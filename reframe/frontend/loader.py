@@ -8,10 +8,13 @@
 #
 
 import ast
+import concurrent.futures
 import contextlib
 import inspect
 import os
+import py_compile
 import sys
+import time
 import traceback
 
 import reframe.core.fields as fields
@@ -19,6 +22,7 @@ import reframe.utility as util
 import reframe.utility.osext as osext
 from reframe.core.exceptions import NameConflictError, is_severe, what
 from reframe.core.logging import getlogger
+from reframe.frontend.discovery import DiscoveryIndex
 
 
 class RegressionCheckValidator(ast.NodeVisitor):
@@ -47,9 +51,292 @@ class RegressionCheckValidator(ast.NodeVisitor):
                     break
 
 
+# Minimum number of files to validate in parallel
+_PARALLEL_VALIDATION_MIN_FILES = 32
+
+
+def _validate_file(filename):
+    '''Check if ``filename`` is a test file and byte-compile it if so.
+
+    This is run by the workers of the loader's process pool, so that the
+    test files are imported later from their cached bytecode.
+
+    :returns: A tuple of whether the file is a test file and the time it
+        took to parse and compile it.
+    '''
+    start = time.time()
+    with open(filename, 'r') as f:
+        source_tree = ast.parse(f.read(), filename)
+
+    validator = RegressionCheckValidator()
+    validator.visit(source_tree)
+    if validator.valid:
+        # Failing to write the bytecode is not an error
+        with contextlib.suppress(OSError, py_compile.PyCompileError):
+            py_compile.compile(filename, doraise=True)
+
+    return validator.valid, time.time() - start
+
+
+class RegisteredVariant:
+    '''A registered test variant that has not been instantiated yet.
+
+    This exposes the attributes of the test that can be determined from its
+    class, so that it can be passed to the test case filters in place of a
+    test case. Accessing any other attribute raises :class:`AttributeError`.
+
+    If ``fixture`` is given, the variant is a variant of this fixture. The
+    names of fixtures are not known before their instantiation.
+    '''
+
+    def __init__(self, cls, variant_num, fixture=None):
+        self._cls = cls
+        self._variant_num = variant_num
+        self._fixture = fixture
+
+    @property
+    def orig_check(self):
+        # Allow the test case filters to access the test attributes
+        return self
+
+    @property
+    def test_class_name(self):
+        return self._cls.__name__
+
+    @property
+    def variant_num(self):
+        return self._variant_num
+
+    @property
+    def test_params(self):
+        return self._cls.get_variant_info(self._variant_num)['params']
+
+    @property
+    def unique_name(self):
+        self._check_not_fixture('unique_name')
+        return self._cls.variant_name(self._variant_num)
+
+    @property
+    def display_name(self):
+        self._check_not_fixture('display_name')
+        return self._cls.variant_display_name(self._variant_num)
+
+    @property
+    def tags(self):
+        return self._class_value('tags')
+
+    @property
+    def maintainers(self):
+        return self._class_value('maintainers')
+
+    def _check_not_fixture(self, name):
+        if self._fixture is not None:
+            raise AttributeError(
+                f'{name!r} of fixture {self._cls.__qualname__!r} is not '
+                f'known before the fixture is instantiated'
+            )
+
+    def _class_value(self, name):
+        # Fixtures may set any of their variables
+        if self._fixture is not None and name in self._fixture.variables:
+            self._check_not_fixture(name)
+
+        return _class_value(self._cls, name)
+
+
+def _class_value(cls, name):
+    '''Return the value of the variable ``name`` of the tests of ``cls``.
+
+    :raises AttributeError: If the value is not known before the tests are
+        instantiated.
+    '''
+    from reframe.core.pipeline import RegressionTest
+
+    def _init_fn(cls):
+        # Look through the hooks attached to the instantiated classes
+        return getattr(cls.__init__, '_rfm_pipeline_fn', cls.__init__)
+
+    # The class-level value is final only if the test does not change it
+    # during its initialization
+    var = cls.var_space[name]
+    if (_init_fn(cls) is not _init_fn(RegressionTest) or
+        'post_init' in cls.pipeline_hooks() or not var.is_defined()):
+        raise AttributeError(
+            f'{name!r} of {cls.__qualname__!r} is not known before '
+            f'the test is instantiated'
+        )
+
+    # Validate the value through the field of the variable, as when the test
+    # is instantiated, since it may have been set from the command line
+    holder = _ValueHolder()
+    var.field.__set_name__(cls, name)
+    try:
+        var.field.__set__(holder, var.default_value)
+    except (TypeError, ValueError):
+        # Let the instantiation of the test report the error
+        raise AttributeError(
+            f'{name!r} of {cls.__qualname__!r} is not valid'
+        ) from None
+
+    return var.field.__get__(holder, type(holder))
+
+
+class _ValueHolder:
+    '''An object to convert variable values through their fields.'''
+
+
+def _variant_selector(select):
+    '''Adapt a test case filter to select test variants by class.'''
+
+    def _select(cls, variant_num, fixture=None):
+        try:
+            if select(RegisteredVariant(cls, variant_num, fixture)):
+                return True
+        except AttributeError:
+            return True
+
+        # The test is also selected if any of its fixtures may be selected,
+        # since the fixtures are instantiated only through their tests
+        fixtures = cls.get_variant_info(variant_num)['fixtures']
+        for name, fixt_variants in fixtures.items():
+            fixt = cls.fixture_space[name]
+            if any(_select(fixt.cls, v, fixt) for v in fixt_variants):
+                return True
+
+        return False
+
+    return _select
+
+
+def _class_sources(cls, sources):
+    '''Add to ``sources`` the files where ``cls``, its bases and its
+    fixtures are defined.'''
+
+    for c in inspect.getmro(cls):
+        with contextlib.suppress(TypeError):
+            sources.add(inspect.getfile(c))
+
+    for f in cls.fixture_space.fixtures.values():
+        _class_sources(f.cls, sources)
+
+    return sources
+
+
+def _describe_test(cls, variant_nums):
+    def _static_value(name, convert=list):
+        try:
+            return convert(_class_value(cls, name))
+        except (AttributeError, TypeError):
+            return None
+
+    if variant_nums is not None:
+        variants = [[n, cls.variant_name(n), cls.variant_display_name(n),
+                     {p: str(v) for p, v in
+                      cls.get_variant_info(n)['params'].items()}]
+                    for n in variant_nums]
+    else:
+        variants = None
+
+    return {
+        'name': cls.__name__,
+        'variants': variants,
+        'num_variants': cls.num_variants,
+        'params': {p: [str(v) for v in cls.param_space[p]]
+                   for p in cls.param_space.params},
+        'fixtures': bool(cls.fixture_space.fixtures),
+        'tags': _static_value('tags', sorted),
+        'maintainers': _static_value('maintainers')
+    }
+
+
+class IndexedVariant:
+    '''A test variant described by the discovery index.
+
+    This is the counterpart of :class:`RegisteredVariant` for the tests of
+    the files that have not been imported.
+    '''
+
+    def __init__(self, test, variant):
+        self._test = test
+        (self._variant_num, self._unique_name,
+         self._display_name, self._params) = variant
+
+    @property
+    def orig_check(self):
+        return self
+
+    @property
+    def test_class_name(self):
+        return self._test['name']
+
+    @property
+    def variant_num(self):
+        return self._variant_num
+
+    @property
+    def test_params(self):
+        return self._params
+
+    @property
+    def unique_name(self):
+        return self._unique_name
+
+    @property
+    def display_name(self):
+        return self._display_name
+
+    @property
+    def tags(self):
+        return self._indexed_value('tags')
+
+    @property
+    def maintainers(self):
+        return self._indexed_value('maintainers')
+
+    def _indexed_value(self, name):
+        value = self._test[name]
+        if value is None:
+            raise AttributeError(
+                f'{name!r} of {self._unique_name!r} is not known before '
+                f'the test is instantiated'
+            )
+
+        return value
+
+
+def _may_select(tests, select, external_vars):
+    '''Check if any of the indexed ``tests`` may be selected.'''
+
+    def _set_externally(testname):
+        # The index does not record the values of the variables set from the
+        # command line
+        return any(v in external_vars or f'{testname}.{v}' in external_vars
+                   for v in ('tags', 'maintainers'))
+
+    if tests is None:
+        return True
+
+    for t in tests:
+        # The fixtures of the tests are not indexed, so files with tests with
+        # fixtures are always imported
+        if (t['variants'] is None or t['fixtures'] or
+            _set_externally(t['name'])):
+            return True
+
+        for v in t['variants']:
+            try:
+                if select(IndexedVariant(t, v)):
+                    return True
+            except AttributeError:
+                return True
+
+    return False
+
+
 class RegressionCheckLoader:
     def __init__(self, load_path, recurse=False, external_vars=None,
-                 skip_system_check=False, skip_prgenv_check=False):
+                 skip_system_check=False, skip_prgenv_check=False,
+                 discovery_index=None):
         # Expand any environment variables and symlinks
         load_path = [os.path.realpath(osext.expandvars(p)) for p in load_path]
         self._load_path = osext.unique_abs_paths(load_path, recurse)
@@ -58,11 +345,36 @@ class RegressionCheckLoader:
         # Loaded tests by name; maps test names to the file that were defined
         self._loaded = {}
 
+        # Registries with deferred tests and the files they were loaded from
+        self._deferred = []
+
+        # Files not imported, because none of their tests were selected;
+        # maps the names of their tests to the files
+        self._skipped = {}
+
+        # Files validated in parallel and whether they are test files
+        self._validated = {}
+
+        # Time spent in discovering, parsing and importing the test files
+        # per directory
+        self._timings = {}
+
+        # Objects of trivially copyable types are not inspected further
+        self._is_copyable = util.attr_validator(
+            util.is_copyable, skip_fn=util.is_trivially_copyable
+        )
+
         # Variables set in the command line
         self._external_vars = external_vars or {}
         self._skip_system_check = bool(skip_system_check)
         self._skip_prgenv_check = bool(skip_prgenv_check)
 
+        # The discovery index of the test files, if any
+        if discovery_index:
+            self._index = DiscoveryIndex(discovery_index)
+        else:
+            self._index = None
+
     def _module_name(self, filename):
         '''Figure out a module name from filename.
 
@@ -92,8 +404,6 @@ class RegressionCheckLoader:
         return validator.valid
 
     def _validate_check(self, check):
-        import reframe.utility as util
-
         name = type(check).__name__
         checkfile = os.path.relpath(inspect.getfile(type(check)))
         required_attrs = ['valid_systems', 'valid_prog_environs']
@@ -104,8 +414,7 @@ class RegressionCheckLoader:
                 )
                 return False
 
-        is_copyable = util.attr_validator(lambda obj: util.is_copyable(obj))
-        valid, attr = is_copyable(check)
+        valid, attr = self._is_copyable(check)
         if not valid:
             getlogger().warning(
                 f'{checkfile}: {attr!r} is not copyable; '
@@ -129,6 +438,38 @@ class RegressionCheckLoader:
     def recurse(self):
         return self._recurse
 
+    @property
+    def timings(self):
+        '''The time in seconds spent in each phase of the last loading per
+        directory.
+
+        This is a dictionary mapping the directories to a dictionary with
+        the ``discovery``, ``parse`` and ``import`` times of their files.
+        '''
+        return self._timings
+
+    def _add_time(self, dirname, phase, elapsed):
+        timings = self._timings.setdefault(
+            dirname, {'discovery': 0.0, 'parse': 0.0, 'import': 0.0}
+        )
+        timings[phase] += elapsed
+
+    def _log_timings(self):
+        if not self._timings:
+            return
+
+        getlogger().verbose('Test loading times (s) per directory:')
+        getlogger().verbose(
+            f'  {"discovery":>10} {"parse":>10} {"import":>10}  directory'
+        )
+        by_total = sorted(self._timings.items(),
+                          key=lambda t: sum(t[1].values()), reverse=True)
+        for dirname, t in by_total:
+            getlogger().verbose(
+                f'  {t["discovery"]:10.3f} {t["parse"]:10.3f} '
+                f'{t["import"]:10.3f}  {dirname}'
+            )
+
     def _set_defaults(self, test_registry):
         if test_registry is None:
             return
@@ -160,7 +501,60 @@ class RegressionCheckLoader:
                 f'the following variables were not set: {varlist}'
             )
 
-    def load_from_module(self, module):
+    def _index_tests(self, testfile, registry, legacy_registry):
+        if self._index is None or self._index.lookup(testfile) is not None:
+            return
+
+        # The tests registered with the legacy registry are not known before
+        # their instantiation
+        if legacy_registry:
+            self._index.update(testfile, True, None)
+            return
+
+        tests, sources = [], set()
+        for cls in registry or []:
+            variant_nums = registry.variant_nums(cls)
+            if variant_nums == []:
+                continue
+
+            tests.append(_describe_test(cls, variant_nums))
+            _class_sources(cls, sources)
+
+        self._index.update(testfile, True, tests, sources)
+
+    def _reset_sysenv(self):
+        return self._skip_prgenv_check << 1 | self._skip_system_check
+
+    def _register_name(self, name, testfile):
+        try:
+            conflicted = self._loaded[name]
+        except KeyError:
+            self._loaded[name] = testfile
+        else:
+            raise NameConflictError(
+                f'test {name!r} from {testfile!r} '
+                f'is already defined in {conflicted!r}'
+            )
+
+    def _validate_tests(self, candidate_tests, testfile, registered=()):
+        from reframe.core.pipeline import RegressionTest
+
+        final_tests = []
+        for c in candidate_tests:
+            if not isinstance(c, RegressionTest):
+                continue
+
+            if not self._validate_check(c):
+                continue
+
+            if c.unique_name not in registered:
+                self._register_name(c.unique_name, testfile)
+
+            final_tests.append(c)
+
+        return final_tests
+
+    def load_from_module(self, module, select=None):
         '''Load user checks from module.
 
         This method tries to load the test registry from a given module and
@@ -170,19 +564,33 @@ class RegressionCheckLoader:
         For legacy reasons, a module might have the additional legacy registry
         `_rfm_gettests`, which is a method that instantiates all the tests
         registered with the deprecated `parameterized_test` decorator.
-        '''
-        from reframe.core.pipeline import RegressionTest
 
+        :arg select: A test case filter to select the test variants to be
+            instantiated; see :func:`load_all`.
+        '''
         # FIXME: Remove the legacy_registry after dropping parameterized_test
         registry = getattr(module, '_rfm_test_registry', None)
         legacy_registry = getattr(module, '_rfm_gettests', None)
+        testfile = module.__file__
+
+        # Index the tests before any variables are set externally
+        self._index_tests(testfile, registry, legacy_registry)
         if not any((registry, legacy_registry)):
             getlogger().debug('No tests registered')
             return []
 
         self._set_defaults(registry)
-        reset_sysenv = self._skip_prgenv_check << 1 | self._skip_system_check
-        if registry:
+        reset_sysenv = self._reset_sysenv()
+        if registry and select:
+            candidate_tests = registry.instantiate_all(
+                reset_sysenv, _variant_selector(select)
+            )
+            if registry.deferred():
+                for name in registry.deferred():
+                    self._register_name(name, testfile)
+
+                self._deferred.append((registry, testfile))
+        elif registry:
             candidate_tests = registry.instantiate_all(reset_sysenv)
         else:
             candidate_tests = []
@@ -208,36 +616,94 @@ class RegressionCheckLoader:
         candidate_tests += legacy_tests
 
         # Post-instantiation validation of the candidate tests
-        final_tests = []
-        for c in candidate_tests:
-            if not isinstance(c, RegressionTest):
-                continue
+        final_tests = self._validate_tests(candidate_tests, testfile)
+        getlogger().debug(f'  > Loaded {len(final_tests)} test(s)')
+        return final_tests
 
-            if not self._validate_check(c):
-                continue
+    def _skip_file(self, filename, tests):
+        for t in tests:
+            for _, name, *_ in t['variants']:
+                self._register_name(name, filename)
+                self._skipped[name] = filename
 
-            testfile = module.__file__
-            try:
-                conflicted = self._loaded[c.unique_name]
-            except KeyError:
-                self._loaded[c.unique_name] = testfile
-                final_tests.append(c)
-            else:
-                raise NameConflictError(
-                    f'test {c.unique_name!r} from {testfile!r} '
-                    f'is already defined in {conflicted!r}'
-                )
+    def _load_skipped(self, names, force, select):
+        filenames = {self._skipped[n] for n in names if n in self._skipped}
+        checks = []
+        for filename in sorted(filenames):
+            getlogger().debug(f'Importing {filename!r} for dependencies')
+            for name, testfile in list(self._skipped.items()):
+                if testfile == filename:
+                    del self._skipped[name]
+                    del self._loaded[name]
 
-        getlogger().debug(f'  > Loaded {len(final_tests)} test(s)')
-        return final_tests
+            checks += self._import_file(filename, force, select)
+
+        return checks
+
+    def _load_deps(self, checks, force=False, select=None):
+        '''Instantiate the deferred tests that the checks depend on,
+        directly or indirectly.
+
+        Any files that have not been imported, because none of their tests
+        were selected, are imported if they define any of these tests.
+        '''
 
-    def load_from_file(self, filename, force=False):
-        if not self._validate_source(filename):
+        ret = []
+        while checks:
+            names = {dep[0] for c in checks for dep in c.user_deps()}
+            checks = self._load_skipped(names, force, select)
+            for registry, testfile in self._deferred:
+                deferred = names & registry.deferred()
+                if not deferred:
+                    continue
+
+                candidate_tests = registry.instantiate(deferred,
+                                                      self._reset_sysenv())
+                checks += self._validate_tests(candidate_tests,
+                                               testfile, deferred)
+
+            ret += checks
+
+        return ret
+
+    def _is_test_file(self, filename, entry):
+        if entry is not None:
+            getlogger().debug(f'Validating {filename!r}: found in index')
+            return entry['is_test_file']
+
+        if filename in self._validated:
+            valid = self._validated.pop(filename)
+            result = 'OK' if valid else 'not a test file'
+            getlogger().debug(f'Validating {filename!r}: {result} (parallel)')
+        else:
+            start = time.time()
+            valid = self._validate_source(filename)
+            self._add_time(os.path.dirname(filename), 'parse',
+                           time.time() - start)
+
+        if not valid and self._index is not None:
+            self._index.update(filename, False)
+
+        return valid
+
+    def load_from_file(self, filename, force=False, select=None):
+        entry = self._index.lookup(filename) if self._index else None
+        if not self._is_test_file(filename, entry):
+            return []
+
+        if select and entry and not _may_select(entry['tests'], select,
+                                                self._external_vars):
+            getlogger().debug(f'Skipping {filename!r}: no tests selected')
+            self._skip_file(filename, entry['tests'])
             return []
 
+        return self._import_file(filename, force, select)
+
+    def _import_file(self, filename, force, select):
+        start = time.time()
         try:
             return self.load_from_module(
-                util.import_module_from_file(filename, force)
+                util.import_module_from_file(filename, force), select
             )
         except Exception:
             exc_info = sys.exc_info()
@@ -251,31 +717,100 @@ class RegressionCheckLoader:
                 return []
             else:
                 raise
+        finally:
+            self._add_time(os.path.dirname(filename), 'import',
+                           time.time() - start)
 
-    def load_from_dir(self, dirname, recurse=False, force=False):
-        checks = []
+    def _find_files(self, dirname, recurse):
+        '''Return the candidate test files of ``dirname``.'''
+
+        filenames, elapsed = [], 0.0
+        start = time.time()
         for entry in os.scandir(dirname):
             if recurse and entry.is_dir():
-                checks += self.load_from_dir(entry.path, recurse, force)
+                # Do not account the subdirectories to this directory
+                elapsed += time.time() - start
+                filenames += self._find_files(entry.path, recurse)
+                start = time.time()
 
             if (entry.name.startswith('.') or
                 not entry.name.endswith('.py') or
                 not entry.is_file()):
                 continue
 
-            checks += self.load_from_file(entry.path, force)
+            filenames.append(entry.path)
+
+        elapsed += time.time() - start
+        self._add_time(dirname, 'discovery', elapsed)
+        return filenames
+
+    def _validate_files(self, filenames):
+        '''Validate and byte-compile the candidate test files in parallel.
+
+        Files found in the discovery index are not validated again. The
+        files that fail to validate are left to be validated serially, so as
+        to report any errors.
+        '''
+        candidates = [
+            f for f in filenames
+            if self._index is None or self._index.lookup(f) is None
+        ]
+        if len(candidates) < _PARALLEL_VALIDATION_MIN_FILES:
+            return
+
+        getlogger().debug(f'Validating {len(candidates)} file(s) in parallel')
+        try:
+            with concurrent.futures.ProcessPoolExecutor() as pool:
+                futures = {pool.submit(_validate_file, f): f
+                           for f in candidates}
+                for fut in concurrent.futures.as_completed(futures):
+                    filename = futures[fut]
+                    with contextlib.suppress(Exception):
+                        valid, elapsed = fut.result()
+                        self._validated[filename] = valid
+                        self._add_time(os.path.dirname(filename), 'parse',
+                                       elapsed)
+        except (OSError, NotImplementedError) as e:
+            getlogger().debug(f'parallel validation failed: {e}')
+
+    def _load_files(self, filenames, force, select):
+        self._validate_files(filenames)
+        checks = []
+        for f in filenames:
+            checks += self.load_from_file(f, force, select)
 
         return checks
 
-    def load_all(self, force=False):
+    def load_from_dir(self, dirname, recurse=False, force=False,
+                      select=None):
+        return self._load_files(self._find_files(dirname, recurse),
+                                force, select)
+
+    def load_all(self, force=False, select=None):
         '''Load all checks in self._load_path.
 
         If a prefix exists, it will be prepended to each path.
 
         :arg force: Force reloading of test files.
+        :arg select: A test case filter, such as those of
+            :mod:`reframe.frontend.filters`, to select the test variants to
+            be instantiated. The filter is passed a
+            :class:`RegisteredVariant` and the variants it rejects are not
+            instantiated, unless another loaded test depends on them.
+            Variants that cannot be judged before their instantiation are
+            always instantiated, so the loaded tests must still be filtered.
+            Variants are also instantiated if the filter may select any of
+            their fixtures.
+            If a discovery index is used, the filter is passed also an
+            :class:`IndexedVariant` for each variant of the indexed test
+            files and the files with no selected variants are not imported
+            at all.
         :returns: The list of loaded tests.
         '''
-        checks = []
+        self._deferred = []
+        self._skipped = {}
+        self._timings = {}
+        filenames = []
         for d in self._load_path:
             getlogger().debug(f'Looking for tests in {d!r}')
             if not os.path.exists(d):
@@ -283,8 +818,16 @@ class RegressionCheckLoader:
                 continue
 
             if os.path.isdir(d):
-                checks += self.load_from_dir(d, self._recurse, force)
+                filenames += self._find_files(d, self._recurse)
             else:
-                checks += self.load_from_file(d, force)
+                filenames.append(d)
+
+        checks = self._load_files(filenames, force, select)
+        if self._deferred or self._skipped:
+            checks += self._load_deps(checks, force, select)
+
+        if self._index is not None:
+            self._index.save()
 
+        self._log_timings()
         return checks
@@ -4,6 +4,7 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 import decimal
+import functools
 import json
 import jsonschema
 import lxml.etree as etree
@@ -13,6 +14,7 @@ import re
 import reframe as rfm
 import reframe.core.exceptions as errors
 import reframe.utility.jsonext as jsonext
+import reframe.utility.osext as osext
 
 
 # The schema data version
@@ -108,9 +110,10 @@ class _RunReport:
                 f'not found in the report files'
             )
 
+        # The dump file may have been compressed with `--compress-output`
         dump_file = os.path.join(tc['stagedir'], '.rfm_testcase.json')
         try:
-            with open(dump_file) as fp:
+            with osext.open_compressed(dump_file) as fp:
                 testcase._check = jsonext.load(fp)
         except (OSError, json.JSONDecodeError) as e:
             raise errors.ReframeError(
@@ -136,9 +139,20 @@ def next_report_filename(filepatt, new=True):
     return filepatt.format(sessionid=new_id)
 
 
+@functools.lru_cache(maxsize=None)
+def _report_validator():
+    # The schema itself is checked only once
+    with open(_SCHEMA) as fp:
+        schema = json.load(fp)
+
+    validator_cls = jsonschema.validators.validator_for(schema)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema)
+
+
 def _load_report(filename):
     try:
-        with open(filename) as fp:
+        with osext.open_compressed(filename) as fp:
             report = json.load(fp)
     except OSError as e:
         raise errors.ReframeError(
@@ -148,11 +162,8 @@ def _load_report(filename):
             f'report file {filename!r} is not a valid JSON file') from e
 
     # Validate the report
-    with open(_SCHEMA) as fp:
-        schema = json.load(fp)
-
     try:
-        jsonschema.validate(report, schema)
+        _report_validator().validate(report)
     except jsonschema.ValidationError as e:
         try:
             found_ver = report['session_info']['data_version']
@@ -82,7 +82,7 @@ def distribute_tests(testcases, node_map):
     # per partition
     check_part_combs = set()
     for tc in testcases:
-        check, partition, _ = tc
+        check, partition = tc.orig_check, tc.partition
         candidate_comb = (check.unique_name, partition.fullname)
         if check.is_fixture() or candidate_comb in check_part_combs:
             continue
@@ -132,7 +132,7 @@ def repeat_tests(testcases, num_repeats):
     tmp_registry = TestRegistry()
     unique_checks = set()
     for tc in testcases:
-        check = tc.check
+        check = tc.orig_check
         if check.is_fixture() or check in unique_checks:
             continue
 
@@ -358,7 +358,7 @@ def _is_function_type(cls):
             isinstance(cls, types.FunctionType))
 
 
-def attr_validator(validate_fn):
+def attr_validator(validate_fn, skip_fn=None):
     '''Validate object attributes recursively.
 
     This returns a function which you can call with the object to check. It
@@ -368,6 +368,10 @@ def attr_validator(validate_fn):
 
     :arg validate_fn: A callable that validates an object. It takes a single
         argument, which is the object to validate.
+    :arg skip_fn: A callable that takes the type of an object and returns
+        :class:`True` if all the objects of this type are known to be valid.
+        Such objects are neither passed to ``validate_fn`` nor validated
+        recursively.
 
     :returns: A validation function that will perform the actual validation.
         It accepts a single argument, which is the object to validate. It
@@ -380,102 +384,92 @@ def attr_validator(validate_fn):
 
     .. versionadded:: 3.3
 
-    '''
-
-    # Already visited objects
-    visited = set()
-    depth = 0
-
-    def _do_validate(obj, path=None):
-        def _fmt(path):
-            ret = ''
-            for p in path:
-                t, name = p
-                if t == 'A':
-                    ret += f'.{name}'
-                elif t == 'I':
-                    ret += f'[{name}]'
-                elif t == 'K':
-                    ret += f'[{name!r}]'
-
-            # Remove leading '.'
-            return ret[1:] if ret[0] == '.' else ret
-
-        nonlocal depth
+    .. versionchanged:: 3.12.0
+       The ``skip_fn`` argument is added.
 
-        def _clean_cache():
-            nonlocal depth
+    '''
 
-            depth -= 1
-            if depth == 0:
-                # We are exiting the top-level call
-                visited.clear()
+    def _fmt(path):
+        ret = ''
+        for p in path:
+            t, name = p
+            if t == 'A':
+                ret += f'.{name}'
+            elif t == 'I':
+                ret += f'[{name}]'
+            elif t == 'K':
+                ret += f'[{name!r}]'
+
+        # Remove leading '.'
+        return ret[1:] if ret[0] == '.' else ret
+
+    def _do_validate(obj, path, visited):
+        # On failure, `path` is left pointing to the faulty attribute
+        if skip_fn is not None and skip_fn(type(obj)):
+            return True
 
-        depth += 1
         visited.add(id(obj))
-        if path is None:
-            path = [('A', type(obj).__name__)]
-
         if isinstance(obj, dict):
-            for k, v in obj.items():
-                if id(v) in visited:
-                    continue
+            items = obj.items()
+            kind = 'K'
+        elif (isinstance(obj, list) or
+              isinstance(obj, tuple) or
+              isinstance(obj, set)):
+            items = enumerate(obj)
+            kind = 'I'
+        else:
+            if not validate_fn(obj):
+                return False
 
-                path.append(('K', k))
-                valid, _ = _do_validate(v, path)
-                if not valid:
-                    _clean_cache()
-                    return False, _fmt(path)
+            # Stop here if obj is a built-in type
+            if isinstance(obj, type) and _is_builtin_type(obj):
+                return True
 
-                path.pop()
+            if not hasattr(obj, '__dict__'):
+                return True
 
-            _clean_cache()
-            return True, _fmt(path)
+            items = obj.__dict__.items()
+            kind = 'A'
 
-        if (isinstance(obj, list) or
-            isinstance(obj, tuple) or
-            isinstance(obj, set)):
-            for i, x in enumerate(obj):
-                if id(x) in visited:
-                    continue
+        for k, v in items:
+            if id(v) in visited:
+                continue
+
+            path.append((kind, k))
+            if not _do_validate(v, path, visited):
+                return False
 
-                path.append(('I', i))
-                valid, _ = _do_validate(x, path)
-                if not valid:
-                    _clean_cache()
-                    return False, _fmt(path)
+            path.pop()
 
-                path.pop()
+        return True
 
-            _clean_cache()
-            return True, _fmt(path)
+    def _validate(obj):
+        path = [('A', type(obj).__name__)]
+        valid = _do_validate(obj, path, set())
+        return valid, _fmt(path)
 
-        valid = validate_fn(obj)
-        if not valid:
-            _clean_cache()
-            return False, _fmt(path)
+    return _validate
 
-        # Stop here if obj is a built-in type
-        if isinstance(obj, type) and _is_builtin_type(obj):
-            return True, _fmt(path)
 
-        if hasattr(obj, '__dict__'):
-            for k, v in obj.__dict__.items():
-                if id(v) in visited:
-                    continue
+@functools.lru_cache(maxsize=None)
+def is_trivially_copyable(cls):
+    '''Check if all the objects of type ``cls`` can be copied with
+    :py:func:`copy.deepcopy`, without inspecting them.
 
-                path.append(('A', k))
-                valid, _ = _do_validate(v, path)
-                if not valid:
-                    _clean_cache()
-                    return False, _fmt(path)
+    This is only the case for the atomic built-in types and the functions,
+    which are not copied at all and do not refer to other objects. Subclasses
+    of these types are not trivially copyable and neither are the types that
+    define a :func:`__deepcopy__` method, since their objects may still hold
+    objects that cannot be copied. The result is memoized per type.
 
-                path.pop()
+    .. versionadded:: 3.12.0
 
-        _clean_cache()
-        return True, _fmt(path)
+    '''
 
-    return _do_validate
+    atomic_types = (type(None), int, float, bool, complex, str, bytes,
+                    range, slice, type(Ellipsis), type(NotImplemented),
+                    types.BuiltinFunctionType, types.FunctionType)
+    return cls in atomic_types
 
 
 def is_copyable(obj):
@@ -494,6 +488,9 @@ def is_copyable(obj):
 
     '''
 
+    if is_trivially_copyable(type(obj)):
+        return True
+
     if hasattr(obj, '__copy__') or hasattr(obj, '__deepcopy__'):
         return True
 
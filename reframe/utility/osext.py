@@ -9,8 +9,11 @@
 
 import collections.abc
 import errno
+import fcntl
 import getpass
 import grp
+import gzip
+import json
 import os
 import re
 import semver
@@ -49,6 +52,20 @@ def run_command(cmd, check=False, timeout=None, **kwargs):
 
     '''
 
+    if _command_interceptor is not None:
+        completed = _command_interceptor(cmd, timeout=timeout, **kwargs)
+    else:
+        completed = _run_command(cmd, timeout=timeout, **kwargs)
+
+    if check and completed.returncode != 0:
+        raise SpawnedProcessError(completed.args,
+                                  completed.stdout, completed.stderr,
+                                  completed.returncode)
+
+    return completed
+
+
+def _run_command(cmd, timeout=None, **kwargs):
     try:
         proc = run_command_async(cmd, start_new_session=True, **kwargs)
         proc_stdout, proc_stderr = proc.communicate(timeout=timeout)
@@ -58,17 +75,16 @@ def run_command(cmd, check=False, timeout=None, **kwargs):
                                     proc.stdout.read(),
                                     proc.stderr.read(), timeout) from None
 
-    completed = subprocess.CompletedProcess(cmd,
-                                            returncode=proc.returncode,
-                                            stdout=proc_stdout,
-                                            stderr=proc_stderr)
+    return subprocess.CompletedProcess(cmd,
+                                       returncode=proc.returncode,
+                                       stdout=proc_stdout,
+                                       stderr=proc_stderr)
 
-    if check and proc.returncode != 0:
-        raise SpawnedProcessError(completed.args,
-                                  completed.stdout, completed.stderr,
-                                  completed.returncode)
 
-    return completed
+# Callable that, if set, runs the commands of :func:`run_command` in place of
+# :func:`_run_command`; it is used for recording and replaying the
+# interactions with the scheduler (see :mod:`reframe.core.schedulers.replay`)
+_command_interceptor = None
 
 
 def run_command_async(cmd,
@@ -257,6 +273,214 @@ def copytree_virtual(src, dst, file_links=None,
                 raise
 
 
+#: Suffixes of the files compressed with each of the supported compression
+#: methods.
+#:
+#: .. versionadded:: 3.12.0
+COMPRESSION_SUFFIXES = {
+    'gzip': '.gz',
+    'zstd': '.zst'
+}
+
+
+def _zstd():
+    try:
+        # Python >= 3.14 ships zstd support in the standard library
+        from compression import zstd
+    except ImportError:
+        try:
+            import zstandard as zstd
+        except ImportError:
+            raise ReframeError(
+                "zstd compression requires the 'zstandard' Python package"
+            ) from None
+
+    return zstd
+
+
+def find_compressed(filename):
+    '''Find the actual file corresponding to ``filename``.
+
+    If ``filename`` has the suffix of a compressed file, it is returned as-is.
+    Otherwise, if ``filename`` does not exist, but a compressed version of it
+    exists, the latter is returned.
+
+    :arg filename: The file to look up.
+    :returns: A tuple of the actual file name and the compression method used
+        for it or :obj:`None` if the file is not compressed.
+
+    .. versionadded:: 3.12.0
+    '''
+    filename = os.fspath(filename)
+    for method, suffix in COMPRESSION_SUFFIXES.items():
+        if filename.endswith(suffix):
+            return filename, method
+
+    if not os.path.exists(filename):
+        for method, suffix in COMPRESSION_SUFFIXES.items():
+            if os.path.exists(filename + suffix):
+                return filename + suffix, method
+
+    return filename, None
+
+
+def open_compressed(filename, mode='r', method=None, **kwargs):
+    '''Open a file, compressing or decompressing its contents on the fly.
+
+    Unlike the builtin :func:`open`, files are opened in text mode unless
+    ``'b'`` is present in ``mode``.
+
+    :arg filename: The file to open.
+    :arg mode: The mode to open the file in.
+    :arg method: The compression method to use; one of the keys of
+        :attr:`COMPRESSION_SUFFIXES`. If :obj:`None`, the method is deduced
+        from ``filename`` as in :func:`find_compressed`, when the file is
+        opened for reading, and from its suffix otherwise. Files without a
+        known compression suffix are opened with the builtin :func:`open`.
+    :arg kwargs: Any additional arguments to pass to the underlying
+        :func:`open` function.
+    :returns: A file object.
+
+    .. versionadded:: 3.12.0
+    '''
+    if method is None:
+        if 'r' in mode:
+            filename, method = find_compressed(filename)
+        else:
+            filename = os.fspath(filename)
+            method = next((m for m, s in COMPRESSION_SUFFIXES.items()
+                           if filename.endswith(s)), None)
+
+    if method is None:
+        return open(filename, mode, **kwargs)
+
+    if 'b' not in mode and 't' not in mode:
+        mode += 't'
+
+    if method == 'gzip':
+        return gzip.open(filename, mode, **kwargs)
+    elif method == 'zstd':
+        return _zstd().open(filename, mode, **kwargs)
+    else:
+        raise ValueError(f'unknown compression method: {method!r}')
+
+
+def copy_compressed(src, dst, method, follow_symlinks=True):
+    '''Copy the file ``src`` to ``dst`` compressing its contents.
+
+    The suffix of the compression ``method`` is appended to the destination
+    file name and the metadata of ``src`` are copied over as with
+    :py:func:`shutil.copy2`. This function may be used as the
+    ``copy_function`` of :func:`copytree`.
+
+    :arg src: The file to copy.
+    :arg dst: The destination file or directory.
+    :arg method: The compression method to use; one of the keys of
+        :attr:`COMPRESSION_SUFFIXES`.
+    :returns: The name of the compressed file.
+
+    .. versionadded:: 3.12.0
+    '''
+    try:
+        suffix = COMPRESSION_SUFFIXES[method]
+    except KeyError:
+        raise ValueError(f'unknown compression method: {method!r}') from None
+
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+
+    dst += suffix
+    if method == 'gzip':
+        # Level 6 is the zlib default; higher levels are much slower for a
+        # marginal gain on text
+        kwargs = {'compresslevel': 6}
+    else:
+        kwargs = {}
+
+    with open(src, 'rb') as fp_src:
+        with open_compressed(dst, 'wb', method, **kwargs) as fp_dst:
+            shutil.copyfileobj(fp_src, fp_dst)
+
+    shutil.copystat(src, dst, follow_symlinks=follow_symlinks)
+    return dst
+
+
+# The FICLONE ioctl of Linux, i.e., _IOW(0x94, 9, int)
+_FICLONE = 0x40049409
+
+
+def _dst_path(src, dst):
+    if os.path.isdir(dst):
+        return os.path.join(dst, os.path.basename(src))
+
+    return dst
+
+
+def clone_file(src, dst, *, follow_symlinks=True):
+    '''Copy the file ``src`` to ``dst`` sharing their data blocks.
+
+    The copy is a reflink, i.e., a copy-on-write clone of ``src``, so that no
+    data is written until either of the files is modified. If the filesystem
+    does not support reflinks, this function falls back to
+    :py:func:`shutil.copy2`. In any case, the metadata of ``src`` are copied
+    over, so this function may be used as the ``copy_function`` of
+    :func:`copytree`.
+
+    :returns: The name of the destination file.
+
+    .. versionadded:: 3.12.0
+    '''
+    dst = _dst_path(src, dst)
+    if ((follow_symlinks or not os.path.islink(src)) and
+        sys.platform.startswith('linux')):
+        try:
+            with open(src, 'rb') as fp_src, open(dst, 'wb') as fp_dst:
+                fcntl.ioctl(fp_dst.fileno(), _FICLONE, fp_src.fileno())
+        except OSError as e:
+            if e.errno not in (errno.EOPNOTSUPP, errno.EXDEV, errno.EINVAL,
+                               errno.ENOTTY, errno.EPERM):
+                raise
+        else:
+            shutil.copystat(src, dst)
+            return dst
+
+    return shutil.copy2(src, dst, follow_symlinks=follow_symlinks)
+
+
+def link_file(src, dst, *, follow_symlinks=True):
+    '''Hard link the file ``src`` to ``dst``.
+
+    If ``dst`` exists, it is replaced. If ``src`` cannot be hard linked, e.g.,
+    because ``dst`` is on a different filesystem, this function falls back to
+    :py:func:`shutil.copy2`. This function may be used as the
+    ``copy_function`` of :func:`copytree`.
+
+    .. warning::
+       The linked files share their contents, so modifying either of them in
+       place modifies the other, too.
+
+    :returns: The name of the destination file.
+
+    .. versionadded:: 3.12.0
+    '''
+    dst = _dst_path(src, dst)
+    if follow_symlinks or not os.path.islink(src):
+        try:
+            try:
+                os.link(src, dst)
+            except FileExistsError:
+                os.remove(dst)
+                os.link(src, dst)
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK,
+                               errno.EOPNOTSUPP):
+                raise
+        else:
+            return dst
+
+    return shutil.copy2(src, dst, follow_symlinks=follow_symlinks)
+
+
 def rmtree(*args, max_retries=3, **kwargs):
     '''Persistent version of :py:func:`shutil.rmtree`.
 
@@ -389,6 +613,38 @@ def force_remove_file(filename):
         pass
 
 
+def dump_json_atomic(obj, filename, mode=None, **kwargs):
+    '''Write ``obj`` as JSON to ``filename`` atomically.
+
+    The object is first written to a temporary file in the directory of
+    ``filename``, which then replaces ``filename``, so that concurrent readers
+    never see a partially written file. The temporary file is removed if the
+    write fails.
+
+    :arg obj: The object to write.
+    :arg filename: The file to write.
+    :arg mode: The permissions of the file; if :obj:`None`, the file is
+        readable and writable only by the current user.
+    :arg kwargs: Keyword arguments passed through to :py:func:`json.dump`.
+    :raises OSError: If the file cannot be written.
+
+    .. versionadded:: 3.12.0
+    '''
+
+    fd, tmpfile = tempfile.mkstemp(dir=os.path.dirname(filename) or '.',
+                                   prefix='.tmp_')
+    try:
+        with os.fdopen(fd, 'w') as fp:
+            if mode is not None:
+                os.fchmod(fp.fileno(), mode)
+
+            json.dump(obj, fp, **kwargs)
+
+        os.replace(tmpfile, filename)
+    finally:
+        force_remove_file(tmpfile)
+
+
 class change_dir:
     '''Context manager to temporarily change the current working directory.
 
@@ -412,7 +668,7 @@ def is_url(s):
     return parsed.scheme != '' and parsed.netloc != ''
 
 
-def git_clone(url, targetdir=None, opts=None, timeout=5):
+def git_clone(url, targetdir=None, opts=None, timeout=5, mirror=None):
     '''Clone a git repository from a URL.
 
     :arg url: The URL to clone from.
@@ -422,13 +678,33 @@ def git_clone(url, targetdir=None, opts=None, timeout=5):
     :arg targetdir: The directory where the repository will be cloned to. If
         :class:`None`, a new directory will be created with the repository
         name as if ``git clone {url}`` was issued.
+    :arg mirror: A local mirror of the repository. If given, the repository
+        is cloned from the mirror without accessing ``url`` at all and the
+        ``origin`` remote of the clone is set to ``url`` afterwards. The
+        clone does not depend on the mirror, so that the mirror may be
+        removed afterwards.
+
+    .. versionchanged:: 3.12.0
+       The ``mirror`` argument is added.
     '''
-    if not git_repo_exists(url, timeout=timeout):
-        raise ReframeError('git repository does not exist')
-
-    targetdir = targetdir or ''
     opts = ' '.join(opts) if opts is not None else ''
-    run_command(f'git clone {opts} {url} {targetdir}', check=True)
+    if mirror is None:
+        if not git_repo_exists(url, timeout=timeout):
+            raise ReframeError('git repository does not exist')
+
+        targetdir = targetdir or ''
+        run_command(f'git clone {opts} {url} {targetdir}', check=True)
+        return
+
+    if not targetdir:
+        targetdir = os.path.basename(url.rstrip('/'))
+        if targetdir.endswith('.git'):
+            targetdir = targetdir[:-4]
+
+    run_command(f'git clone {opts} {shlex.quote(mirror)} '
+                f'{shlex.quote(targetdir)}', check=True)
+    run_command(f'git -C {shlex.quote(targetdir)} remote set-url origin '
+                f'{shlex.quote(url)}', check=True)
 
 
 def git_repo_exists(url, timeout=5):
@@ -3,18 +3,27 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import array
 import builtins
 import collections.abc
 import contextlib
+import functools
 import glob as pyglob
+import inspect
+import io
 import itertools
+import math
+import mmap
+import operator
 import os
 import re
 import sys
 
 import reframe.utility as util
+import reframe.utility.osext as osext
 import reframe.core.warnings as warn
-from reframe.core.deferrable import (deferrable, _DeferredExpression,
+from reframe.core.deferrable import (deferrable, evaluation_stats,
+                                     _DeferredExpression,
                                      _DeferredPerformanceExpression)
 from reframe.core.exceptions import SanityError
 
@@ -31,16 +40,352 @@ def _format(s, *args, **kwargs):
         return s
 
 
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    '''Return the NumPy module or :obj:`None` if it is not available.'''
+    try:
+        import numpy
+    except ImportError:
+        return None
+    else:
+        return numpy
+
+
+def _is_ndarray(obj):
+    # If NumPy has not been imported, `obj` cannot be a NumPy array
+    numpy = sys.modules.get('numpy')
+    return numpy is not None and isinstance(obj, numpy.ndarray)
+
+
 @contextlib.contextmanager
-def _open(filename, *args, **kwargs):
+def _open(filename, mode='r', **kwargs):
+    method = None
+    if isinstance(filename, (str, os.PathLike)):
+        filename, method = osext.find_compressed(filename)
+
     try:
-        with open(filename, *args, **kwargs) as fp:
+        if method is None:
+            fp = open(filename, mode, **kwargs)
+        else:
+            fp = osext.open_compressed(filename, mode, method, **kwargs)
+
+        with fp:
             yield fp
     except OSError as e:
         # Re-raise it as sanity error
         raise SanityError(f'{filename}: {e.strerror}')
 
 
+class _FileContentsCache:
+    '''Cache of the decoded contents of files.
+
+    Entries are keyed by the absolute path of the file and the encoding used
+    for decoding it and they are invalidated as soon as the modification time
+    or the size of the file change. Compressed files are keyed by their
+    actual path (see :func:`reframe.utility.osext.find_compressed`).
+
+    Apart from the file contents, the cache holds also the matches of the
+    patterns that were scanned in batch for each file (see
+    :func:`batch_patterns`).
+    '''
+
+    def __init__(self):
+        # (path, encoding) -> (stamp, contents, {patt: matches})
+        self._entries = {}
+
+        # (path, encoding) -> {patt: None}; dicts preserve the order of the
+        # patterns
+        self._pending = {}
+
+    def _entry(self, filename, encoding):
+        path, _ = osext.find_compressed(os.path.abspath(filename))
+        try:
+            st = os.stat(path)
+        except OSError as e:
+            raise SanityError(f'{filename}: {e.strerror}')
+
+        key = (path, encoding)
+        stamp = (st.st_mtime_ns, st.st_size)
+        try:
+            entry = self._entries[key]
+        except KeyError:
+            pass
+        else:
+            if entry[0] == stamp:
+                return key, entry
+
+        with _open(filename, 'rt', encoding=encoding) as fp:
+            contents = fp.read()
+
+        entry = self._entries[key] = (stamp, contents, {})
+        return key, entry
+
+    def read(self, filename, encoding):
+        _, (_, contents, _) = self._entry(filename, encoding)
+        return contents
+
+    def add_pattern(self, patt, filename, encoding):
+        path, _ = osext.find_compressed(os.path.abspath(filename))
+        key = (path, encoding)
+        self._pending.setdefault(key, {})[patt] = None
+
+    def finditer(self, patt, filename, encoding):
+        key, (_, contents, matches) = self._entry(filename, encoding)
+        if patt not in matches:
+            pending = self._pending.get(key, {})
+            if patt in pending and builtins.len(pending) > 1:
+                matches.update(_scan_patterns(list(pending), contents))
+                del self._pending[key]
+
+        try:
+            return builtins.iter(matches[patt])
+        except KeyError:
+            return re.finditer(patt, contents, re.MULTILINE)
+
+
+# Named groups must be renamed when combining patterns, since group names may
+# not be repeated in a regex
+_NAMED_GROUP = re.compile(r'(?<!\\)\(\?P<(\w+)>')
+
+# Back references cannot be combined, since the group numbering changes
+_BACKREF = re.compile(r'\(\?P=\w+\)|\\[1-9]')
+
+
+# Every position where any of the combined patterns matches is processed in
+# Python, so the combined scan pays off only for patterns with few matches
+_MAX_SCAN_POSITIONS = 1000
+
+
+def _scan_patterns(patterns, string):
+    '''Find all matches of ``patterns`` in ``string`` in a single scan.
+
+    The patterns are combined in a single alternation, which is used for
+    locating the positions where any of them matches. Each pattern is then
+    matched only at these positions, so that the matches are exactly the same
+    as those of :func:`re.finditer`.
+
+    :returns: A dictionary with the list of matches of each pattern. Patterns
+        that cannot be combined are not included and the dictionary is empty
+        if the patterns match at too many positions.
+    '''
+
+    compiled = {}
+    alternatives = []
+    for patt in patterns:
+        if not isinstance(patt, str) or _BACKREF.search(patt):
+            continue
+
+        try:
+            regex = re.compile(patt, re.MULTILINE)
+        except re.error:
+            continue
+
+        # Patterns that match the empty string would make the combined
+        # pattern match at every position
+        if regex.match('') is not None:
+            continue
+
+        i = builtins.len(compiled)
+        compiled[patt] = regex
+        alternatives.append(
+            '(?:' + _NAMED_GROUP.sub(rf'(?P<_rfm{i}_\1>', patt) + ')'
+        )
+
+    if builtins.len(compiled) < 2:
+        return {}
+
+    try:
+        combined = re.compile('|'.join(alternatives), re.MULTILINE)
+    except re.error:
+        return {}
+
+    regexes = list(compiled.values())
+    matches = [[] for _ in regexes]
+    cursors = [0] * builtins.len(regexes)
+    pos = 0
+    for _ in range(_MAX_SCAN_POSITIONS):
+        m = combined.search(string, pos)
+        if m is None:
+            break
+
+        start = m.start()
+        for i, regex in builtins.enumerate(regexes):
+            if cursors[i] > start:
+                continue
+
+            match = regex.match(string, start)
+            if match is not None:
+                matches[i].append(match)
+                cursors[i] = builtins.max(match.end(), start + 1)
+
+        # No pattern can match before its cursor
+        pos = builtins.max(start + 1, builtins.min(cursors))
+        if pos > builtins.len(string):
+            break
+    else:
+        # Too many matches; separate scans are faster
+        return {}
+
+    return builtins.dict(builtins.zip(compiled.keys(), matches))
+
+
+# The file contents cache of the active `file_cache()` context
+_file_cache = None
+
+
+@contextlib.contextmanager
+def file_cache():
+    '''Context manager for caching the contents of the files examined by the
+    pattern matching functions.
+
+    Inside this context, each file passed to functions such as
+    :func:`assert_found`, :func:`findall`, :func:`extractall` or
+    :func:`extractsingle` is read and decoded only once, no matter how many
+    functions examine it.
+    A file is read again only if its modification time or its size have
+    changed since it was last read.
+    The cache is discarded when exiting the outermost context.
+
+    The framework evaluates the sanity and performance functions of a test
+    inside this context.
+
+    .. versionadded:: 3.12.0
+    '''
+    global _file_cache
+
+    if _file_cache is not None:
+        # Reuse the cache of the enclosing context
+        yield
+        return
+
+    _file_cache = _FileContentsCache()
+    try:
+        yield
+    finally:
+        _file_cache = None
+
+
+def _read(filename, encoding):
+    '''Return the contents of ``filename`` decoded with ``encoding``.
+
+    File descriptors are never cached.
+    '''
+    if _file_cache is None or not isinstance(filename, (str, os.PathLike)):
+        with _open(filename, 'rt', encoding=encoding) as fp:
+            return fp.read()
+
+    return _file_cache.read(filename, encoding)
+
+
+class _DecodedMatch:
+    '''A match of a bytes pattern with its groups decoded.
+
+    It offers the interface of the standard match objects, except for the
+    attributes that refer to the searched buffer, since the buffer is not
+    kept around. Positions are byte offsets in the file.
+    '''
+
+    __slots__ = ('re', 'lastindex', 'lastgroup', '_groups', '_spans')
+
+    def __init__(self, match, encoding):
+        self.re = match.re
+        self.lastindex = match.lastindex
+        self.lastgroup = match.lastgroup
+        self._spans = tuple(match.span(i)
+                            for i in range(match.re.groups + 1))
+        self._groups = tuple(None if g is None else g.decode(encoding)
+                             for g in (match.group(0), *match.groups()))
+
+    def _index(self, group):
+        if isinstance(group, str):
+            try:
+                return self.re.groupindex[group]
+            except KeyError:
+                raise IndexError('no such group') from None
+
+        if group < 0 or group >= builtins.len(self._groups):
+            raise IndexError('no such group')
+
+        return group
+
+    def group(self, *groups):
+        if not groups:
+            return self._groups[0]
+
+        if builtins.len(groups) == 1:
+            return self._groups[self._index(groups[0])]
+
+        return tuple(self._groups[self._index(g)] for g in groups)
+
+    def __getitem__(self, group):
+        return self.group(group)
+
+    def groups(self, default=None):
+        return tuple(default if g is None else g for g in self._groups[1:])
+
+    def groupdict(self, default=None):
+        return {name: default if self._groups[i] is None else self._groups[i]
+                for name, i in self.re.groupindex.items()}
+
+    def span(self, group=0):
+        return self._spans[self._index(group)]
+
+    def start(self, group=0):
+        return self.span(group)[0]
+
+    def end(self, group=0):
+        return self.span(group)[1]
+
+    def __repr__(self):
+        return (f'<{type(self).__name__} object; span={self.span()}, '
+                f'match={self.group()!r}>')
+
+
+def _finditer_mmap(patt, filename, encoding):
+    # The pattern is matched byte-wise, so it must mean the same as bytes as
+    # it does as a string
+    if not isinstance(patt, str) or not patt.isascii():
+        raise SanityError(f'only ASCII string patterns can be matched in '
+                          f'mmap mode: {patt!r}')
+
+    if 'a\n'.encode(encoding) != b'a\n':
+        raise SanityError(f'cannot memory map files with a non-ASCII '
+                          f'compatible encoding: {encoding!r}')
+
+    def _decode(match):
+        try:
+            return _DecodedMatch(match, encoding)
+        except UnicodeDecodeError as err:
+            raise SanityError(
+                f'could not decode the match of pattern {patt!r} in '
+                f'{filename!r} at byte offset {match.start()}: {err}'
+            ) from None
+
+    regex = re.compile(patt.encode(encoding), re.MULTILINE)
+    with _open(filename, 'rb') as fp:
+        if not isinstance(fp, io.BufferedReader):
+            # Compressed files cannot be memory mapped; decompress them in
+            # memory instead
+            yield from builtins.map(_decode, regex.finditer(fp.read()))
+            return
+
+        # Empty files cannot be memory mapped
+        if os.fstat(fp.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            # The raw matches must not outlive the mapping, so they are
+            # decoded and dropped immediately
+            yield from builtins.map(_decode, regex.finditer(buf))
+
+
+def _finditer_lines(patt, filename, encoding):
+    regex = re.compile(patt, re.MULTILINE)
+    with _open(filename, 'rt', encoding=encoding) as fp:
+        for line in fp:
+            yield from regex.finditer(line)
+
+
 def make_performance_function(func, unit, *args, **kwargs):
     '''Convert a callable or deferred expression into a performance function.
 
@@ -144,12 +489,18 @@ def map(function, *iterables):
 @deferrable
 def max(*args):
     '''Replacement for the built-in :func:`max() <python:max>` function.'''
+    if builtins.len(args) == 1 and _is_ndarray(args[0]):
+        return args[0].max().item()
+
     return builtins.max(*args)
 
 
 @deferrable
 def min(*args):
     '''Replacement for the built-in :func:`min() <python:min>` function.'''
+    if builtins.len(args) == 1 and _is_ndarray(args[0]):
+        return args[0].min().item()
+
     return builtins.min(*args)
 
 
@@ -222,6 +573,9 @@ def sorted(iterable, *args):
 @deferrable
 def sum(iterable, *args):
     '''Replacement for the built-in :func:`sum() <python:sum>` function.'''
+    if _is_ndarray(iterable):
+        return iterable.sum().item() + (args[0] if args else 0)
+
     return builtins.sum(iterable, *args)
 
 
@@ -429,7 +783,7 @@ def assert_le(a, b, msg=None):
 
 
 @deferrable
-def assert_found(patt, filename, msg=None, encoding='utf-8'):
+def assert_found(patt, filename, msg=None, encoding='utf-8', mode='text'):
     '''Assert that regex pattern ``patt`` is found in the file ``filename``.
 
     :arg patt: The regex pattern to search.
@@ -445,14 +799,37 @@ def assert_found(patt, filename, msg=None, encoding='utf-8'):
     :arg msg: The error message to use if the assertion fails. You may use
         ``{0}`` ... ``{N}`` as placeholders for the function arguments.
     :arg encoding: The name of the encoding used to decode the file.
+    :arg mode: How the file is processed.
+        The default ``'text'`` mode reads and decodes the whole file in
+        memory.
+        The ``'mmap'`` mode memory maps the file and matches ``patt`` against
+        its raw bytes, so that only the matched groups are decoded.
+        The pattern must be an ASCII string and the encoding of the file
+        must be ASCII compatible; the character classes of the pattern, e.g.,
+        ``\\d`` or ``\\w``, match only ASCII characters and match
+        positions are byte offsets.
+        A :class:`~reframe.core.exceptions.SanityError` is raised if a
+        matched group is not valid in the file's encoding, e.g., if ``.``
+        matches only part of a multi-byte character.
+        The ``'lines'`` mode reads the file line by line keeping in memory
+        only the current line, so the pattern may not span multiple lines;
+        match positions are relative to the matched line.
+        The ``'mmap'`` and ``'lines'`` modes are meant for very large files
+        and they bypass the :func:`file_cache`.
     :returns: ``True`` on success.
     :raises reframe.core.exceptions.SanityError: if assertion fails.
+
+    .. versionchanged:: 3.12.0
+       The ``mode`` argument is added.
     '''
-    with _open(filename, 'rt', encoding=encoding) as fp:
-        return assert_found_s(
-            patt, fp.read(),
-            msg or f'pattern {patt!r} not found in {filename!r}'
-        )
+    error_msg = msg or f'pattern {patt!r} not found in {filename!r}'
+    if mode == 'text':
+        return assert_found_s(patt, _read(filename, encoding), error_msg)
+
+    if not _search(patt, filename, encoding, mode):
+        raise SanityError(_format(error_msg, patt, filename))
+
+    return True
 
 
 @deferrable
@@ -479,7 +856,8 @@ def assert_found_s(patt, string, msg=None):
 
 
 @deferrable
-def assert_not_found(patt, filename, msg=None, encoding='utf-8'):
+def assert_not_found(patt, filename, msg=None, encoding='utf-8',
+                     mode='text'):
     '''Assert that regex pattern ``patt`` is not found in the file
     ``filename``.
 
@@ -487,11 +865,18 @@ def assert_not_found(patt, filename, msg=None, encoding='utf-8'):
 
     :returns: ``True`` on success.
     :raises reframe.core.exceptions.SanityError: if assertion fails.
+
+    .. versionchanged:: 3.12.0
+       The ``mode`` argument is added.
     '''
-    with _open(filename, 'rt', encoding=encoding) as fp:
-        return assert_not_found_s(
-            patt, fp.read(), msg or f'pattern {patt!r} found in {filename!r}'
-        )
+    error_msg = msg or f'pattern {patt!r} found in {filename!r}'
+    if mode == 'text':
+        return assert_not_found_s(patt, _read(filename, encoding), error_msg)
+
+    if _search(patt, filename, encoding, mode):
+        raise SanityError(_format(error_msg, patt, filename))
+
+    return True
 
 
 @deferrable
@@ -600,16 +985,39 @@ def assert_reference(val, ref, lower_thres=None, upper_thres=None, msg=None):
 
 # Pattern matching functions
 
+def _finditer(patt, filename, encoding, mode='text'):
+    if mode == 'mmap':
+        return _finditer_mmap(patt, filename, encoding)
+    elif mode == 'lines':
+        return _finditer_lines(patt, filename, encoding)
+    elif mode != 'text':
+        raise SanityError(f'unknown file processing mode: {mode!r}')
+
+    if _file_cache is not None and isinstance(filename, (str, os.PathLike)):
+        return _file_cache.finditer(patt, filename, encoding)
+
+    return re.finditer(patt, _read(filename, encoding), re.MULTILINE)
+
+
+def _search(patt, filename, encoding, mode):
+    matches = _finditer(patt, filename, encoding, mode)
+    try:
+        return next(matches, None) is not None
+    finally:
+        # Release the file, since the iterator is not consumed
+        if inspect.isgenerator(matches):
+            matches.close()
+
+
 @deferrable
-def finditer(patt, filename, encoding='utf-8'):
+def finditer(patt, filename, encoding='utf-8', mode='text'):
     '''Get an iterator over the matches of the regex ``patt`` in ``filename``.
 
     This function is equivalent to :func:`findall()` except that it returns
     a generator object instead of a list, which you can use to iterate over
     the raw matches.
     '''
-    with _open(filename, 'rt', encoding=encoding) as fp:
-        yield from re.finditer(patt, fp.read(), re.MULTILINE)
+    yield from _finditer(patt, filename, encoding, mode)
 
 
 @deferrable
@@ -626,7 +1034,7 @@ def finditer_s(patt, string):
 
 
 @deferrable
-def findall(patt, filename, encoding='utf-8'):
+def findall(patt, filename, encoding='utf-8', mode='text'):
     '''Get all matches of regex ``patt`` in ``filename``.
 
     :arg patt: The regex pattern to search.
@@ -638,12 +1046,18 @@ def findall(patt, filename, encoding='utf-8'):
         is set for the pattern search.
     :arg filename: The name of the file to examine.
     :arg encoding: The name of the encoding used to decode the file.
+    :arg mode: as in :func:`assert_found`.
     :returns: A list of raw `regex match objects
         <https://docs.python.org/3/library/re.html#match-objects>`_.
+        In ``'mmap'`` mode, the match objects do not provide the
+        :attr:`string`, :attr:`pos` and :attr:`endpos` attributes.
     :raises reframe.core.exceptions.SanityError: In case an :class:`OSError` is
         raised while processing ``filename``.
+
+    .. versionchanged:: 3.12.0
+       The ``mode`` argument is added.
     '''
-    return list(evaluate(x) for x in finditer(patt, filename, encoding))
+    return list(evaluate(x) for x in finditer(patt, filename, encoding, mode))
 
 
 @deferrable
@@ -674,12 +1088,12 @@ def _callable_name(fn):
     return fn_name
 
 
-def _extractiter_singletag(patt, string, tag, conv):
+def _extractiter_singletag(patt, matches, tag, conv):
     if isinstance(conv, collections.abc.Iterable):
         raise SanityError(f'multiple conversion functions given for the '
                           f'single capturing group {tag!r}')
 
-    for m in finditer_s(patt, string):
+    for m in matches:
         try:
             val = m.group(tag)
         except (IndexError, KeyError):
@@ -694,8 +1108,8 @@ def _extractiter_singletag(patt, string, tag, conv):
             )
 
 
-def _extractiter_multitag(patt, string, tags, conv):
-    for m in finditer_s(patt, string):
+def _extractiter_multitag(patt, matches, tags, conv):
+    for m in matches:
         val = []
         for t in tags:
             try:
@@ -723,8 +1137,16 @@ def _extractiter_multitag(patt, string, tags, conv):
         yield tuple(converted_vals)
 
 
+def _extractiter(patt, matches, tag, conv):
+    if isinstance(tag, collections.abc.Iterable) and not isinstance(tag, str):
+        yield from _extractiter_multitag(patt, matches, tag, conv)
+    else:
+        yield from _extractiter_singletag(patt, matches, tag, conv)
+
+
 @deferrable
-def extractiter(patt, filename, tag=0, conv=None, encoding='utf-8'):
+def extractiter(patt, filename, tag=0, conv=None, encoding='utf-8',
+                mode='text'):
     '''Get an iterator over the values extracted from the capturing group
     ``tag`` of a matching regex ``patt`` in the file ``filename``.
 
@@ -732,8 +1154,8 @@ def extractiter(patt, filename, tag=0, conv=None, encoding='utf-8'):
     a generator object, instead of a list, which you can use to iterate over
     the extracted values.
     '''
-    with _open(filename, 'rt', encoding=encoding) as fp:
-        yield from extractiter_s(patt, fp.read(), tag, conv)
+    yield from _extractiter(patt, _finditer(patt, filename, encoding, mode),
+                            tag, conv)
 
 
 @deferrable
@@ -747,14 +1169,12 @@ def extractiter_s(patt, string, tag=0, conv=None):
 
     .. versionadded:: 3.4.1
     '''
-    if isinstance(tag, collections.abc.Iterable) and not isinstance(tag, str):
-        yield from _extractiter_multitag(patt, string, tag, conv)
-    else:
-        yield from _extractiter_singletag(patt, string, tag, conv)
+    yield from _extractiter(patt, finditer_s(patt, string), tag, conv)
 
 
 @deferrable
-def extractall(patt, filename, tag=0, conv=None, encoding='utf-8'):
+def extractall(patt, filename, tag=0, conv=None, encoding='utf-8',
+               mode='text'):
     '''Extract all values from the capturing group ``tag`` of a matching regex
     ``patt`` in the file ``filename``.
 
@@ -781,6 +1201,7 @@ def extractall(patt, filename, tag=0, conv=None, encoding='utf-8'):
         If more conversion functions are supplied than the corresponding
         capturing groups in ``tag``, the last conversion function will be used
         for the additional capturing groups.
+    :arg mode: as in :func:`assert_found`.
     :returns: A list of tuples of converted values extracted from the
          capturing groups specified in ``tag``, if ``tag`` is an iterable.
          Otherwise, a list of the converted values extracted from the single
@@ -790,9 +1211,14 @@ def extractall(patt, filename, tag=0, conv=None, encoding='utf-8'):
     .. versionchanged:: 3.1
         Multiple regex capturing groups are now supporetd via ``tag`` and
         multiple conversion functions can be used in ``conv``.
+
+    .. versionchanged:: 3.12.0
+       The ``mode`` argument is added.
     '''
-    return list(evaluate(x)
-                for x in extractiter(patt, filename, tag, conv, encoding))
+    return list(
+        evaluate(x)
+        for x in extractiter(patt, filename, tag, conv, encoding, mode)
+    )
 
 
 @deferrable
@@ -812,7 +1238,8 @@ def extractall_s(patt, string, tag=0, conv=None):
 
 
 @deferrable
-def extractsingle(patt, filename, tag=0, conv=None, item=0, encoding='utf-8'):
+def extractsingle(patt, filename, tag=0, conv=None, item=0, encoding='utf-8',
+                  mode='text'):
     '''Extract a single value from the capturing group ``tag`` of a matching
     regex ``patt`` in the file ``filename``.
 
@@ -826,15 +1253,20 @@ def extractsingle(patt, filename, tag=0, conv=None, item=0, encoding='utf-8'):
     :arg tag: as in :func:`extractall`.
     :arg conv: as in :func:`extractall`.
     :arg item: the specific element to extract.
+    :arg mode: as in :func:`extractall`.
     :returns: The extracted value.
     :raises reframe.core.exceptions.SanityError: In case of errors.
 
+    .. versionchanged:: 3.12.0
+       The ``mode`` argument is added.
     '''
     try:
         # Explicitly evaluate the expression here, so as to force any exception
         # to be thrown in this context and not during the evaluation of an
         # expression containing this one.
-        return evaluate(extractall(patt, filename, tag, conv, encoding)[item])
+        return evaluate(
+            extractall(patt, filename, tag, conv, encoding, mode)[item]
+        )
     except IndexError:
         raise SanityError(
             f'not enough matches of pattern {patt!r} in file {filename!r} '
@@ -873,11 +1305,193 @@ def extractsingle_s(patt, string, tag=0, conv=None, item=0):
         )
 
 
+# The typecodes of the numeric arrays and the conversion of their elements
+_ARRAY_TYPECODES = {
+    **{t: builtins.int for t in 'bBhHiIlLqQ'},
+    **{t: builtins.float for t in 'fd'}
+}
+
+
+def _extractarray(patt, matches, tag, typecode):
+    try:
+        conv = _ARRAY_TYPECODES[typecode]
+    except KeyError:
+        raise ValueError(f'invalid array typecode: {typecode!r}') from None
+
+    # Extract and convert the values without calling back into Python for
+    # every match
+    values = builtins.map(
+        conv, builtins.map(operator.methodcaller('group', tag), matches)
+    )
+    try:
+        numpy = _numpy()
+        if numpy is None:
+            return array.array(typecode, values)
+        else:
+            return numpy.fromiter(values, dtype=typecode)
+    except (IndexError, KeyError):
+        raise SanityError(
+            f'no such group in pattern {patt!r}: {tag}'
+        ) from None
+    except (TypeError, ValueError, OverflowError) as err:
+        raise SanityError(
+            f'could not convert the extracted values using '
+            f'{conv.__name__}(): {err}'
+        ) from None
+
+
+@deferrable
+def extractarray(patt, filename, tag=0, typecode='d', encoding='utf-8',
+                 mode='text'):
+    '''Extract all values from the capturing group ``tag`` of a matching
+    regex ``patt`` in the file ``filename`` into a numeric array.
+
+    This function is equivalent to :func:`extractall` with a numeric
+    conversion function, except that the values are stored in a compact
+    array instead of a list of Python objects. This makes it suitable for
+    extracting large amounts of numeric samples.
+
+    :arg patt: as in :func:`extractall`.
+    :arg filename: as in :func:`extractall`.
+    :arg tag: The single regex capturing group to be extracted.
+    :arg typecode: The type of the array elements as in the :mod:`array`
+        module. Only integer and floating point types are allowed.
+    :arg encoding: as in :func:`extractall`.
+    :arg mode: as in :func:`extractall`.
+    :returns: A NumPy array if NumPy is available, otherwise an
+        :class:`array.array`.
+    :raises reframe.core.exceptions.SanityError: In case of errors.
+
+    .. versionadded:: 3.12.0
+    '''
+    return _extractarray(patt, _finditer(patt, filename, encoding, mode),
+                         tag, typecode)
+
+
+@deferrable
+def extractarray_s(patt, string, tag=0, typecode='d'):
+    '''Extract all values from the capturing group ``tag`` of a matching
+    regex ``patt`` in ``string`` into a numeric array.
+
+    :arg patt: as in :func:`extractarray`.
+    :arg string: The string to examine.
+    :arg tag: as in :func:`extractarray`.
+    :arg typecode: as in :func:`extractarray`.
+    :returns: same as :func:`extractarray`.
+
+    .. versionadded:: 3.12.0
+    '''
+    return _extractarray(patt, re.finditer(patt, string, re.MULTILINE),
+                         tag, typecode)
+
+
+# The pattern matching functions that are batched by `batch_patterns()`
+# along with their signatures
+_PATTERN_FUNCTIONS = {
+    fn.__wrapped__: inspect.signature(fn.__wrapped__)
+    for fn in (extractall, extractarray, extractiter, extractsingle,
+               findall, finditer)
+}
+
+
+def _add_pattern(expr):
+    try:
+        args = _PATTERN_FUNCTIONS[expr._fn].bind(*expr._args, **expr._kwargs)
+        args.apply_defaults()
+        patt, filename, encoding, mode = (
+            evaluate(args.arguments[name])
+            for name in ('patt', 'filename', 'encoding', 'mode')
+        )
+    except Exception:
+        # Any error will be raised when the expression is evaluated
+        return
+
+    if mode == 'text' and isinstance(filename, (str, os.PathLike)):
+        _file_cache.add_pattern(patt, filename, encoding)
+
+
+def batch_patterns(*exprs):
+    '''Match the patterns searched in the same file by ``exprs`` in a single
+    scan of the file.
+
+    All the calls to :func:`extractall`, :func:`extractiter`,
+    :func:`extractsingle`, :func:`findall` and :func:`finditer` contained in
+    the deferred expressions ``exprs`` are gathered without being evaluated.
+    As soon as the first of them is evaluated, all the patterns searched in
+    its file are matched in a single scan and the rest of the calls simply
+    retrieve their matches.
+    The deferred expressions returned by performance functions are looked up,
+    too.
+
+    This function has an effect only inside a :func:`file_cache` context.
+    The framework batches the performance variables of a test.
+
+    .. versionadded:: 3.12.0
+    '''
+    if _file_cache is None:
+        return
+
+    visited = builtins.set()
+    pending = list(exprs)
+    while pending:
+        expr = pending.pop()
+        if builtins.id(expr) in visited:
+            continue
+
+        if isinstance(expr, _DeferredExpression):
+            visited.add(builtins.id(expr))
+            if expr._fn in _PATTERN_FUNCTIONS:
+                _add_pattern(expr)
+            elif (isinstance(expr, _DeferredPerformanceExpression) and
+                  builtins.getattr(expr._fn, '__module__', None) != __name__):
+                try:
+                    pending.append(expr._expand())
+                except Exception:
+                    # The error will be raised when the expression is
+                    # evaluated
+                    pass
+
+            pending.extend(expr._args)
+            pending.extend(expr._kwargs.values())
+        elif isinstance(expr, (list, tuple, builtins.set)):
+            visited.add(builtins.id(expr))
+            pending.extend(expr)
+        elif isinstance(expr, dict):
+            visited.add(builtins.id(expr))
+            pending.extend(expr.values())
+
+
 # Numeric functions
 
+def _numeric_values(iterable):
+    '''Return ``iterable`` as a sequence that supports fast iteration.'''
+
+    if (isinstance(iterable, (array.array, list, tuple)) or
+        _is_ndarray(iterable)):
+        return iterable
+
+    return list(iterable)
+
+
 @deferrable
 def avg(iterable):
-    '''Return the average of all the elements of ``iterable``.'''
+    '''Return the average of all the elements of ``iterable``.
+
+    .. versionchanged:: 3.12.0
+       Arrays returned by :func:`extractarray` are averaged without iterating
+       over their elements in Python.
+    '''
+    if _is_ndarray(iterable):
+        if iterable.size == 0:
+            raise SanityError('attempt to get average on an empty container')
+
+        return iterable.mean().item()
+
+    if isinstance(iterable, (array.array, list, tuple)):
+        if not iterable:
+            raise SanityError('attempt to get average on an empty container')
+
+        return builtins.sum(iterable) / builtins.len(iterable)
 
     # We walk over the iterable manually in case this is a generator
     total = 0
@@ -891,6 +1505,73 @@ def avg(iterable):
     return total / num_vals
 
 
+@deferrable
+def stddev(iterable, ddof=0):
+    '''Return the standard deviation of all the elements of ``iterable``.
+
+    :arg iterable: The values, e.g., the array returned by
+        :func:`extractarray`.
+    :arg ddof: The delta degrees of freedom; the sum of the squared
+        deviations is divided by ``N - ddof``, where ``N`` is the number of
+        values. Use ``ddof=1`` for the sample standard deviation.
+    :returns: The standard deviation as a :class:`float`.
+    :raises reframe.core.exceptions.SanityError: If there are not more than
+        ``ddof`` values.
+
+    .. versionadded:: 3.12.0
+    '''
+    values = _numeric_values(iterable)
+    num_vals = builtins.len(values)
+    if num_vals <= ddof:
+        raise SanityError(f'attempt to get standard deviation of '
+                          f'{num_vals} value(s) with ddof={ddof}')
+
+    if _is_ndarray(values):
+        return values.std(ddof=ddof).item()
+
+    mean = math.fsum(values) / num_vals
+    deviations = builtins.map(operator.sub, values, itertools.repeat(mean))
+    sum_squares = math.fsum(builtins.map(operator.pow, deviations,
+                                         itertools.repeat(2)))
+    return math.sqrt(sum_squares / (num_vals - ddof))
+
+
+@deferrable
+def percentile(iterable, q):
+    '''Return the ``q``-th percentile of all the elements of ``iterable``.
+
+    The percentile is computed by linear interpolation between the closest
+    ranks, as the default method of :func:`numpy.percentile`.
+
+    :arg iterable: The values, e.g., the array returned by
+        :func:`extractarray`.
+    :arg q: The percentile to compute in the range ``[0, 100]``; use ``50``
+        for the median.
+    :returns: The percentile as a :class:`float`.
+    :raises reframe.core.exceptions.SanityError: If ``iterable`` is empty or
+        ``q`` is out of range.
+
+    .. versionadded:: 3.12.0
+    '''
+    if q < 0 or q > 100:
+        raise SanityError(f'percentile out of range: {q}')
+
+    values = _numeric_values(iterable)
+    if builtins.len(values) == 0:
+        raise SanityError('attempt to get percentile on an empty container')
+
+    if _is_ndarray(values):
+        return builtins.float(_numpy().percentile(values, q))
+
+    values = builtins.sorted(values)
+    rank = (builtins.len(values) - 1) * q / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    return builtins.float(
+        values[lower] + (values[upper] - values[lower]) * (rank - lower)
+    )
+
+
 # Other utility functions
 
 @deferrable
@@ -91,9 +91,20 @@ In the above example :class:`T` may refer to any type, so that
 :class:`List[List[int]]` is an instance of :class:`List`, but not an instance
 of :class:`List[int]`.
 
+The aggregate types are created once for each element type, so that
+``List[int] is List[int]``.
+
+Type checking a large collection is expensive, since all of its elements need
+to be checked. The lists and dictionaries returned by :func:`checked` remember
+the aggregate types that they have been found to be instances of, so that they
+are type checked only once. If such a container is modified, only the newly
+inserted elements are type checked. If any of them does not match an
+aggregate type, the container will be fully type checked again next time.
+
 '''
 
 import abc
+import copy
 import re
 
 
@@ -166,6 +177,7 @@ class _SequenceType(_BuiltinType):
         cls._elem_type = None
         cls._bases = bases
         cls._namespace = namespace
+        cls._subtypes = {}
 
     def __instancecheck__(cls, inst):
         if not issubclass(type(inst), cls):
@@ -174,7 +186,17 @@ class _SequenceType(_BuiltinType):
         if cls._elem_type is None:
             return True
 
-        return all(isinstance(c, cls._elem_type) for c in inst)
+        checked_types = getattr(inst, '_rfm_checked_types', None)
+        if checked_types is not None and cls in checked_types:
+            return True
+
+        if not all(isinstance(c, cls._elem_type) for c in inst):
+            return False
+
+        if checked_types is not None and _is_stable(cls._elem_type):
+            checked_types.add(cls)
+
+        return True
 
     def __getitem__(cls, elem_type):
         if not isinstance(elem_type, type):
@@ -184,16 +206,22 @@ class _SequenceType(_BuiltinType):
             raise TypeError('invalid type specification for container type: '
                             'expected ContainerType[elem_type]')
 
+        try:
+            return cls._subtypes[elem_type]
+        except KeyError:
+            pass
+
         ret = _SequenceType('%s[%s]' % (cls.__name__, elem_type.__name__),
                             cls._bases, cls._namespace)
         ret._elem_type = elem_type
         cls.register(ret)
+        cls._subtypes[elem_type] = ret
         return ret
 
     def __rfm_cast_str__(cls, s):
         container_type = cls._type
         elem_type = cls._elem_type
-        return container_type(elem_type(e) for e in s.split(','))
+        return checked(container_type(elem_type(e) for e in s.split(',')))
 
 
 class _TupleType(_SequenceType):
@@ -228,12 +256,18 @@ class _TupleType(_SequenceType):
             if not isinstance(t, type):
                 raise TypeError('{0} is not a valid type'.format(t))
 
+        try:
+            return cls._subtypes[elem_types]
+        except KeyError:
+            pass
+
         cls_name = '%s[%s]' % (
             cls.__name__, ','.join(c.__name__ for c in elem_types)
         )
         ret = _TupleType(cls_name, cls._bases, cls._namespace)
         ret._elem_type = elem_types
         cls.register(ret)
+        cls._subtypes[elem_types] = ret
         return ret
 
     def __rfm_cast_str__(cls, s):
@@ -260,6 +294,7 @@ class _MappingType(_BuiltinType):
         cls._value_type = None
         cls._bases = bases
         cls._namespace = namespace
+        cls._subtypes = {}
 
     def __instancecheck__(cls, inst):
         if not issubclass(type(inst), cls):
@@ -269,11 +304,22 @@ class _MappingType(_BuiltinType):
             return True
 
         assert cls._key_type is not None and cls._value_type is not None
+        checked_types = getattr(inst, '_rfm_checked_types', None)
+        if checked_types is not None and cls in checked_types:
+            return True
+
         has_valid_keys = all(isinstance(k, cls._key_type)
                              for k in inst.keys())
         has_valid_values = all(isinstance(v, cls._value_type)
                                for v in inst.values())
-        return has_valid_keys and has_valid_values
+        if not (has_valid_keys and has_valid_values):
+            return False
+
+        if (checked_types is not None and
+            _is_stable(cls._key_type) and _is_stable(cls._value_type)):
+            checked_types.add(cls)
+
+        return True
 
     def __getitem__(cls, typespec):
         try:
@@ -287,12 +333,18 @@ class _MappingType(_BuiltinType):
             if not isinstance(t, type):
                 raise TypeError('{0} is not a valid type'.format(t))
 
+        try:
+            return cls._subtypes[key_type, value_type]
+        except KeyError:
+            pass
+
         cls_name = '%s[%s,%s]' % (cls.__name__, key_type.__name__,
                                   value_type.__name__)
         ret = _MappingType(cls_name, cls._bases, cls._namespace)
         ret._key_type = key_type
         ret._value_type = value_type
         cls.register(ret)
+        cls._subtypes[key_type, value_type] = ret
         return ret
 
     def __rfm_cast_str__(cls, s):
@@ -311,7 +363,7 @@ class _MappingType(_BuiltinType):
 
             seq.append((key_type(k), value_type(v)))
 
-        return mappping_type(seq)
+        return checked(mappping_type(seq))
 
 
 class _StrType(_SequenceType):
@@ -332,10 +384,16 @@ class _StrType(_SequenceType):
             raise TypeError('invalid type specification for string type: '
                             'expected _StrType[regex]')
 
+        try:
+            return cls._subtypes[patt]
+        except KeyError:
+            pass
+
         ret = _StrType("%s[r'%s']" % (cls.__name__, patt),
                        cls._bases, cls._namespace)
         ret._elem_type = patt
         cls.register(ret)
+        cls._subtypes[patt] = ret
         return ret
 
     def __rfm_cast_str__(cls, s):
@@ -389,3 +447,151 @@ class Str(metaclass=_StrType):
 
 class Tuple(metaclass=_TupleType):
     _type = tuple
+
+
+# Containers that remember the aggregate types that they have been checked
+# against
+
+def _is_stable(typ):
+    # Check if `isinstance(x, typ)` can change only if `x` is replaced; this
+    # is not the case for the aggregate types, whose elements may be
+    # modified in place, except for the string types
+    return (not isinstance(typ, (_SequenceType, _MappingType)) or
+            isinstance(typ, _StrType))
+
+
+class _CheckedList(list):
+    __slots__ = ('_rfm_checked_types',)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._rfm_checked_types = set()
+
+    def _check_new(self, items):
+        self._rfm_checked_types = {
+            t for t in self._rfm_checked_types if isinstance(items, t)
+        }
+
+    def append(self, item):
+        if self._rfm_checked_types:
+            self._check_new([item])
+
+        super().append(item)
+
+    def extend(self, items):
+        if self._rfm_checked_types:
+            items = list(items)
+            self._check_new(items)
+
+        super().extend(items)
+
+    def insert(self, index, item):
+        if self._rfm_checked_types:
+            self._check_new([item])
+
+        super().insert(index, item)
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def __setitem__(self, key, value):
+        if self._rfm_checked_types:
+            if isinstance(key, slice):
+                value = list(value)
+                self._check_new(value)
+            else:
+                self._check_new([value])
+
+        super().__setitem__(key, value)
+
+    def __copy__(self):
+        ret = type(self)(self)
+        ret._rfm_checked_types = set(self._rfm_checked_types)
+        return ret
+
+    def __deepcopy__(self, memo):
+        ret = type(self)()
+        memo[id(self)] = ret
+        ret.extend(copy.deepcopy(item, memo) for item in self)
+        ret._rfm_checked_types = set(self._rfm_checked_types)
+        return ret
+
+    def __reduce_ex__(self, protocol):
+        # The aggregate types are not picklable
+        return (type(self), (list(self),))
+
+
+class _CheckedDict(dict):
+    __slots__ = ('_rfm_checked_types',)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._rfm_checked_types = set()
+
+    def _check_new(self, items):
+        self._rfm_checked_types = {
+            t for t in self._rfm_checked_types if isinstance(items, t)
+        }
+
+    def __setitem__(self, key, value):
+        if self._rfm_checked_types:
+            self._check_new({key: value})
+
+        super().__setitem__(key, value)
+
+    def setdefault(self, key, default=None):
+        if self._rfm_checked_types and key not in self:
+            self._check_new({key: default})
+
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        if self._rfm_checked_types:
+            items = dict(*args, **kwargs)
+            self._check_new(items)
+            super().update(items)
+        else:
+            super().update(*args, **kwargs)
+
+    if hasattr(dict, '__ior__'):
+        def __ior__(self, other):
+            self.update(other)
+            return self
+
+    def __copy__(self):
+        ret = type(self)(self)
+        ret._rfm_checked_types = set(self._rfm_checked_types)
+        return ret
+
+    def __deepcopy__(self, memo):
+        ret = type(self)()
+        memo[id(self)] = ret
+        ret.update((copy.deepcopy(k, memo), copy.deepcopy(v, memo))
+                   for k, v in self.items())
+        ret._rfm_checked_types = set(self._rfm_checked_types)
+        return ret
+
+    def __reduce_ex__(self, protocol):
+        # The aggregate types are not picklable
+        return (type(self), (dict(self),))
+
+
+def checked(value):
+    '''Return a copy of the container ``value`` that remembers the aggregate
+    types that it is an instance of.
+
+    The copy is a subclass of the type of ``value`` and can be used in its
+    place. Only :class:`list` and :class:`dict` containers are supported;
+    any other value is returned unchanged.
+
+    .. versionadded:: 3.12.0
+
+    '''
+
+    if type(value) is list:
+        return _CheckedList(value)
+    elif type(value) is dict:
+        return _CheckedDict(value)
+    else:
+        return value
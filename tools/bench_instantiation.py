@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+#
+# Copyright 2016-2022 Swiss National Supercomputing Centre (CSCS/ETH Zurich)
+# ReFrame Project Developers. See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+#
+# Micro-benchmark of the instantiation cost of the test variants and of the
+# attribute access on the tests and on their classes
+#
+# Usage: PYTHONPATH=. ./tools/bench_instantiation.py [NUM_VARIANTS]
+#
+
+import os
+import sys
+import time
+
+import reframe
+import reframe.core.config as config
+import reframe.core.runtime as rt
+from reframe.core.builtins import parameter, run_after, run_before, variable
+
+
+def make_test(num_variants):
+    class BenchTest(reframe.RunOnlyRegressionTest):
+        p = parameter(range(num_variants))
+        valid_systems = ['*']
+        valid_prog_environs = ['*']
+        executable = 'echo'
+        executable_opts = ['-n', 'hello']
+        modules = ['foo', 'bar']
+        env_vars = {f'VAR{i}': str(i) for i in range(10)}
+        reference = {
+            f'sys{i}': {
+                f'perf{j}': (1.0, -0.1, 0.1, 'GB/s') for j in range(10)
+            } for i in range(10)
+        }
+        extra_opts = variable(list, value=list(range(100)))
+
+        @run_after('init')
+        def set_descr(self):
+            self.descr = f'variant {self.p}'
+
+        @run_before('run')
+        def set_opts(self):
+            self.executable_opts += ['world']
+
+    return BenchTest
+
+
+def main():
+    num_variants = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    site_config = config.load_config(
+        os.path.join(reframe.INSTALL_PREFIX, 'reframe/core/settings.py')
+    )
+    site_config.select_subconfig('generic')
+    rt.init_runtime(site_config)
+
+    test = make_test(num_variants)
+
+    # Warm up any per-class caches
+    test(variant_num=0)
+
+    start = time.time()
+    for i in range(num_variants):
+        test(variant_num=i)
+
+    elapsed = time.time() - start
+    print(f'instantiated {num_variants} variants in {elapsed:.3f} s '
+          f'({elapsed / num_variants * 1e6:.1f} us/variant)')
+
+    # Attribute reads as done by the hooks, the sanity functions and the
+    # logging machinery
+    obj = test(variant_num=0)
+    num_reads = 100 * num_variants
+    start = time.time()
+    for _ in range(num_reads // 10):
+        obj.executable
+        obj.executable_opts
+        obj.env_vars
+        obj.p
+        obj.name
+        obj.setup
+        obj._current_partition
+        obj._stagedir
+        obj.num_tasks
+        obj.descr
+
+    elapsed = time.time() - start
+    print(f'read {num_reads} test attributes in {elapsed:.3f} s '
+          f'({elapsed / num_reads * 1e9:.1f} ns/read)')
+
+    start = time.time()
+    for _ in range(num_reads // 10):
+        test.num_variants
+        test.variant_name
+        test.param_space
+        test._rfm_var_space
+        test._rfm_param_space
+        test._rfm_fixture_space
+        test.pipeline_hooks
+        test.setup
+        test.executable
+        test.valid_systems
+
+    elapsed = time.time() - start
+    print(f'read {num_reads} class attributes in {elapsed:.3f} s '
+          f'({elapsed / num_reads * 1e9:.1f} ns/read)')
+
+
+if __name__ == '__main__':
+    main()
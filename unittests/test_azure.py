@@ -0,0 +1,132 @@
+# Copyright 2016-2022 Swiss National Supercomputing Centre (CSCS/ETH Zurich)
+# ReFrame Project Developers. See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import json
+import os
+import pytest
+
+import reframe.core.azure as azure
+import reframe.utility.osext as osext
+
+
+@pytest.fixture
+def vm_data_file(tmp_path):
+    vms = {
+        'Basic_A0': {
+            'series': 'a', 'size': 'A0', 'tier': 'Basic',
+            'capabilities': {'vCPUs': '1'}
+        },
+        'Standard_A0': {'series': 'a', 'size': 'A0', 'tier': 'Standard'},
+        'Standard_HB120rs_v2': {
+            'series': 'hbrs_v2', 'size': 'HB120rs_v2',
+            'nhc_values': {'ib_count': 1}
+        }
+    }
+    dataset = tmp_path / 'vms.json'
+    with open(dataset, 'w') as fp:
+        json.dump(vms, fp, indent=4)
+
+    yield str(dataset)
+    azure._vm_index.cache_clear()
+
+
+def test_read_vm_data_file(vm_data_file):
+    vm = azure.read_vm_data_file('HBrs_v2', vm_data_file, 'HB120rs_v2',
+                                 'almalinux', '8_7-hpc-gen2', 'img')
+    assert vm == {
+        'series': 'hbrs_v2',
+        'size': 'HB120rs_v2',
+        'nhc_values': {'ib_count': 1},
+        'vm_series': 'hbrs_v2',
+        'vm_size': 'HB120rs_v2',
+        'vm_os': 'almalinux',
+        'vm_os_version': '8_7-hpc-gen2',
+        'vm_image': 'img',
+        'cloud_provider': 'azure'
+    }
+
+    # The first VM of the dataset wins
+    vm = azure.read_vm_data_file('a', vm_data_file, 'A0')
+    assert vm['capabilities'] == {'vCPUs': '1'}
+    assert 'tier' not in vm
+    assert azure.read_vm_data_file('a', vm_data_file, 'A1') == {}
+
+    # Lookups do not share their data
+    vm = azure.read_vm_data_file('hbrs_v2', vm_data_file, 'HB120rs_v2')
+    vm['nhc_values']['ib_count'] = 0
+    vm = azure.read_vm_data_file('hbrs_v2', vm_data_file, 'HB120rs_v2')
+    assert vm['nhc_values']['ib_count'] == 1
+
+
+def test_read_vm_data_file_once(vm_data_file, monkeypatch):
+    assert azure.read_vm_data_file('a', vm_data_file, 'A0')
+
+    # The index is not read again
+    monkeypatch.setattr(azure.json, 'load', None)
+    assert azure.read_vm_data_file('a', vm_data_file, 'A0')
+
+
+def test_vm_index_file(vm_data_file, monkeypatch):
+    index_file = azure._vm_index_file(vm_data_file)
+    assert index_file.endswith('vms.index.json')
+    assert azure.read_vm_data_file('a', vm_data_file, 'A0')
+    with open(index_file) as fp:
+        index = json.load(fp)
+
+    assert index['fields'] == azure._VM_INDEX_FIELDS
+    assert sorted(index['vms']) == ['a/A0', 'hbrs_v2/HB120rs_v2']
+
+    # The dataset is not read if the index is up to date
+    def _build_vm_index(vm_data_file):
+        pytest.fail('the VM dataset was read')
+
+    azure._vm_index.cache_clear()
+    with monkeypatch.context() as m:
+        m.setattr(azure, '_build_vm_index', _build_vm_index)
+        assert azure.read_vm_data_file('a', vm_data_file, 'A0')
+
+    # A stale index is rebuilt
+    with open(vm_data_file, 'w') as fp:
+        json.dump({'Standard_A1': {'series': 'a', 'size': 'A1'}}, fp)
+
+    stat = os.stat(index_file)
+    os.utime(vm_data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    azure._vm_index.cache_clear()
+    assert azure.read_vm_data_file('a', vm_data_file, 'A0') == {}
+    assert azure.read_vm_data_file('a', vm_data_file, 'A1')
+    with open(index_file) as fp:
+        assert list(json.load(fp)['vms']) == ['a/A1']
+
+
+def test_imds_cache(tmp_path, monkeypatch):
+    cache_file = str(tmp_path / 'imds.json')
+    monkeypatch.setattr(azure, '_imds_cache_file', lambda: cache_file)
+    queries = []
+    run_command = osext.run_command
+
+    def _run_command(cmd, *args, **kwargs):
+        queries.append(cmd)
+        return run_command(
+            'echo \'{"compute": {"vmSize": "Standard_HB120rs_v2"}}\''
+        )
+
+    monkeypatch.setattr(azure.util.osext, 'run_command', _run_command)
+    metadata = {'compute': {'vmSize': 'Standard_HB120rs_v2'}}
+    assert azure._query_imds() == metadata
+    assert azure._query_imds() == metadata
+    assert len(queries) == 1
+
+    # Expired entries are ignored
+    monkeypatch.setattr(azure, '_IMDS_CACHE_TTL', 0)
+    assert azure._query_imds() == metadata
+    assert len(queries) == 2
+
+    # Entries of another boot are ignored
+    monkeypatch.setattr(azure, '_IMDS_CACHE_TTL', 3600)
+    monkeypatch.setattr(azure, '_boot_id', lambda: 'another-boot')
+    assert azure._query_imds() == metadata
+    assert len(queries) == 3
+    assert azure._query_imds() == metadata
+    assert len(queries) == 3
@@ -180,6 +180,23 @@ def test_check_restore_session_succeeded_test(run_reframe, tmp_path):
     assert restored == {'T4', 'T5'}
 
 
+def test_check_restore_session_compressed(run_reframe, tmp_path):
+    run_reframe(
+        checkpath=['unittests/resources/checks_unlisted/deps_complex.py'],
+        more_options=['--keep-stage-files', '--compress-output=gzip']
+    )
+    returncode, stdout, _ = run_reframe(
+        checkpath=[],
+        more_options=[
+            f'--restore-session={tmp_path}/report.json', '-n', 'T1'
+        ]
+    )
+    report = runreport.load_report(f'{tmp_path}/report.json')
+    assert report['runs'][-1]['num_cases'] == 1
+    restored = {r['name'] for r in report['restored_cases']}
+    assert restored == {'T4', 'T5'}
+
+
 def test_check_restore_session_check_search_path(run_reframe, tmp_path):
     run_reframe(
         checkpath=['unittests/resources/checks_unlisted/deps_complex.py']
@@ -195,6 +212,38 @@ def test_check_restore_session_check_search_path(run_reframe, tmp_path):
     assert 'Found 0 check(s)' in stdout
 
 
+def test_check_build_cache(run_reframe, tmp_path):
+    for _ in range(2):
+        returncode, stdout, _ = run_reframe(
+            more_options=[f'--build-cache-dir={tmp_path}/cache']
+        )
+        assert 'PASSED' in stdout
+        assert 'FAILED' not in stdout
+        assert returncode == 0
+
+    assert os.listdir(tmp_path / 'cache')
+
+
+def test_check_share_builds(run_reframe):
+    returncode, stdout, _ = run_reframe(
+        more_options=['--share-builds', '--repeat=3', '-n', '^HelloTest',
+                      '-S', 'executable=./hello']
+    )
+    assert 'Ran 3/3 test case(s)' in stdout
+    assert 'FAILED' not in stdout
+    assert 'builds are not shared' not in stdout
+    assert returncode == 0
+
+
+def test_check_share_builds_serial(run_reframe):
+    returncode, stdout, _ = run_reframe(
+        more_options=['--share-builds', '--exec-policy=serial',
+                      '-n', '^HelloTest', '-S', 'executable=./hello']
+    )
+    assert 'builds are not shared with the serial execution policy' in stdout
+    assert returncode == 0
+
+
 def test_check_success_force_local(run_reframe, tmp_path):
     # We explicitly use a system here with a non-local scheduler and pass the
     # `--force-local` option
@@ -586,6 +635,21 @@ def test_filtering_multiple_criteria(run_reframe):
     assert returncode == 0
 
 
+def test_filtering_by_param(run_reframe):
+    returncode, stdout, stderr = run_reframe(
+        system='sys0',
+        checkpath=['unittests/resources/checks_unlisted/deps_simple.py'],
+        environs=[],
+        action='list',
+        more_options=['--param', 'kind=fully$']
+    )
+    assert 'Traceback' not in stdout
+    assert 'Traceback' not in stderr
+    assert '- Test1 %kind=fully' in stdout
+    assert 'Found 2 check(s)' in stdout
+    assert returncode == 0
+
+
 def test_show_config_all(run_reframe):
     # Just make sure that this option does not make the frontend crash
     returncode, stdout, stderr = run_reframe(
@@ -338,6 +338,80 @@ def test_sticky_options():
     assert site_config.get('environments/@PrgEnv-cray/cc') == 'cc'
 
 
+def test_memoized_options():
+    site_config = config.load_config('unittests/resources/settings.py')
+    site_config.select_subconfig('testsys:login')
+    partitions = site_config.get('systems/0/partitions')
+    assert site_config.get('systems/0/partitions') is partitions
+    assert site_config.get('systems/0/partitions/0/name') == 'login'
+    assert site_config.get('systems/0/partitions/0/name/') == 'login'
+    assert site_config.get('systems/0/foo') is None
+    assert site_config.get('systems/0/foo', 'bar') == 'bar'
+    assert site_config.get('/systems/0/foo', 'bar') == 'bar'
+
+    # Selecting another configuration invalidates the memoized values
+    site_config.select_subconfig('testsys:gpu')
+    assert site_config.get('systems/0/partitions/0/name') == 'gpu'
+    assert site_config.get('general/0/pipeline_timeout') is None
+
+    # So does changing the sticky options
+    site_config.add_sticky_option('general/pipeline_timeout', 1)
+    assert site_config.get('general/0/pipeline_timeout') == 1
+    site_config.remove_sticky_option('general/pipeline_timeout')
+    assert site_config.get('general/0/pipeline_timeout') is None
+
+
+def test_config_cache(tmp_path, monkeypatch):
+    site_config = config.load_config('unittests/resources/settings.py')
+    site_config.set_cache_dir(tmp_path)
+    site_config.validate()
+    site_config.select_subconfig('testsys:gpu')
+    site_config.validate()
+    expected = json.loads(str(site_config))
+    cache_dir, = tmp_path.iterdir()
+    assert {p.name for p in cache_dir.iterdir()} == {
+        'validated.json',
+        'validated.testsys:gpu.json',
+        'subconfig.testsys:gpu.json'
+    }
+
+    # Validation and resolution are skipped for the cached configuration
+    def _fail(*args, **kwargs):
+        pytest.fail('configuration was not cached')
+
+    site_config = config.load_config('unittests/resources/settings.py')
+    site_config.set_cache_dir(tmp_path)
+    with monkeypatch.context() as m:
+        m.setattr(config.jsonschema, 'validate', _fail)
+        m.setattr(config._SiteConfig, '_resolve_subconfig', _fail)
+        site_config.validate()
+        site_config.select_subconfig('testsys:gpu')
+        site_config.validate()
+
+    assert json.loads(str(site_config)) == expected
+    assert site_config.get('systems/0/partitions/0/name') == 'gpu'
+
+    # A modified configuration is cached separately
+    site_config = config.load_config('unittests/resources/settings.py')
+    for system in site_config['systems']:
+        if system['name'] == 'testsys':
+            system['descr'] = 'modified'
+
+    site_config.set_cache_dir(tmp_path)
+    site_config.select_subconfig('testsys:gpu')
+    assert site_config.get('systems/0/descr') == 'modified'
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_config_cache_disabled(tmp_path):
+    site_config = config.load_config('unittests/resources/settings.py')
+    site_config['systems'][0]['descr'] = ('not', 'json')
+    site_config.set_cache_dir(tmp_path)
+    site_config.validate = lambda: None
+    site_config.select_subconfig('testsys:gpu')
+    assert list(tmp_path.iterdir()) == []
+
+
 def test_system_create():
     site_config = config.load_config('unittests/resources/settings.py')
     site_config.select_subconfig('testsys:gpu')
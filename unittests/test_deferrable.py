@@ -75,6 +75,65 @@ def test_evaluate_cached():
     assert expr.evaluate() == 3
 
 
+def test_evaluate_shared():
+    num_calls = 0
+
+    @sn.deferrable
+    def value():
+        nonlocal num_calls
+        num_calls += 1
+        return 2
+
+    x = value()
+    expr = sn.and_(x == 2, sn.and_(x + x == 4, x * x == 4))
+    assert expr.evaluate()
+    assert num_calls == 1
+
+    # Every evaluation is independent
+    assert expr.evaluate()
+    assert num_calls == 2
+
+
+def test_evaluate_shared_iterators():
+    # Every use of an expression yielding an iterator gets a new iterator
+    it = sn.map(lambda x: 2*x, [1, 2, 3])
+    assert 12 == sn.evaluate(sn.sum(it))
+    assert 24 == sn.evaluate(sn.sum(it) + sn.sum(it))
+    assert [(2, 2), (4, 4), (6, 6)] == list(sn.evaluate(sn.zip(it, it)))
+
+
+def test_evaluate_deep():
+    expr = sn.defer(0)
+    for _ in range(10000):
+        expr += 1
+
+    assert 10000 == expr.evaluate()
+
+
+def test_evaluation_stats():
+    @sn.deferrable
+    def value():
+        return 2
+
+    x = value()
+    expr = x + x
+    with sn.evaluation_stats() as stats:
+        assert 4 == expr.evaluate()
+        with sn.evaluation_stats() as nested:
+            assert 2 == x.evaluate()
+
+    assert nested is stats
+    assert 3 == stats.nodes
+    assert 1 == stats.reused
+    assert 2 == stats.functions[value.__qualname__][0]
+    assert 1 == stats.functions['_DeferredExpression.__add__'][0]
+    assert stats.summary().startswith('3 expression(s) evaluated')
+
+    # Statistics are not collected outside the context
+    expr.evaluate()
+    assert 3 == stats.nodes
+
+
 def test_depr_warn(monkeypatch):
     monkeypatch.setattr(warnings, '_RAISE_DEPRECATION_ALWAYS', True)
     with pytest.warns(ReframeDeprecationWarning):
@@ -77,7 +77,7 @@ def find_check(name, checks):
 
 def find_case(cname, ename, partname, cases):
     for c in cases:
-        if (c.check.name == cname and
+        if (c.orig_check.name == cname and
             c.environ.name == ename and
             c.partition.name == partname):
             return c
@@ -107,6 +107,23 @@ def test_eq_hash(loader, default_exec_ctx):
     assert hash(case1) != hash(case0)
 
 
+def test_lazy_clone(loader, default_exec_ctx):
+    cases = executors.generate_testcases(loader.load_all())
+    case0 = find_case('Test0', 'e0', 'p0', cases)
+    case1 = find_case('Test0', 'e1', 'p0', cases)
+
+    # Partitions and checks are shared until the check of a case is needed
+    assert case0.partition is case1.partition
+    assert case0.orig_check is case1.orig_check
+    dependencies.validate_deps(dependencies.build_deps(cases)[0])
+    assert all(c._check is None for c in cases)
+
+    assert case0.check is not case0.orig_check
+    assert case0.check is case0.check
+    assert case0.check is not case1.check
+    assert case0.check._case() is case0
+
+
 def test_dependecies_how_functions():
     t0_cases = [(p, e)
                 for p in ['p0', 'p1']
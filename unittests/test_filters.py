@@ -153,6 +153,16 @@ def test_have_maintainers(sample_cases):
     assert 2 == count_checks(filters.have_maintainer('Z'), sample_cases)
 
 
+def test_have_param(sample_cases, sample_param_cases_compat):
+    cases = sample_cases + sample_param_cases_compat
+    assert 3 == count_checks(filters.have_param('p=1'), cases)
+    assert 2 == count_checks(filters.have_param('p=1$'), cases)
+    assert 11 == count_checks(filters.have_param('p=[1-9]'), cases)
+    assert 0 == count_checks(filters.have_param('q=1'), cases)
+    with pytest.raises(errors.ReframeError):
+        filters.have_param('p')
+
+
 def test_have_gpu_only(sample_cases):
     assert 2 == count_checks(filters.have_gpu_only(), sample_cases)
 
@@ -3,14 +3,18 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import importlib.util
+import json
 import os
 import pytest
 import shutil
 
 import reframe as rfm
+import reframe.frontend.filters as filters
+import reframe.frontend.loader as loader_mod
 from reframe.core.exceptions import ReframeSyntaxError
 from reframe.core.warnings import ReframeDeprecationWarning
-from reframe.frontend.loader import RegressionCheckLoader
+from reframe.frontend.loader import RegressionCheckLoader, RegisteredVariant
 
 
 @pytest.fixture
@@ -18,6 +22,14 @@ def loader():
     return RegressionCheckLoader(['.'])
 
 
+@pytest.fixture
+def make_loader():
+    def _make_loader(*paths, **kwargs):
+        return RegressionCheckLoader(list(paths), **kwargs)
+
+    return _make_loader
+
+
 @pytest.fixture
 def loader_with_path():
     return RegressionCheckLoader(
@@ -82,6 +94,23 @@ def test_load_bad_init(loader):
     assert 0 == len(tests)
 
 
+def test_load_not_copyable(loader, tmp_path):
+    testfile = tmp_path / 'notcopyable.py'
+    testfile.write_text(
+        'import reframe as rfm\n\n\n'
+        '@rfm.simple_test\n'
+        'class T(rfm.RunOnlyRegressionTest):\n'
+        '    valid_systems = ["*"]\n'
+        '    valid_prog_environs = ["*"]\n'
+        '    executable = "echo"\n'
+        '    items = variable(list, value=[])\n\n'
+        '    def __init__(self):\n'
+        '        self.items.append(x for x in range(3))\n'
+    )
+
+    # Elements of variables are validated, too
+    assert 0 == len(loader.load_from_file(str(testfile)))
+
 def test_load_fixtures(loader):
     tests = loader.load_from_file(
         'unittests/resources/checks_unlisted/fixtures_simple.py'
@@ -89,6 +118,293 @@ def test_load_fixtures(loader):
     assert 5 == len(tests)
 
 
+def test_load_select(make_loader):
+    loader = make_loader('unittests/resources/checks_unlisted/deps_simple.py')
+    tests = loader.load_all(select=filters.have_any_name(['Test1_fully']))
+
+    # The dependencies of the selected tests are loaded as well
+    assert {t.unique_name for t in tests} == {'Test1_fully', 'Test0'}
+
+
+def test_load_select_fixtures(make_loader):
+    loader = make_loader(
+        'unittests/resources/checks_unlisted/fixtures_simple.py'
+    )
+
+    # Tests with fixtures are loaded, since their fixtures may be selected
+    tests = loader.load_all(select=filters.have_any_name(['HelloFixture']))
+    assert 4 == len(tests)
+    assert 'HelloTest' not in {t.unique_name for t in tests}
+    assert 2 == len([t for t in tests if t.is_fixture()])
+
+
+def test_load_select_fixtures_tags(make_loader):
+    loader = make_loader(
+        'unittests/resources/checks_unlisted/fixtures_simple.py'
+    )
+
+    # Tests are not loaded if none of their fixtures may be selected
+    assert not loader.load_all(select=filters.have_tag('foo'))
+
+
+def test_load_select_params(make_loader, tmp_path):
+    checkdir = tmp_path / 'checks'
+    checkdir.mkdir()
+    (checkdir / 'paramcheck.py').write_text(
+        'import reframe as rfm\n\n\n'
+        'class P(rfm.RunOnlyRegressionTest):\n'
+        '    p = parameter([1, 2])\n'
+        '    executable = "echo"\n\n\n'
+        '@rfm.simple_test\n'
+        'class T(rfm.RunOnlyRegressionTest):\n'
+        '    q = parameter([1, 2])\n'
+        '    f = fixture(P)\n'
+        '    valid_systems = ["*"]\n'
+        '    valid_prog_environs = ["*"]\n'
+        '    executable = "echo"\n'
+    )
+    (checkdir / 'paramcheck2.py').write_text(
+        'import reframe as rfm\n\n\n'
+        '@rfm.simple_test\n'
+        'class U(rfm.RunOnlyRegressionTest):\n'
+        '    r = parameter([1, 2])\n'
+        '    valid_systems = ["*"]\n'
+        '    valid_prog_environs = ["*"]\n'
+        '    executable = "echo"\n'
+    )
+    index_file = str(tmp_path / 'index.json')
+
+    def _load(param):
+        imported = []
+        loader = make_loader(str(checkdir), discovery_index=index_file)
+        import_file = loader._import_file
+
+        def _import_file(filename, *args, **kwargs):
+            imported.append(os.path.basename(filename))
+            return import_file(filename, *args, **kwargs)
+
+        loader._import_file = _import_file
+        tests = loader.load_all(force=True,
+                                select=filters.have_param(param))
+        return sorted(imported), sorted(
+            (type(t).__name__, t.variant_num)
+            for t in tests if not t.is_fixture()
+        )
+
+    # Variants are selected by their parameters or those of their fixtures;
+    # the files of the indexed tests are imported only if selected, unless
+    # the tests have fixtures
+    all_files = ['paramcheck.py', 'paramcheck2.py']
+    assert _load('q=1') == (all_files, [('T', 0), ('T', 2)])
+    assert _load('p=2') == (['paramcheck.py'], [('T', 2), ('T', 3)])
+    assert _load('r=2') == (all_files, [('U', 1)])
+    assert _load('r=3') == (['paramcheck.py'], [])
+
+def test_load_select_tags(make_loader):
+    loader = make_loader('unittests/resources/checks/hellocheck.py')
+    tests = loader.load_all(select=filters.have_tag('foo'))
+    assert ['HelloTest'] == [t.unique_name for t in tests]
+
+
+def test_load_select_external_tags(make_loader, tmp_path):
+    # Load a copy of the test file, so that its tests are not modified for
+    # the other unit tests
+    testfile = tmp_path / 'hellocheck.py'
+    shutil.copyfile('unittests/resources/checks/hellocheck.py', testfile)
+
+    def _load(select):
+        loader = make_loader(str(testfile),
+                             external_vars={'HelloTest.tags': 'baz',
+                                            'HelloTest.maintainers': 'me,you'})
+        return [t.unique_name for t in loader.load_all(select=select)]
+
+    # Tests are selected by the values of their variables set externally
+    assert ['HelloTest'] == _load(filters.have_tag('baz'))
+    assert ['HelloTest'] == _load(filters.have_maintainer('you'))
+    assert [] == _load(filters.have_tag('foo'))
+
+
+def test_test_variant():
+    from unittests.resources.checks.hellocheck import HelloTest, SkipTest
+
+    variant = RegisteredVariant(HelloTest, 0)
+    assert variant.unique_name == 'HelloTest'
+    assert variant.display_name == 'HelloTest'
+    assert variant.tags == {'foo', 'bar'}
+
+    # Attributes that may be set during initialization are unknown
+    with pytest.raises(AttributeError):
+        RegisteredVariant(SkipTest, 0).tags
+
+
+@pytest.fixture
+def index_checks(tmp_path):
+    checkdir = tmp_path / 'checks'
+    checkdir.mkdir()
+    shutil.copyfile('unittests/resources/checks/hellocheck.py',
+                    checkdir / 'hellocheck.py')
+    (checkdir / 'helper.py').write_text('x = 1\n')
+    return checkdir
+
+
+def test_discovery_index(make_loader, index_checks, tmp_path, monkeypatch):
+    index_file = tmp_path / 'index.json'
+    loader = make_loader(str(index_checks), discovery_index=str(index_file))
+    tests = loader.load_all()
+    with open(index_file) as fp:
+        files = json.load(fp)['files']
+
+    assert not files[str(index_checks / 'helper.py')]['is_test_file']
+    entry = files[str(index_checks / 'hellocheck.py')]
+    assert entry['is_test_file']
+    assert ['HelloTest', 'CompileOnlyHelloTest', 'SkipTest'] == [
+        t['name'] for t in entry['tests']
+    ]
+    assert ['bar', 'foo'] == entry['tests'][0]['tags']
+    assert [[0, 'HelloTest', 'HelloTest', {}]] == entry['tests'][0]['variants']
+
+    # The sources of unchanged files are not parsed again
+    def _validate_source(filename):
+        pytest.fail(f'{filename!r} was validated')
+
+    loader = make_loader(str(index_checks), discovery_index=str(index_file))
+    monkeypatch.setattr(loader, '_validate_source', _validate_source)
+    assert ({t.unique_name for t in tests} ==
+            {t.unique_name for t in loader.load_all(force=True)})
+
+
+def test_discovery_index_stale(make_loader, index_checks, tmp_path):
+    index_file = tmp_path / 'index.json'
+    make_loader(str(index_checks),
+                discovery_index=str(index_file)).load_all()
+    with open(index_checks / 'helper.py', 'a') as fp:
+        fp.write('import reframe\n')
+
+    validated = []
+    loader = make_loader(str(index_checks), discovery_index=str(index_file))
+    validate_source = loader._validate_source
+
+    def _validate_source(filename):
+        validated.append(os.path.basename(filename))
+        return validate_source(filename)
+
+    loader._validate_source = _validate_source
+    loader.load_all(force=True)
+    assert ['helper.py'] == validated
+    with open(index_file) as fp:
+        files = json.load(fp)['files']
+
+    assert files[str(index_checks / 'helper.py')]['is_test_file']
+
+
+def test_discovery_index_version(make_loader, index_checks, tmp_path):
+    index_file = tmp_path / 'index.json'
+    make_loader(str(index_checks),
+                discovery_index=str(index_file)).load_all()
+    with open(index_file) as fp:
+        data = json.load(fp)
+
+    # An index of a different version is discarded
+    data['header']['reframe_version'] = '0.0'
+    with open(index_file, 'w') as fp:
+        json.dump(data, fp)
+
+    loader = make_loader(str(index_checks), discovery_index=str(index_file))
+    assert loader.load_all(force=True)
+    with open(index_file) as fp:
+        data = json.load(fp)
+
+    assert data['header']['reframe_version'] != '0.0'
+    assert 2 == len(data['files'])
+
+
+@pytest.fixture
+def index_deps(tmp_path):
+    checkdir = tmp_path / 'checks'
+    checkdir.mkdir()
+    for name, dep in [('TestA', 'TestB'), ('TestB', None), ('TestC', None)]:
+        with open(checkdir / f'{name.lower()}.py', 'w') as fp:
+            fp.write(
+                f'import reframe as rfm\n\n\n'
+                f'@rfm.simple_test\n'
+                f'class {name}(rfm.RunOnlyRegressionTest):\n'
+                f'    valid_systems = ["*"]\n'
+                f'    valid_prog_environs = ["*"]\n'
+                f'    executable = "echo"\n'
+            )
+            if dep:
+                fp.write(f'\n    def __init__(self):\n'
+                         f'        self.depends_on("{dep}")\n')
+
+    return checkdir
+
+
+def test_discovery_index_select(make_loader, index_deps, tmp_path):
+    index_file = str(tmp_path / 'index.json')
+    make_loader(str(index_deps), discovery_index=index_file).load_all()
+
+    def _load(names):
+        imported = []
+        loader = make_loader(str(index_deps), discovery_index=index_file)
+        import_file = loader._import_file
+
+        def _import_file(filename, *args, **kwargs):
+            imported.append(os.path.basename(filename))
+            return import_file(filename, *args, **kwargs)
+
+        loader._import_file = _import_file
+        tests = loader.load_all(force=True,
+                                select=filters.have_any_name(names))
+        return sorted(imported), sorted(t.unique_name for t in tests)
+
+    # Only the files of the selected tests and their dependencies are
+    # imported
+    assert _load(['TestC']) == (['testc.py'], ['TestC'])
+    assert _load(['TestB']) == (['testb.py'], ['TestB'])
+    assert _load(['TestA']) == (['testa.py', 'testb.py'], ['TestA', 'TestB'])
+    assert _load(['TestX']) == ([], [])
+
+
+def test_discovery_index_external_vars(make_loader, index_deps, tmp_path):
+    index_file = str(tmp_path / 'index.json')
+    make_loader(str(index_deps), discovery_index=index_file).load_all()
+
+    # The indexed tags do not account for the variables set externally
+    loader = make_loader(str(index_deps), discovery_index=index_file,
+                         external_vars={'TestC.tags': 'foo'})
+    tests = loader.load_all(force=True, select=filters.have_tag('foo'))
+    assert 'TestC' in {t.unique_name for t in tests}
+
+
+def test_load_parallel(make_loader, index_checks, monkeypatch):
+    monkeypatch.setattr(loader_mod, '_PARALLEL_VALIDATION_MIN_FILES', 1)
+    loader = make_loader(str(index_checks))
+
+    def _validate_source(filename):
+        pytest.fail(f'{filename!r} was validated serially')
+
+    monkeypatch.setattr(loader, '_validate_source', _validate_source)
+    tests = loader.load_all(force=True)
+    assert {'HelloTest', 'CompileOnlyHelloTest'} == {
+        t.unique_name for t in tests
+    }
+
+    # Test files are byte-compiled in advance
+    testfile = str(index_checks / 'hellocheck.py')
+    assert os.path.exists(importlib.util.cache_from_source(testfile))
+    assert not os.path.exists(
+        importlib.util.cache_from_source(str(index_checks / 'helper.py'))
+    )
+
+
+def test_load_timings(make_loader, index_checks):
+    loader = make_loader(str(index_checks))
+    loader.load_all(force=True)
+    timings = loader.timings[str(index_checks)]
+    assert {'discovery', 'parse', 'import'} == timings.keys()
+    assert timings['import'] > 0
+
+
 def test_existing_module_name(loader, tmp_path):
     test_file = tmp_path / 'os.py'
     shutil.copyfile('unittests/resources/checks/emptycheck.py', test_file)
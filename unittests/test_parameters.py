@@ -6,6 +6,7 @@
 
 import pytest
 import inspect
+import itertools
 
 
 import reframe as rfm
@@ -367,3 +368,42 @@ def test_get_variant_nums():
 
     with pytest.raises(ValueError):
         MyTest.param_space.get_variant_nums(p=lambda x, y: x == 2)
+
+
+def test_param_space_order_product():
+    class MyTest(rfm.RegressionTest):
+        p0 = parameter(['a', 'b'])
+        p1 = parameter(range(3))
+        p2 = parameter([True, False])
+
+    # The combinations are ordered as in the Cartesian product
+    space = MyTest.param_space
+    combinations = list(itertools.product(['a', 'b'], range(3),
+                                          [True, False]))
+    assert list(space) == combinations
+    for i, comb in enumerate(combinations):
+        assert tuple(space[i].values()) == comb
+
+    assert tuple(space[-1].values()) == combinations[-1]
+    with pytest.raises(IndexError):
+        space[len(combinations)]
+
+    variant_nums = space.get_variant_nums(p0='b', p1=lambda x: x > 0)
+    assert variant_nums == [i for i, c in enumerate(combinations)
+                            if c[0] == 'b' and c[1] > 0]
+
+
+def test_param_space_large():
+    class MyTest(rfm.RegressionTest):
+        p0 = parameter(range(100))
+        p1 = parameter(range(100))
+        p2 = parameter(range(100))
+        p3 = parameter(range(100))
+
+    # The combinations are not materialized
+    space = MyTest.param_space
+    assert len(space) == 100**4
+    assert space[12345678] == {'p0': 12, 'p1': 34, 'p2': 56, 'p3': 78}
+    assert space.get_variant_nums(p0=99, p1=99, p2=99) == list(
+        range(100**4 - 100, 100**4)
+    )
@@ -3,14 +3,18 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import hashlib
 import os
 import pytest
 import re
 import sys
+import time
 
 import reframe as rfm
+import reframe.core.buildcache as buildcache
 import reframe.core.builtins as builtins
 import reframe.core.runtime as rt
+import reframe.core.sourcecache as sourcecache
 import reframe.utility.osext as osext
 import reframe.utility.sanity as sn
 import unittests.utility as test_util
@@ -18,7 +22,8 @@ import unittests.utility as test_util
 from reframe.core.containers import _STAGEDIR_MOUNT
 from reframe.core.exceptions import (BuildError, PipelineError, ReframeError,
                                      PerformanceError, SanityError,
-                                     SkipTestError, ReframeSyntaxError)
+                                     SkipTestError, SpawnedProcessError,
+                                     ReframeSyntaxError)
 from reframe.core.meta import make_test
 
 
@@ -195,6 +200,282 @@ def test_hellocheck_local(hellotest, local_exec_ctx):
         assert os.path.exists(os.path.join(hellotest.outputdir, f))
 
 
+def test_hellocheck_compress_output(hellotest, local_exec_ctx):
+    rt.runtime().site_config.add_sticky_option('general/compress_output',
+                                               'gzip')
+    hellotest.prebuild_cmds = ['mkdir -p  prebuild_dir/foo',
+                               'echo foo > prebuild_dir/foo/bar']
+    hellotest.keep_files = ['prebuild_dir']
+    _run(hellotest, *local_exec_ctx)
+    must_keep = [
+        hellotest.stdout.evaluate(),
+        hellotest.stderr.evaluate(),
+        hellotest.build_stdout.evaluate(),
+        hellotest.build_stderr.evaluate(),
+        hellotest.job.script_filename,
+        'prebuild_dir/foo/bar'
+    ]
+    for f in must_keep:
+        assert os.path.exists(os.path.join(hellotest.outputdir, f'{f}.gz'))
+        assert not os.path.exists(os.path.join(hellotest.outputdir, f))
+
+    # The kept output can be checked with the sanity functions
+    stdout = os.path.join(hellotest.outputdir, hellotest.stdout.evaluate())
+    assert sn.assert_found(r'Hello, World\!', stdout)
+
+
+@pytest.mark.parametrize('mode', ['clone', 'copy', 'link'])
+def test_staging_mode(hellotest, local_exec_ctx, mode):
+    rt.runtime().site_config.add_sticky_option('general/staging_mode', mode)
+    hellotest.setup(*local_exec_ctx)
+    hellotest.compile()
+    hellotest.compile_wait()
+    src = os.path.join(hellotest.prefix, hellotest.sourcesdir, 'hello.c')
+    dst = os.path.join(hellotest.stagedir, 'hello.c')
+    assert os.path.samefile(src, dst) == (mode == 'link')
+    hellotest.run()
+    hellotest.run_wait()
+    hellotest.check_sanity()
+
+
+def test_build_cache(HelloTest, local_exec_ctx, tmp_path):
+    rt.runtime().site_config.add_sticky_option('general/build_cache_dir',
+                                               str(tmp_path / 'cache'))
+    test = HelloTest()
+    _run(test, *local_exec_ctx)
+    assert not test._build_cache_hit
+
+    # The build of an identical test is restored from the cache
+    test = HelloTest()
+    _run(test, *local_exec_ctx)
+    assert test._build_cache_hit
+    assert test.build_job.jobid is None
+    assert os.path.exists(os.path.join(test.outputdir,
+                                       test.build_stdout.evaluate()))
+
+    # Changing any of the build inputs invalidates the cache
+    test = HelloTest()
+    test.prebuild_cmds = ['echo foo']
+    _run(test, *local_exec_ctx)
+    assert not test._build_cache_hit
+
+    # Caching can be disabled per test
+    test = HelloTest()
+    test.cache_build = False
+    _run(test, *local_exec_ctx)
+    assert not test._build_cache_hit
+
+
+@pytest.fixture
+def make_shared_build_tests(HelloTest, local_exec_ctx):
+    rt.runtime().site_config.add_sticky_option('general/share_builds', True)
+
+    def _make_tests(**attrs):
+        # Different tests with identical build inputs
+        class HelloA(HelloTest):
+            executable = './hello'
+
+        class HelloB(HelloTest):
+            executable = './hello'
+
+        tests = [HelloA(), HelloB()]
+        for t in tests:
+            for name, value in attrs.items():
+                setattr(t, name, value)
+
+            t.setup(*local_exec_ctx)
+            t.compile()
+
+        return tests
+
+    return _make_tests
+
+
+def test_share_builds(make_shared_build_tests):
+    leader, follower = make_shared_build_tests()
+    assert leader.build_job.jobid is not None
+    assert follower.build_job.jobid is None
+    while not follower.compile_complete():
+        leader.build_job.scheduler.poll(leader.build_job)
+        time.sleep(0.1)
+
+    # The follower may finish before the leader has stored the build
+    follower.compile_wait()
+    leader.compile_wait()
+    for t in (leader, follower):
+        t.run()
+        t.run_wait()
+        t.check_sanity()
+        t.cleanup(remove_files=True)
+
+
+def test_share_builds_failure(make_shared_build_tests):
+    leader, follower = make_shared_build_tests(prebuild_cmds=['false'])
+
+    # Tests sharing a failed build fail as well
+    with pytest.raises(BuildError):
+        leader.compile_wait()
+
+    with pytest.raises(BuildError):
+        follower.compile_wait()
+
+
+def test_share_builds_leader_failure(make_shared_build_tests):
+    leader, follower = make_shared_build_tests()
+
+    # The leader fails before storing its build, e.g., because it is aborted
+    buildcache.abandon_builds(leader)
+    assert follower.compile_complete()
+    with pytest.raises(PipelineError, match='not available'):
+        follower.compile_wait()
+
+    leader.build_job.cancel()
+
+
+def test_share_builds_unshared(HelloTest, local_exec_ctx):
+    rt.runtime().site_config.add_sticky_option('general/share_builds', True)
+    test = HelloTest()
+    _run(test, *local_exec_ctx)
+
+    # Builds that no other test waits for are not stored
+    build_cache = test._build_cache()
+    assert test._build_key not in build_cache
+    assert build_cache.pending(test._build_key) is None
+
+
+@pytest.fixture
+def remote_file(tmp_path):
+    path = tmp_path / 'remote' / 'data.txt'
+    path.parent.mkdir()
+    path.write_text('hello\n')
+    checksum = hashlib.sha256(b'hello\n').hexdigest()
+    return path, checksum
+
+
+def test_fetch_files(hellotest, local_exec_ctx, remote_file):
+    path, checksum = remote_file
+    hellotest.fetch_files = {path.as_uri(): checksum}
+    hellotest.setup(*local_exec_ctx)
+    hellotest.compile()
+    with open(os.path.join(hellotest.stagedir, 'data.txt')) as fp:
+        assert fp.read() == 'hello\n'
+
+
+def test_fetch_files_checksum_mismatch(hellotest, local_exec_ctx,
+                                       remote_file):
+    path, _ = remote_file
+    hellotest.fetch_files = {path.as_uri(): 'ab' * 32}
+    hellotest.setup(*local_exec_ctx)
+    with pytest.raises(PipelineError, match='failed to fetch'):
+        hellotest.compile()
+
+    assert not os.path.exists(os.path.join(hellotest.stagedir, 'data.txt'))
+
+
+def test_fetch_files_source_cache(HelloTest, local_exec_ctx, remote_file,
+                                  tmp_path):
+    rt.runtime().site_config.add_sticky_option('general/source_cache_dir',
+                                               str(tmp_path / 'cache'))
+    path, checksum = remote_file
+    url = path.as_uri()
+    test = HelloTest()
+    test.fetch_files = {url: checksum}
+    _run(test, *local_exec_ctx)
+    entry = os.path.join(tmp_path, 'cache', 'urls',
+                         hashlib.sha256(url.encode()).hexdigest())
+    assert sorted(os.listdir(entry)) == ['data.txt', 'sha256']
+
+    # The file is served from the cache once downloaded
+    path.unlink()
+    test = HelloTest()
+    test.fetch_files = {url: ''}
+    test.setup(*local_exec_ctx)
+    test.compile()
+    with open(os.path.join(test.stagedir, 'data.txt')) as fp:
+        assert fp.read() == 'hello\n'
+
+    test = HelloTest()
+    test.fetch_files = {url: 'ab' * 32}
+    test.setup(*local_exec_ctx)
+    with pytest.raises(PipelineError, match='failed to fetch'):
+        test.compile()
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    try:
+        osext.run_command('git --version', check=True, log=False)
+    except (SpawnedProcessError, FileNotFoundError):
+        pytest.skip('no git installation found on system')
+
+    repo = tmp_path / 'repo'
+    repo.mkdir()
+
+    def _commit(text):
+        (repo / 'data.txt').write_text(text)
+        for cmd in ('add data.txt',
+                    '-c user.name=rfm -c user.email=rfm@localhost '
+                    'commit -q -m update'):
+            osext.run_command(f'git -C {repo} {cmd}', check=True)
+
+    osext.run_command(f'git init -q {repo}', check=True)
+    _commit('hello\n')
+
+    # Local paths are not recognized as URLs by the pipeline
+    return f'file://localhost{repo}', _commit
+
+
+def test_source_cache_git(local_exec_ctx, git_repo, tmp_path):
+    rt.runtime().site_config.add_sticky_option('general/source_cache_dir',
+                                               str(tmp_path / 'cache'))
+    url, commit = git_repo
+
+    class MyTest(rfm.RunOnlyRegressionTest):
+        valid_systems = ['*']
+        valid_prog_environs = ['*']
+        sourcesdir = url
+        executable = 'cat data.txt'
+        local = True
+        text = variable(str, value='hello')
+
+        @sanity_function
+        def validate(self):
+            return sn.assert_found(self.text, self.stdout)
+
+    test = MyTest()
+    test.setup(*local_exec_ctx)
+    test.run()
+    mirror = sourcecache.getcache(str(tmp_path / 'cache')).git_mirror(url)
+    assert os.path.isdir(mirror)
+
+    # The stage directory does not depend on the mirror
+    alternates = os.path.join(test.stagedir, '.git', 'objects', 'info',
+                              'alternates')
+    assert not os.path.exists(alternates)
+    origin = osext.run_command(
+        f'git -C {test.stagedir} remote get-url origin', check=True
+    ).stdout.strip()
+    assert origin == url
+    test.run_wait()
+    test.check_sanity()
+
+    # The mirror is updated once per session
+    commit('bye\n')
+    _run(MyTest(), *local_exec_ctx)
+    sourcecache.getcache.cache_clear()
+    test = MyTest()
+    test.text = 'bye'
+    _run(test, *local_exec_ctx)
+
+
+def test_source_cache_git_invalid_repo(tmp_path):
+    cache = sourcecache.SourceCache(str(tmp_path / 'cache'))
+    with pytest.raises(ReframeError, match='does not exist'):
+        cache.git_mirror(f'file://localhost{tmp_path}/foo', timeout=5)
+
+    assert not os.path.exists(tmp_path / 'cache' / 'git')
+
+
 def test_hellocheck_build_remotely(hellotest, remote_exec_ctx):
     hellotest.build_locally = False
     _run(hellotest, *remote_exec_ctx)
@@ -260,6 +541,88 @@ def test_run_only_decorated_sanity(local_exec_ctx):
         _run(MyOtherTest(), *local_exec_ctx)
 
 
+@pytest.fixture
+def failfast_test():
+    class MyTest(rfm.RunOnlyRegressionTest):
+        valid_systems = ['*']
+        valid_prog_environs = ['*']
+        executable = 'echo'
+        local = True
+        failfast_patterns = [r'^Segmentation fault', r'MPI_ABORT']
+        sanity_patterns = sn.assert_true(1)
+
+    return MyTest()
+
+
+def _run_until_complete(test, partition, prgenv):
+    test.setup(partition, prgenv)
+    test.compile()
+    test.compile_wait()
+    test.run()
+    while True:
+        test.job.scheduler.poll(test.job)
+        if test.run_complete():
+            break
+
+        time.sleep(0.1)
+
+
+def test_failfast_patterns(failfast_test, local_exec_ctx):
+    failfast_test.executable_opts = ['"Segmentation fault" >&2; sleep 10']
+    t_start = time.time()
+    with pytest.raises(SanityError, match=r"'\^Segmentation fault' found"):
+        _run_until_complete(failfast_test, *local_exec_ctx)
+
+    assert time.time() - t_start < 10
+    assert failfast_test.job.cancel_time is not None
+
+
+def test_failfast_patterns_no_match(failfast_test, local_exec_ctx):
+    failfast_test.executable_opts = ['"No Segmentation fault"']
+    _run_until_complete(failfast_test, *local_exec_ctx)
+    failfast_test.run_wait()
+    failfast_test.check_sanity()
+
+
+def test_failfast_patterns_incremental(failfast_test, local_exec_ctx,
+                                       monkeypatch):
+    import reframe.core.pipeline as pipeline
+
+    # Use a small chunk size, so that the output is scanned in several
+    # chunks and lines are split across them
+    monkeypatch.setattr(pipeline, '_FAILFAST_CHUNK_SIZE', 16)
+    failfast_test.executable = 'printf'
+    failfast_test.executable_opts = [
+        '"%020d\\nfoo MPI_A" 0; sleep 1; printf "BORT\\n"; sleep 10'
+    ]
+    with pytest.raises(SanityError, match="'MPI_ABORT' found in"):
+        _run_until_complete(failfast_test, *local_exec_ctx)
+
+    # The last line was scanned only when complete
+    stdout = failfast_test.stdout.evaluate()
+    assert failfast_test._failfast_offsets[stdout] == 21
+
+
+def test_failfast_patterns_no_trailing_newline(failfast_test,
+                                               local_exec_ctx):
+    failfast_test.executable = 'printf'
+    failfast_test.executable_opts = ['"foo\nMPI_ABORT"']
+    with pytest.raises(SanityError, match="'MPI_ABORT' found in"):
+        _run_until_complete(failfast_test, *local_exec_ctx)
+
+
+def test_failfast_patterns_long_line(failfast_test, local_exec_ctx,
+                                     monkeypatch):
+    import reframe.core.pipeline as pipeline
+
+    # The match straddles the first two chunks of the line
+    monkeypatch.setattr(pipeline, '_FAILFAST_CHUNK_SIZE', 16)
+    failfast_test.executable = 'printf'
+    failfast_test.executable_opts = ['"%012dMPI_ABORT%020d\n" 0 0']
+    with pytest.raises(SanityError, match="'MPI_ABORT' found in"):
+        _run_until_complete(failfast_test, *local_exec_ctx)
+
+
 def test_run_only_no_srcdir(local_exec_ctx):
     @test_util.custom_prefix('foo/bar/')
     class MyTest(rfm.RunOnlyRegressionTest):
@@ -1116,6 +1479,25 @@ def test_inherited_hooks_from_instantiated_tests(HelloTest, local_exec_ctx):
     assert t1.foo == 1
 
 
+def test_hooks_attached_once(HelloTest, local_exec_ctx):
+    @test_util.custom_prefix('unittests/resources/checks')
+    class MyTest(HelloTest):
+        var = variable(int, value=0)
+
+        @run_after('setup')
+        def x(self):
+            self.var += 1
+
+    t0 = MyTest()
+    setup_fn = MyTest.setup
+    t1 = MyTest()
+    assert MyTest.setup is setup_fn
+    _run(t0, *local_exec_ctx)
+    _run(t1, *local_exec_ctx)
+    assert t0.var == 1
+    assert t1.var == 1
+
+
 def test_overriden_hooks(HelloTest, local_exec_ctx):
     @test_util.custom_prefix('unittests/resources/checks')
     class BaseTest(HelloTest):
@@ -3,16 +3,20 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import array
 import contextlib
 import io
 import itertools
 import os
 import pytest
+import re
 import sys
 
 
+import reframe.utility.jsonext as jsonext
+import reframe.utility.osext as osext
 import reframe.utility.sanity as sn
-from reframe.core.exceptions import SanityError
+from reframe.core.exceptions import ReframeError, SanityError
 from unittests.utility import TEST_RESOURCES_CHECKS
 
 
@@ -811,6 +815,221 @@ def test_extractall_multiple_tags(_extractall):
         )
 
 
+def test_file_cache(tempfile, monkeypatch):
+    num_opens = 0
+
+    def _open(*args, **kwargs):
+        nonlocal num_opens
+        num_opens += 1
+        return open(*args, **kwargs)
+
+    monkeypatch.setattr(sn, 'open', _open, raising=False)
+    with sn.file_cache():
+        assert sn.assert_found(r'Step: \d+', tempfile)
+        assert 3 == sn.count(sn.findall(r'Step: \d+', tempfile))
+        assert 2 == sn.extractsingle(r'Step: (\d+)', tempfile, 1, int, 1)
+        assert num_opens == 1
+
+        # Modifying the file invalidates its entry
+        with open(tempfile, 'a') as fp:
+            fp.write('Step: 4\n')
+
+        assert 4 == sn.count(sn.extractall(r'Step: (\d+)', tempfile, 1))
+        assert num_opens == 2
+
+        # Nested contexts share the cache
+        with sn.file_cache():
+            assert sn.assert_found(r'Step: 4', tempfile)
+
+        assert num_opens == 2
+
+    # Files are read every time outside the context
+    assert sn.assert_found(r'Step: \d+', tempfile)
+    assert sn.assert_found(r'Step: \d+', tempfile)
+    assert num_opens == 4
+
+
+def test_file_cache_invalid_file():
+    with sn.file_cache():
+        with pytest.raises(SanityError):
+            sn.evaluate(sn.extractall(r'Step: (\d+)', 'foo.txt', 1))
+
+
+@pytest.mark.parametrize('mode', ['mmap', 'lines'])
+def test_file_modes(tempfile, mode):
+    assert sn.assert_found(r'Step: \d+', tempfile, mode=mode)
+    assert sn.assert_not_found(r'foo', tempfile, mode=mode)
+    with pytest.raises(SanityError, match='not found'):
+        sn.evaluate(sn.assert_found(r'foo', tempfile, mode=mode))
+
+    with pytest.raises(SanityError, match='found'):
+        sn.evaluate(sn.assert_not_found(r'Step', tempfile, mode=mode))
+
+    res = sn.evaluate(sn.findall(r'Step: (?P<no>\d+)$', tempfile, mode=mode))
+    assert 3 == len(res)
+    for step, match in enumerate(res, start=1):
+        assert f'Step: {step}' == match.group(0) == match[0]
+        assert str(step) == match.group(1) == match.group('no')
+        assert (str(step),) == match.groups()
+        assert {'no': str(step)} == match.groupdict()
+
+    assert [1, 2, 3] == sn.extractall(r'Step: (\d+)', tempfile, 1, int,
+                                      mode=mode)
+    assert [(3, 6.0)] == sn.extractall(r'Number: (\d+) (?P<no>\d+)',
+                                       tempfile, (1, 'no'), (int, float),
+                                       mode=mode)[2:]
+    assert 2 == sn.extractsingle(r'Step: (\d+)', tempfile, 1, int, 1,
+                                 mode=mode)
+    with pytest.raises(SanityError, match='no such group'):
+        sn.evaluate(sn.extractall(r'Step: (\d+)', tempfile, 2, mode=mode))
+
+    with pytest.raises(SanityError):
+        sn.evaluate(sn.findall(r'Step: \d+', 'foo.txt', mode=mode))
+
+
+def test_file_modes_matches(tempfile):
+    # Patterns spanning multiple lines are matched only in mmap mode
+    patt = r'Step: 3\nNumber: (\d+)'
+    assert sn.assert_found(patt, tempfile, mode='mmap')
+    assert sn.assert_not_found(patt, tempfile, mode='lines')
+
+    # Match positions are byte offsets in mmap mode and relative to the
+    # line in lines mode
+    res = sn.findall(r'Step: 2', tempfile, mode='mmap')
+    assert [(8, 15)] == [m.span() for m in res]
+
+    res = sn.findall(r'Step: 2', tempfile, mode='lines')
+    assert [(0, 7)] == [m.span() for m in res]
+
+
+def test_file_modes_mmap_special_files(tmp_path, utf16_file):
+    empty_file = tmp_path / 'empty'
+    empty_file.touch()
+    assert [] == sn.findall(r'.*', str(empty_file), mode='mmap')
+
+    with pytest.raises(SanityError, match='non-ASCII compatible'):
+        sn.evaluate(sn.findall('Odyssey', utf16_file,
+                               encoding='utf-16', mode='mmap'))
+
+    assert 1 == sn.count(sn.findall('Odyssey', utf16_file,
+                                    encoding='utf-16', mode='lines'))
+
+
+def test_file_modes_mmap_non_ascii(tmp_path):
+    nonascii_file = tmp_path / 'names'
+    nonascii_file.write_text('Name: é\nName: éé\n', encoding='utf-8')
+    nonascii_file = str(nonascii_file)
+
+    # Whole multi-byte characters are decoded
+    assert ['é', 'éé'] == sn.extractall(r'Name: (\S+)', nonascii_file, 1,
+                                        mode='mmap')
+
+    # Groups ending inside a multi-byte character cannot be decoded
+    with pytest.raises(SanityError, match='could not decode'):
+        sn.evaluate(sn.extractall(r'Name: (.)', nonascii_file, 1,
+                                  mode='mmap'))
+
+    with pytest.raises(SanityError, match='only ASCII string patterns'):
+        sn.evaluate(sn.findall(r'Name: é+', nonascii_file, mode='mmap'))
+
+    with pytest.raises(SanityError, match='only ASCII string patterns'):
+        sn.evaluate(sn.findall(re.compile(r'Name'), nonascii_file,
+                               mode='mmap'))
+
+    assert [(0, 'é')] == [
+        (m.start(), m.group(1))
+        for m in sn.evaluate(sn.findall(r'Name: (.)$', nonascii_file,
+                                        mode='lines'))
+    ]
+
+
+def test_file_modes_invalid_mode(tempfile):
+    with pytest.raises(SanityError, match='unknown file processing mode'):
+        sn.evaluate(sn.findall(r'Step: \d+', tempfile, mode='foo'))
+
+
+@pytest.fixture(params=['gzip', 'zstd'])
+def compressed_tempfile(request, tempfile):
+    if request.param == 'zstd':
+        try:
+            osext._zstd()
+        except ReframeError:
+            pytest.skip('zstd compression not available')
+
+    suffix = osext.COMPRESSION_SUFFIXES[request.param]
+    with open(tempfile, 'rb') as fp_src:
+        with osext.open_compressed(tempfile + suffix, 'wb') as fp_dst:
+            fp_dst.write(fp_src.read())
+
+    os.remove(tempfile)
+    return tempfile
+
+
+@pytest.mark.parametrize('mode', ['text', 'mmap', 'lines'])
+def test_compressed_files(compressed_tempfile, mode):
+    # The compressed file is looked up using the original file name
+    assert [1, 2, 3] == sn.extractall(r'Step: (\d+)', compressed_tempfile, 1,
+                                      int, mode=mode)
+    assert 2 == sn.extractsingle(r'Number: 1 (\d+)', compressed_tempfile, 1,
+                                 int, mode=mode)
+    with sn.file_cache():
+        assert sn.assert_found(r'Step: 3', compressed_tempfile, mode=mode)
+        assert 3 == sn.count(sn.findall(r'Number', compressed_tempfile,
+                                        mode=mode))
+
+
+def test_scan_patterns(tempfile, contents):
+    from reframe.utility.sanity import _scan_patterns
+
+    # Include overlapping patterns, repeated group names and a pattern with
+    # a back reference, which cannot be combined
+    patterns = [r'Step: (?P<no>\d+)', r'(?P<no>\d+)\nNumber',
+                r'Number: (?P<no>\d+) \d+', r'Number: (\d) \1',
+                r'foo']
+    matches = _scan_patterns(patterns, contents)
+    assert r'Number: (\d) \1' not in matches
+    for patt in patterns[:3] + ['foo']:
+        expected = [m.span() for m in sn.finditer_s(patt, contents)]
+        assert expected == [m.span() for m in matches[patt]]
+
+    assert ['1', '2', '3'] == [m.group('no') for m in matches[patterns[2]]]
+
+
+def test_batch_patterns(tempfile, monkeypatch):
+    num_scans = 0
+    scan_patterns = sn._scan_patterns
+
+    def _scan_patterns(patterns, string):
+        nonlocal num_scans
+        num_scans += 1
+        return scan_patterns(patterns, string)
+
+    num_calls = 0
+
+    def extract_step(no):
+        nonlocal num_calls
+        num_calls += 1
+        return sn.extractsingle(rf'Step: ({no})', tempfile, 1, int)
+
+    monkeypatch.setattr(sn, '_scan_patterns', _scan_patterns)
+    perf_exprs = [
+        sn.make_performance_function(extract_step, 'step', 1),
+        sn.make_performance_function(extract_step, 'step', 2),
+        sn.make_performance_function(
+            sn.extractsingle(r'Number: \d+ (\d+)', tempfile, 1, int, 2),
+            'number'
+        )
+    ]
+    with sn.file_cache():
+        sn.batch_patterns(*perf_exprs)
+        assert [1, 2, 6] == [sn.evaluate(e) for e in perf_exprs]
+
+    assert num_scans == 1
+
+    # The performance functions are called only once
+    assert num_calls == 2
+
+
 def test_safe_format():
     from reframe.utility.sanity import _format
 
@@ -842,6 +1061,99 @@ def test_avg():
         sn.evaluate(sn.avg([]))
 
 
+@pytest.fixture(params=['array', 'numpy'])
+def array_backend(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(sn, '_numpy', lambda: None)
+
+    return request.param
+
+
+def test_extractarray(tempfile, contents, array_backend):
+    for res in (sn.extractarray(r'Step: (\d+)', tempfile, 1),
+                sn.extractarray(r'Step: (\d+)', tempfile, 1, mode='mmap'),
+                sn.extractarray_s(r'Step: (\d+)', contents, 1)):
+        res = sn.evaluate(res)
+        if array_backend == 'numpy':
+            assert 'ndarray' == type(res).__name__
+        else:
+            assert isinstance(res, array.array)
+            assert 'd' == res.typecode
+
+        assert [1.0, 2.0, 3.0] == list(res)
+
+    res = sn.evaluate(sn.extractarray(r'Number: \d+ (?P<no>\d+)', tempfile,
+                                      'no', 'i'))
+    assert [2, 4, 6] == list(res)
+    assert 12 == sn.sum(res)
+    assert 2 == sn.min(res)
+    assert 6 == sn.max(res)
+    assert 3 == sn.count(res)
+    assert 4 == sn.avg(res)
+
+    # The reductions return builtin numbers, so that they can be logged and
+    # dumped in the run report
+    for fn in (sn.sum, sn.min, sn.max):
+        assert type(sn.evaluate(fn(res))) is int
+
+    assert type(sn.evaluate(sn.avg(res))) is float
+    assert type(sn.evaluate(sn.stddev(res))) is float
+    assert '{"v": 12}' == jsonext.dumps({'v': sn.evaluate(sn.sum(res))})
+    assert [] == list(sn.evaluate(sn.extractarray(r'foo', tempfile)))
+
+
+def test_extractarray_errors(tempfile, array_backend):
+    with pytest.raises(SanityError, match='no such group'):
+        sn.evaluate(sn.extractarray(r'Step: (\d+)', tempfile, 2))
+
+    with pytest.raises(SanityError, match='could not convert'):
+        sn.evaluate(sn.extractarray(r'(Step): \d+', tempfile, 1))
+
+    with pytest.raises(SanityError, match='could not convert'):
+        sn.evaluate(sn.extractarray(r'Step: (x)?\d+', tempfile, 1,
+                                    mode='lines'))
+
+    with pytest.raises(SanityError, match='could not convert'):
+        sn.evaluate(sn.extractarray_s(r'\d+', '300', typecode='b'))
+
+    with pytest.raises(ValueError):
+        sn.evaluate(sn.extractarray(r'Step: (\d+)', tempfile, 1, 'u'))
+
+
+def test_stddev(array_backend):
+    values = sn.extractarray_s(r'(\d+)', '2 4 4 4 5 5 7 9', 1)
+    assert 2.0 == sn.stddev(values)
+    assert 2.0 == sn.stddev([2, 4, 4, 4, 5, 5, 7, 9])
+    assert 0.5 == sn.stddev(x for x in range(1, 3))
+    assert pytest.approx(2.13809, abs=1e-5) == sn.evaluate(
+        sn.stddev(values, ddof=1)
+    )
+    assert 0 == sn.stddev([1])
+    with pytest.raises(SanityError):
+        sn.evaluate(sn.stddev([]))
+
+    with pytest.raises(SanityError):
+        sn.evaluate(sn.stddev([1], ddof=1))
+
+
+def test_percentile(array_backend):
+    values = sn.extractarray_s(r'(\d+)', '15 20 35 40 50', 1)
+    for vals in (values, [50, 40, 35, 20, 15], range(15, 51)):
+        assert 15 == sn.percentile(vals, 0)
+        assert 50 == sn.percentile(vals, 100)
+
+    assert 35 == sn.percentile(values, 50)
+    assert 29 == sn.percentile(values, 40)
+    assert 45 == sn.percentile([15, 20, 35, 40, 50], 87.5)
+    with pytest.raises(SanityError):
+        sn.evaluate(sn.percentile(values, 101))
+
+    with pytest.raises(SanityError):
+        sn.evaluate(sn.percentile([], 50))
+
+
 def test_path_exists(tmp_path):
     valid_dir = tmp_path / 'foo'
     valid_dir.touch()
@@ -3,6 +3,7 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import json
 import os
 import pytest
 import re
@@ -11,13 +12,16 @@ import socket
 import time
 
 import reframe.core.runtime as rt
+import reframe.utility.osext as osext
 import unittests.utility as test_util
 from reframe.core.backends import (getlauncher, getscheduler)
 from reframe.core.environments import Environment
 from reframe.core.exceptions import (
-    JobError, JobNotStartedError, JobSchedulerError
+    JobError, JobNotStartedError, JobSchedulerError, ReframeError
 )
 from reframe.core.schedulers import Job
+from reframe.core.schedulers.replay import (SchedulerRecorder,
+                                            SchedulerReplayer)
 from reframe.core.schedulers.slurm import _SlurmNode, _create_nodes
 
 
@@ -1241,3 +1245,159 @@ def test_slurm_node_is_down(slurm_node_allocated,
     assert not slurm_node_allocated.is_down()
     assert not slurm_node_idle.is_down()
     assert slurm_node_nopart.is_down()
+
+
+# Scheduler session recording and replaying tests
+
+
+def test_sched_record_replay(tmp_path):
+    session_file = tmp_path / 'session.json'
+    with SchedulerRecorder(session_file, modules=[__name__]) as recorder:
+        completed = osext.run_command('echo hello')
+
+    assert completed.stdout == 'hello\n'
+    assert len(recorder.records) == 1
+    assert recorder.records[0]['command'] == 'echo hello'
+    assert recorder.records[0]['returncode'] == 0
+    assert os.path.exists(session_file)
+
+    with SchedulerReplayer(session_file, modules=[__name__],
+                           emulate_latency=False):
+        # The last response is reused when the recording is exhausted
+        for _ in range(2):
+            completed = osext.run_command('echo hello')
+            assert completed.stdout == 'hello\n'
+            assert completed.returncode == 0
+
+        with pytest.raises(ReframeError, match='diverged'):
+            osext.run_command('echo bye')
+
+    # Commands are run normally after the replayer is uninstalled
+    assert osext.run_command('echo bye').stdout == 'bye\n'
+
+
+@pytest.fixture
+def fake_squeue(tmp_path):
+    # A scheduler command that echoes its arguments
+    path = tmp_path / 'bin' / 'squeue'
+    path.parent.mkdir()
+    path.write_text('#!/bin/sh\necho "$@"\n')
+    path.chmod(0o755)
+    return str(path)
+
+
+def test_sched_record_replay_normalized(tmp_path, fake_squeue):
+    session_file = tmp_path / 'session.json'
+    rec_prefix = tmp_path / 'rec' / 'stage'
+    with SchedulerRecorder(session_file, modules=[__name__],
+                           prefixes={'stage_prefix': rec_prefix}) as recorder:
+        osext.run_command(f'{fake_squeue} {rec_prefix}/job.sh '
+                          f'-S 2022-11-29 -M 4 -j 1,2')
+
+    assert (recorder.records[0]['command'] ==
+            f'{fake_squeue} <STAGE_PREFIX>/job.sh -S <DATE> -M 4 -j <JOBIDS>')
+    assert recorder.records[0]['jobids'] == ['1', '2']
+
+    # Replay on another day, with another prefix and a subset of the jobs
+    play_prefix = tmp_path / 'play' / 'stage'
+    with SchedulerReplayer(session_file, modules=[__name__],
+                           emulate_latency=False,
+                           prefixes={'stage_prefix': play_prefix}):
+        completed = osext.run_command(
+            f'{fake_squeue} {play_prefix}/job.sh -S 2026-10-19 -M 4 -j 2'
+        )
+        assert completed.stdout == (f'{rec_prefix}/job.sh '
+                                    f'-S 2022-11-29 -M 4 -j 1,2\n')
+        with pytest.raises(ReframeError, match='diverged'):
+            osext.run_command(f'{fake_squeue} {rec_prefix}2/job.sh '
+                              f'-S 2026-10-19 -M 4 -j 2')
+
+        # Other numeric arguments are not job ids
+        with pytest.raises(ReframeError, match='diverged'):
+            osext.run_command(f'{fake_squeue} {play_prefix}/job.sh '
+                              f'-S 2026-10-19 -M 5 -j 2')
+
+        # Jobs that were not recorded are not matched
+        with pytest.raises(ReframeError, match=r'diverged.*job\(s\) 3'):
+            osext.run_command(f'{fake_squeue} {play_prefix}/job.sh '
+                              f'-S 2026-10-19 -M 4 -j 3')
+
+
+def test_sched_replay_polls(tmp_path, fake_squeue):
+    def _record(jobids, stdout):
+        return {'command': f'{fake_squeue} -h -j <JOBIDS>',
+                'jobids': jobids, 'start': 0., 'latency': 0.,
+                'timeout': None, 'returncode': 0,
+                'stdout': stdout, 'stderr': ''}
+
+    session_file = tmp_path / 'session.json'
+    with open(session_file, 'w') as fp:
+        json.dump({
+            'data_version': '1.1',
+            'commands': [
+                _record(['1', '2'], '1 RUNNING\n2 RUNNING\n'),
+                _record(['1', '2'], '1 COMPLETED\n2 RUNNING\n'),
+                _record(['2'], '2 COMPLETED\n')
+            ]
+        }, fp)
+
+    def _poll(jobids):
+        return osext.run_command(f'{fake_squeue} -h -j {jobids}').stdout
+
+    # The polls receive the recorded responses of their jobs in order and
+    # the last one of their jobs, once these are exhausted
+    with SchedulerReplayer(session_file, modules=[__name__],
+                           emulate_latency=False):
+        assert _poll('2') == '1 RUNNING\n2 RUNNING\n'
+        assert _poll('2,1') == '1 COMPLETED\n2 RUNNING\n'
+        assert _poll('2') == '2 COMPLETED\n'
+        assert _poll('2') == '2 COMPLETED\n'
+        assert _poll('1') == '1 COMPLETED\n2 RUNNING\n'
+        with pytest.raises(ReframeError, match='diverged'):
+            _poll('1,3')
+
+
+def test_sched_replay_slurm(make_exec_ctx, slurm_nodes, tmp_path):
+    make_exec_ctx(test_util.TEST_CONFIG_FILE, 'generic')
+    job = Job.create(getscheduler('slurm')(), getlauncher('local')(),
+                     name='testjob', workdir=tmp_path,
+                     script_filename=str(tmp_path / 'job.sh'))
+
+    def _record(cmd, stdout):
+        return {'command': cmd, 'start': 0., 'latency': 0.,
+                'timeout': None, 'returncode': 0,
+                'stdout': stdout, 'stderr': ''}
+
+    session_file = tmp_path / 'session.json'
+    with open(session_file, 'w') as fp:
+        json.dump({
+            'data_version': '1.0',
+            'commands': [
+                _record('scontrol -a show -o nodes', '\n'.join(slurm_nodes)),
+                _record(f'sbatch {job.script_filename}',
+                        'Submitted batch job 1234\n'),
+                _record('sbatch <STAGE_PREFIX>/job2.sh',
+                        'Submitted batch job 1235\n'),
+                _record('sacct -S 2022-11-29 -P -j 1234,1235 '
+                        '-o jobid,state,exitcode,end,nodelist',
+                        '1235|COMPLETED|0:0|1669716000|nid00001\n'),
+                _record('scontrol -a show -o node nid00001', slurm_nodes[0])
+            ]
+        }, fp)
+
+    with SchedulerReplayer(session_file):
+        assert len(job.scheduler.allnodes()) == 6
+        job.submit()
+
+    assert job.jobid == '1234'
+
+    # Replay the session recorded under another stage prefix and date
+    job = Job.create(getscheduler('slurm')(), getlauncher('local')(),
+                     name='testjob', workdir=tmp_path,
+                     script_filename=str(tmp_path / 'job2.sh'))
+    with SchedulerReplayer(session_file, prefixes={'stage_prefix': tmp_path}):
+        job.submit()
+        assert job.jobid == '1235'
+        job.scheduler.poll(job)
+
+    assert job.state == 'COMPLETED'
@@ -3,6 +3,8 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import copy
+import pickle
 import pytest
 
 import reframe.utility.typecheck as types
@@ -204,6 +206,106 @@ def test_type_names():
     assert r"List[Str[r'\d+']]" == types.List[types.Str[r'\d+']].__name__
 
 
+def test_type_identity():
+    assert types.List[int] is types.List[int]
+    assert types.Set[int] is types.Set[int]
+    assert types.Dict[str, int] is types.Dict[str, int]
+    assert types.Tuple[int, str] is types.Tuple[int, str]
+    assert types.Str[r'\d+'] is types.Str[r'\d+']
+    assert types.List[int] is not types.Set[int]
+
+
+def test_checked_list():
+    l = types.checked(['1', '2'])
+    assert isinstance(l, list)
+    assert l == ['1', '2']
+    assert types.checked(l) is l
+    assert isinstance(l, types.List[str])
+    assert l._rfm_checked_types == {types.List[str]}
+    assert not isinstance(l, types.List[int])
+
+    # Nested aggregate types are not remembered
+    assert isinstance(l, types.List[types.Str[r'\d+']])
+    assert isinstance(types.checked([[1]]), types.List[types.List[int]])
+    assert l._rfm_checked_types == {types.List[str],
+                                    types.List[types.Str[r'\d+']]}
+
+    # Insertions of matching elements are checked incrementally
+    l += ['3']
+    l.append('4')
+    l.insert(0, '0')
+    l[1:3] = ['1', '2']
+    assert l == ['0', '1', '2', '3', '4']
+    assert l._rfm_checked_types == {types.List[str],
+                                    types.List[types.Str[r'\d+']]}
+
+    l.append('a')
+    assert l._rfm_checked_types == {types.List[str]}
+    assert not isinstance(l, types.List[types.Str[r'\d+']])
+    l[0] = 1
+    assert l._rfm_checked_types == set()
+    assert not isinstance(l, types.List[str])
+
+    # Removals do not affect the checked types
+    l.pop(0)
+    assert isinstance(l, types.List[str])
+    l.remove('a')
+    assert l._rfm_checked_types == {types.List[str]}
+
+    # Copies remember the checked types
+    for c in (copy.copy(l), copy.deepcopy(l)):
+        assert c == l
+        assert type(c) is type(l)
+        assert c._rfm_checked_types == {types.List[str]}
+
+    c = pickle.loads(pickle.dumps(l))
+    assert c == l
+    assert c._rfm_checked_types == set()
+
+
+def test_checked_dict():
+    d = types.checked({'a': 1})
+    assert isinstance(d, dict)
+    assert d == {'a': 1}
+    assert isinstance(d, types.Dict[str, int])
+    assert d._rfm_checked_types == {types.Dict[str, int]}
+
+    d['b'] = 2
+    d.update({'c': 3}, d=4)
+    d.setdefault('e', 5)
+    assert d == {'a': 1, 'b': 2, 'c': 3, 'd': 4, 'e': 5}
+    assert d._rfm_checked_types == {types.Dict[str, int]}
+
+    d.update(f='6')
+    assert d._rfm_checked_types == set()
+    assert not isinstance(d, types.Dict[str, int])
+    del d['f']
+    assert isinstance(d, types.Dict[str, int])
+    for c in (copy.copy(d), copy.deepcopy(d)):
+        assert c == d
+        assert c._rfm_checked_types == {types.Dict[str, int]}
+
+    c = pickle.loads(pickle.dumps(d))
+    assert c == d
+    assert c._rfm_checked_types == set()
+
+    # Other values are not converted
+    t = (1, 2)
+    assert types.checked(t) is t
+
+
+def test_checked_conversions():
+    l = types.List[int]('1,2')
+    assert l == [1, 2]
+    l.append(3)
+    assert isinstance(l, types.List[int])
+    assert l._rfm_checked_types == {types.List[int]}
+
+    d = types.Dict[str, int]('a:1')
+    assert isinstance(d, types.Dict[str, int])
+    assert d._rfm_checked_types == {types.Dict[str, int]}
+
+
 def test_custom_types():
     class C:
         def __init__(self, v):
@@ -3,9 +3,13 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import functools
+import gzip
+import json
 import os
 import pytest
 import random
+import stat
 import sys
 import time
 
@@ -19,6 +23,7 @@ import reframe.utility.sanity as sn
 import unittests.utility as test_util
 
 from reframe.core.exceptions import (ConfigError,
+                                     ReframeError,
                                      SpawnedProcessError,
                                      SpawnedProcessTimeout)
 
@@ -131,6 +136,115 @@ def test_copytree_src_does_not_exist(tmp_path, dirs_exist_ok):
         osext.copytree(str(src), str(dst), dirs_exist_ok=dirs_exist_ok)
 
 
+@pytest.fixture(params=['gzip', 'zstd'])
+def compression(request):
+    if request.param == 'zstd':
+        try:
+            osext._zstd()
+        except ReframeError:
+            pytest.skip('zstd compression not available')
+
+    return request.param
+
+
+def test_copy_compressed(tmp_path, compression):
+    src = tmp_path / 'out.txt'
+    src.write_text('hello\nworld\n')
+    dst = tmp_path / 'dst'
+    dst.mkdir()
+    suffix = osext.COMPRESSION_SUFFIXES[compression]
+    dst_file = osext.copy_compressed(str(src), str(dst), compression)
+    assert dst_file == str(dst / 'out.txt') + suffix
+    assert os.stat(dst_file).st_mtime_ns == src.stat().st_mtime_ns
+
+    # Compressed files are looked up and decompressed transparently
+    assert osext.find_compressed(dst / 'out.txt') == (dst_file, compression)
+    with osext.open_compressed(dst / 'out.txt') as fp:
+        assert fp.read() == 'hello\nworld\n'
+
+    with osext.open_compressed(dst_file, 'rb') as fp:
+        assert fp.read() == b'hello\nworld\n'
+
+
+def test_copy_compressed_copytree(tmp_path, compression):
+    src = tmp_path / 'src'
+    (src / 'foo').mkdir(parents=True)
+    (src / 'foo' / 'bar.txt').write_text('bar')
+    dst = tmp_path / 'dst'
+    osext.copytree(str(src), str(dst), copy_function=functools.partial(
+        osext.copy_compressed, method=compression
+    ))
+    suffix = osext.COMPRESSION_SUFFIXES[compression]
+    with osext.open_compressed(dst / 'foo' / f'bar.txt{suffix}') as fp:
+        assert fp.read() == 'bar'
+
+
+def test_copy_compressed_invalid_method(tmp_path):
+    src = tmp_path / 'out.txt'
+    src.touch()
+    with pytest.raises(ValueError):
+        osext.copy_compressed(str(src), str(tmp_path / 'dst'), 'foo')
+
+
+def test_find_compressed(tmp_path):
+    plain = tmp_path / 'out.txt'
+    assert osext.find_compressed(plain) == (str(plain), None)
+
+    # Existing files are never substituted by their compressed version
+    plain.touch()
+    (tmp_path / 'out.txt.gz').touch()
+    assert osext.find_compressed(plain) == (str(plain), None)
+    assert osext.find_compressed(tmp_path / 'out.txt.zst') == (
+        str(tmp_path / 'out.txt.zst'), 'zstd'
+    )
+
+
+def test_open_compressed_write(tmp_path):
+    # The compression method is deduced from the file suffix
+    with osext.open_compressed(tmp_path / 'out.txt.gz', 'w') as fp:
+        fp.write('hello')
+
+    with gzip.open(tmp_path / 'out.txt.gz', 'rt') as fp:
+        assert fp.read() == 'hello'
+
+    # Files without a compression suffix are written as-is
+    with osext.open_compressed(tmp_path / 'out.txt', 'w') as fp:
+        fp.write('hello')
+
+    assert (tmp_path / 'out.txt').read_text() == 'hello'
+
+
+def test_clone_file(tmp_path):
+    src = tmp_path / 'src.txt'
+    src.write_text('hello')
+    dst = osext.clone_file(str(src), str(tmp_path / 'dst.txt'))
+    assert dst == str(tmp_path / 'dst.txt')
+    assert (tmp_path / 'dst.txt').read_text() == 'hello'
+    assert os.stat(dst).st_mtime_ns == src.stat().st_mtime_ns
+
+    # Clones are independent copies
+    with open(dst, 'a') as fp:
+        fp.write(' world')
+
+    assert src.read_text() == 'hello'
+
+
+def test_link_file(tmp_path):
+    src = tmp_path / 'src.txt'
+    src.write_text('hello')
+    dst = tmp_path / 'dst'
+    dst.mkdir()
+    assert osext.link_file(str(src), str(dst)) == str(dst / 'src.txt')
+    assert os.path.samefile(src, dst / 'src.txt')
+
+    # Existing files are replaced
+    other = tmp_path / 'other.txt'
+    other.write_text('other')
+    osext.link_file(str(other), str(dst / 'src.txt'))
+    assert (dst / 'src.txt').read_text() == 'other'
+    assert src.read_text() == 'hello'
+
+
 @pytest.fixture
 def rmtree(tmp_path):
     testdir = tmp_path / 'test'
@@ -298,6 +412,28 @@ def test_force_remove_file(tmp_path):
     osext.force_remove_file(fp_name)
 
 
+def test_dump_json_atomic(tmp_path):
+    filename = str(tmp_path / 'data.json')
+    osext.dump_json_atomic({'a': [1, 2]}, filename, indent=2)
+    with open(filename) as fp:
+        assert fp.read() == '{\n  "a": [\n    1,\n    2\n  ]\n}'
+
+    assert stat.S_IMODE(os.stat(filename).st_mode) == 0o600
+    osext.dump_json_atomic({'b': 1}, filename, mode=0o644)
+    with open(filename) as fp:
+        assert json.load(fp) == {'b': 1}
+
+    assert stat.S_IMODE(os.stat(filename).st_mode) == 0o644
+
+    # A failed write leaves neither the file nor the temporary file behind
+    with pytest.raises(TypeError):
+        osext.dump_json_atomic({'c': object()}, filename)
+
+    assert os.listdir(tmp_path) == ['data.json']
+    with open(filename) as fp:
+        assert json.load(fp) == {'b': 1}
+
+
 def test_expandvars_dollar():
     text = 'Hello, $(echo World)'
     assert 'Hello, World' == osext.expandvars(text)
@@ -1682,6 +1818,24 @@ def test_attr_validator():
     assert has_no_c(d) == (False, 'D.y')
 
 
+def test_attr_validator_skip():
+    class C:
+        def __init__(self):
+            self.x = 'foo'
+
+    class D:
+        def __init__(self):
+            self.x = 'foo'
+            self.y = C()
+
+    has_no_str = util.attr_validator(lambda x: not isinstance(x, str),
+                                     skip_fn=lambda t: t is C)
+    d = D()
+    assert has_no_str(d) == (False, 'D.x')
+    d.x = 1
+    assert has_no_str(d) == (True, 'D')
+
+
 def test_is_picklable():
     class X:
         pass
@@ -1748,6 +1902,59 @@ def test_is_copyable():
     assert not util.is_copyable(foo())
 
 
+def test_is_trivially_copyable():
+    class X:
+        pass
+
+    class Y:
+        def __deepcopy__(self, memo):
+            pass
+
+    class Z(list):
+        pass
+
+    def foo():
+        pass
+
+    assert util.is_trivially_copyable(int)
+    assert util.is_trivially_copyable(str)
+    assert util.is_trivially_copyable(type(None))
+    assert util.is_trivially_copyable(type(foo))
+    assert not util.is_trivially_copyable(X)
+    assert not util.is_trivially_copyable(Y)
+    assert not util.is_trivially_copyable(Z)
+    assert not util.is_trivially_copyable(list)
+    assert not util.is_trivially_copyable(tuple)
+
+
+def test_attr_validator_copyable_skip():
+    class X:
+        def __deepcopy__(self, memo):
+            return X()
+
+    class Y(list):
+        pass
+
+    def gen():
+        yield
+
+    x, y = X(), Y()
+    objects = [1, 'foo', None, [1, 2], x, y, {'a': x, 'b': y}]
+    is_copyable = util.attr_validator(util.is_copyable)
+    is_copyable_fast = util.attr_validator(
+        util.is_copyable, skip_fn=util.is_trivially_copyable
+    )
+
+    # Skipping the trivially copyable types does not change the verdicts
+    for contents in [None, gen()]:
+        x.contents = contents
+        y[:] = [contents]
+        for obj in objects:
+            assert is_copyable(obj) == is_copyable_fast(obj)
+
+    assert is_copyable_fast(y) == (False, 'Y[0]')
+    assert is_copyable_fast(x) == (False, 'X.contents')
+
 def test_is_trivially_callable():
     def foo():
         pass
@@ -8,6 +8,8 @@ import pytest
 import math
 
 import reframe as rfm
+import reframe.core.fields as fields
+import reframe.utility.typecheck as typ
 from reframe.core.exceptions import ReframeSyntaxError
 
 
@@ -210,6 +212,77 @@ def test_var_deepcopy():
     assert Baz().my_var == []
 
 
+def test_var_copy_on_access():
+    class Foo(rfm.RegressionTest):
+        my_var = variable(list, value=[1, 2])
+
+    foo, bar = Foo(), Foo()
+
+    # The default value is shared until it is accessed
+    assert foo.__dict__['my_var'] is bar.__dict__['my_var']
+    foo.my_var.append(3)
+    assert foo.__dict__['my_var'] is not bar.__dict__['my_var']
+    assert foo.my_var == [1, 2, 3]
+    assert bar.my_var == [1, 2]
+    assert Foo.my_var == [1, 2]
+
+    # Values set explicitly are not copied on access
+    value = [4]
+    bar.my_var = value
+    assert bar.my_var is value
+
+
+def test_var_default_change_after_init():
+    class Foo(rfm.RegressionTest):
+        my_var = variable(list, value=[1, 2])
+
+    foo = Foo()
+    Foo.my_var = [3]
+    assert Foo().my_var == [3]
+    Foo.my_var.append(4)
+    assert Foo().my_var == [3, 4]
+    assert foo.my_var == [1, 2]
+
+
+def test_var_nested_default_change_after_init():
+    class Foo(rfm.RegressionTest):
+        my_dict = variable(dict, value={'a': {'x': 1}})
+        my_list = variable(list, value=[[1]])
+
+    foo = Foo()
+    Foo.my_dict['a']['x'] = 3
+    for elem in Foo.my_list:
+        elem.append(2)
+
+    assert Foo().my_dict == {'a': {'x': 3}}
+    assert Foo().my_list == [[1, 2]]
+    assert foo.my_dict == {'a': {'x': 1}}
+    assert foo.my_list == [[1]]
+
+
+def test_var_type_converted_once():
+    class Foo(rfm.RegressionTest):
+        my_var = variable(int, value=1)
+
+    Foo.setvar('my_var', fields.make_convertible('2'))
+    assert Foo().my_var == 2
+    assert Foo().my_var == 2
+
+
+def test_var_checked_once():
+    class Foo(rfm.RegressionTest):
+        my_var = variable(typ.List[str], value=['a'])
+
+    foo = Foo()
+    foo.my_var += ['b']
+    assert foo.my_var == ['a', 'b']
+    assert foo.my_var._rfm_checked_types == {typ.List[str]}
+    with pytest.raises(TypeError):
+        foo.my_var += [1]
+
+    assert Foo().my_var == ['a']
+
+
 def test_variable_access():
     class Foo(rfm.RegressionMixin):
         my_var = variable(str, value='bananas')